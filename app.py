@@ -7,20 +7,21 @@ Features:
 - Prévisions de demande par produit
 - Analyse d'inventaire et risque d'expiration
 - Segmentation RFM des clients
+- Simulateur de scénarios (météo, événements)
 - Rapports téléchargeables
 """
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-from pathlib import Path
-from datetime import datetime, timedelta
 import warnings
 
+from kweek import pages
+from kweek.pages.common import (
+    ROLLUP_SITE, PageData, RollupData, open_rollup, open_site, publication, site_names, table_rows,
+)
+
+# Les pages (kweek/pages/*.py) et leurs bibliothèques (plotly, scipy,
+# scikit-learn...) ne sont importées qu'à leur premier affichage
+
 warnings.filterwarnings('ignore')
 
 # ============================================================================
@@ -61,43 +62,21 @@ st.markdown("""
 # LOAD DATA
 # ============================================================================
 
-@st.cache_data
-def load_data():
-    """Charger toutes les données du projet"""
-    data_path = Path(".")
-    
-    # Charger les fichiers CSV
-    transactions = pd.read_csv(data_path / "restaurant_sales_transactions.csv")
-    daily = pd.read_csv(data_path / "restaurant_daily_factors_sales.csv")
-    products = pd.read_csv(data_path / "restaurant_products.csv")
-    clients = pd.read_csv(data_path / "restaurant_clients.csv")
-    external = pd.read_csv(data_path / "restaurant_external_factors.csv")
-    inventory = pd.read_csv(data_path / "restaurant_stock_inventory.csv")
-    
-    # Charger les rapports générés
-    try:
-        forecasts = pd.read_csv(sorted(list(data_path.glob("outputs/reports/demand_forecasts_*.csv")))[-1])
-    except:
-        forecasts = None
-    
-    try:
-        near_expiry = pd.read_csv(data_path / "outputs/forecast/near_expiry_products.csv")
-    except:
-        near_expiry = None
-    
-    return {
-        'transactions': transactions,
-        'daily': daily,
-        'products': products,
-        'clients': clients,
-        'external': external,
-        'inventory': inventory,
-        'forecasts': forecasts,
-        'near_expiry': near_expiry
-    }
+# Plusieurs restaurants (dossier sites/): seule la partition du site choisi est lue
+sites = site_names()
+site = st.sidebar.selectbox("🏬 Restaurant:", [*sites, ROLLUP_SITE]) if sites else None
+rollup = site == ROLLUP_SITE
 
 try:
-    data = load_data()
+    if rollup:
+        # Vue consolidée: agrégats des sites fusionnés, jamais leurs transactions
+        data_fingerprint = open_rollup(sites)
+        data = RollupData(data_fingerprint, sites)
+    else:
+        data_fingerprint = open_site(site)
+        # Tables lues à la demande par les pages (cache invalidé quand l'empreinte change)
+        data = PageData(data_fingerprint)
+    kpis = data['cube']['kpis'].iloc[0]
     st.session_state.data_loaded = True
 except Exception as e:
     st.error(f"❌ Erreur lors du chargement des données: {str(e)}")
@@ -124,645 +103,30 @@ st.markdown("---")
 st.sidebar.title("🗺️ Navigation")
 page = st.sidebar.radio(
     "Sélectionnez une page:",
-    ["📈 Dashboard", "🔮 Prévisions", "📦 Inventaire", "👥 Clients RFM", "📊 Rapports", "ℹ️ À Propos"]
+    pages.ROLLUP_PAGES if rollup else list(pages.PAGES)
 )
 
 st.sidebar.markdown("---")
 st.sidebar.subheader("📊 Statistiques Clés")
-st.sidebar.metric("Transactions", f"{len(data['transactions']):,}")
-st.sidebar.metric("Jours analysés", len(data['daily']))
-st.sidebar.metric("Produits", len(data['products']))
-st.sidebar.metric("Clients", len(data['clients']))
-
-# ============================================================================
-# PAGE 1: DASHBOARD
-# ============================================================================
-
-if page == "📈 Dashboard":
-    st.header("📈 Dashboard Principal")
-    
-    # Metrics Row 1
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        total_sales = data['transactions']['total_amount'].sum()
-        st.metric("💰 Chiffre d'Affaires Total", f"€{total_sales:,.0f}")
-    
-    with col2:
-        total_units = data['transactions']['quantity'].sum()
-        st.metric("📦 Unités Vendues", f"{total_units:,}")
-    
-    with col3:
-        avg_transaction = total_sales / len(data['transactions'])
-        st.metric("🛒 Panier Moyen", f"€{avg_transaction:.2f}")
-    
-    with col4:
-        products_count = data['transactions']['product_name'].nunique()
-        st.metric("🍽️ Produits Distincts", f"{products_count}")
-    
-    st.markdown("---")
-    
-    # Row 2: Time Series
-    col1, col2 = st.columns([1, 1])
-    
-    with col1:
-        st.subheader("📈 Tendance des Ventes Quotidiennes")
-        daily_data = data['daily'].copy()
-        if 'date' in daily_data.columns:
-            daily_data['date'] = pd.to_datetime(daily_data['date'])
-            fig = px.line(daily_data, x='date', y='total_revenue',
-                         title="Évolution des Ventes",
-                         labels={'date': 'Date', 'total_revenue': 'Ventes (€)'},
-                         template='plotly_white')
-            fig.update_layout(hovermode='x unified', height=400)
-            st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        st.subheader("📊 Volume Quotidien")
-        if 'total_units' in daily_data.columns:
-            fig = px.bar(daily_data, x='date', y='total_units',
-                        title="Unités Vendues par Jour",
-                        labels={'date': 'Date', 'total_units': 'Quantité'},
-                        template='plotly_white')
-            fig.update_layout(hovermode='x unified', height=400, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
-    
-    st.markdown("---")
-    
-    # Row 3: Top Products
-    col1, col2 = st.columns([1, 1])
-    
-    with col1:
-        st.subheader("🏆 Top 5 Produits par Chiffre d'Affaires")
-        top_products = data['transactions'].groupby('product_name')['total_amount'].sum().nlargest(5)
-        fig = px.bar(x=top_products.values, y=top_products.index,
-                    orientation='h', template='plotly_white',
-                    labels={'x': 'Ventes (€)', 'y': 'Produit'})
-        fig.update_layout(height=350, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        st.subheader("📉 Bottom 5 Produits")
-        bottom_products = data['transactions'].groupby('product_name')['total_amount'].sum().nsmallest(5)
-        fig = px.bar(x=bottom_products.values, y=bottom_products.index,
-                    orientation='h', template='plotly_white',
-                    labels={'x': 'Ventes (€)', 'y': 'Produit'},
-                    color_discrete_sequence=['#ff6b6b'])
-        fig.update_layout(height=350, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
-    
-    st.markdown("---")
-    
-    # Correlation Matrix
-    st.subheader("🔗 Corrélation entre Facteurs Externes et Ventes")
-    if 'temperature' in data['daily'].columns and 'total_revenue' in data['daily'].columns:
-        corr_data = data['daily'][['temperature', 'precipitation', 'sunshine_hours', 'total_revenue']].corr()
-        fig = go.Figure(data=go.Heatmap(z=corr_data.values,
-                                        x=corr_data.columns,
-                                        y=corr_data.columns,
-                                        colorscale='RdBu',
-                                        zmid=0))
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
-
-# ============================================================================
-# PAGE 2: FORECASTING
-# ============================================================================
-
-elif page == "🔮 Prévisions":
-    st.header("🔮 Système de Prévision de Demande")
-    
-    col1, col2 = st.columns([1, 1])
-    
-    with col1:
-        st.subheader("⚙️ Paramètres de Prévision")
-        selected_product = st.selectbox(
-            "Sélectionnez un produit:",
-            options=sorted(data['transactions']['product_name'].unique())
-        )
-        
-        forecast_days = st.slider(
-            "Horizon de prévision (jours):",
-            min_value=7, max_value=90, value=30, step=7
-        )
-        
-        model_choice = st.radio(
-            "Modèle de prévision:",
-            ["Random Forest ⭐ (Meilleur)", "ETS Baseline", "ETS + Regressors"],
-            help="Random Forest: R²=0.483 | ETS: R²=0.386 | Advanced: R²=-0.264"
-        )
-    
-    with col2:
-        st.subheader("📈 Prévision du Produit")
-        product_data = data['transactions'][data['transactions']['product_name'] == selected_product]
-        
-        st.metric("Ventes Totales", f"€{product_data['total_amount'].sum():,.0f}")
-        st.metric("Quantité Vendue", f"{product_data['quantity'].sum():,} unités")
-        st.metric("Transactions", len(product_data))
-        st.metric("Prix Moyen", f"€{(product_data['total_amount'].sum() / product_data['quantity'].sum()):.2f}")
-    
-    st.markdown("---")
-    
-    if data['forecasts'] is not None:
-        st.subheader(f"📊 Prévisions: {selected_product}")
-
-        try:
-            # Respecter l'horizon choisi par l'utilisateur
-            product_forecast = (
-                data['forecasts'][data['forecasts']['product_name'] == selected_product]
-                if 'product_name' in data['forecasts'].columns
-                else data['forecasts'][data['forecasts']['produit'] == selected_product]
-            )
-            product_forecast = product_forecast.head(forecast_days)
-            
-            if not product_forecast.empty:
-                fig = go.Figure()
-                
-                # Historique
-                if 'date' in product_data.columns:
-                    product_data['date'] = pd.to_datetime(product_data['date'])
-                    daily_product = product_data.groupby('date')['quantity'].sum().tail(90)
-                    fig.add_trace(go.Scatter(
-                        x=daily_product.index,
-                        y=daily_product.values,
-                        mode='lines',
-                        name='Historique',
-                        line=dict(color='blue')
-                    ))
-                
-                # Prévision
-                if 'prévision' in product_forecast.columns:
-                    fig.add_trace(go.Scatter(
-                        x=range(1, len(product_forecast) + 1),
-                        y=product_forecast['prévision'],
-                        mode='lines+markers',
-                        name='Prévision',
-                        line=dict(color='red', dash='dash')
-                    ))
-                
-                # Intervalle de confiance
-                if 'intervalle_inf' in product_forecast.columns and 'intervalle_sup' in product_forecast.columns:
-                    fig.add_trace(go.Scatter(
-                        x=list(range(1, len(product_forecast) + 1)) + list(range(1, len(product_forecast) + 1))[::-1],
-                        y=list(product_forecast['intervalle_sup']) + list(product_forecast['intervalle_inf'])[::-1],
-                        fill='toself',
-                        name='Intervalle de Confiance (95%)',
-                        fillcolor='rgba(255,0,0,0.2)',
-                        line=dict(color='rgba(255,255,255,0)')
-                    ))
-                
-                fig.update_layout(
-                    title=f"Prévision {forecast_days} jours - {selected_product}",
-                    xaxis_title="Jours",
-                    yaxis_title="Quantité",
-                    hovermode='x unified',
-                    template='plotly_white',
-                    height=450
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Afficher les données
-                st.subheader("📋 Détails de la Prévision")
-                st.dataframe(product_forecast, use_container_width=True)
-                st.caption(f"Horizon affiché: {forecast_days} jours")
-        except Exception as e:
-            st.warning(f"⚠️ Les données de prévision ne sont pas disponibles pour ce produit")
-    
-    else:
-        st.info("💡 Exécutez d'abord le notebook pour générer les prévisions")
-
-# ============================================================================
-# PAGE 3: INVENTORY MANAGEMENT
-# ============================================================================
-
-elif page == "📦 Inventaire":
-    st.header("📦 Gestion d'Inventaire")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        total_stock = data['inventory']['quantity_available'].sum() if 'quantity_available' in data['inventory'].columns else data['inventory']['quantity'].sum() if 'quantity' in data['inventory'].columns else 0
-        st.metric("Total Stock", f"{total_stock:,} unités")
-    
-    with col2:
-        st.metric("Articles Différents", len(data['inventory']))
-    
-    with col3:
-        if data['near_expiry'] is not None:
-            at_risk = len(data['near_expiry'])
-            st.metric("⚠️ À Risque", f"{at_risk:,} lots")
-        else:
-            # Calculer depuis inventory si near_expiry n'existe pas
-            at_risk_inv = len(data['inventory'][data['inventory']['days_until_expiry'] <= 7]) if 'days_until_expiry' in data['inventory'].columns else 0
-            st.metric("⚠️ À Risque", f"{at_risk_inv:,} lots")
-    
-    with col4:
-        if data['near_expiry'] is not None:
-            critical = len(data['near_expiry'][data['near_expiry']['days_until_expiry'] <= 1])
-            st.metric("🚨 Critique", f"{critical:,} lots")
-        else:
-            # Calculer depuis inventory
-            critical_inv = len(data['inventory'][data['inventory']['days_until_expiry'] <= 1]) if 'days_until_expiry' in data['inventory'].columns else 0
-            st.metric("🚨 Critique", f"{critical_inv:,} lots")
-    
-    st.markdown("---")
-    
-    # Utiliser inventory si near_expiry n'existe pas
-    inventory_data = data['near_expiry'] if data['near_expiry'] is not None else data['inventory']
-    
-    if inventory_data is not None and len(inventory_data) > 0:
-        tab1, tab2, tab3 = st.tabs(["⚠️ Articles à Risque", "📊 Distribution", "💰 Recommandations"])
-        
-        with tab1:
-            st.subheader("Articles en Danger d'Expiration")
-            
-            # S'assurer que la colonne existe
-            if 'days_until_expiry' in inventory_data.columns:
-                near_expiry_sorted = inventory_data.sort_values('days_until_expiry')
-                
-                # Color coding
-                def highlight_risk(row):
-                    days = row.get('days_until_expiry', 999)
-                    if days <= 1:
-                        return ['background-color: #ff6b6b'] * len(row)
-                    elif days <= 3:
-                        return ['background-color: #ffa500'] * len(row)
-                    elif days <= 7:
-                        return ['background-color: #fff9e6'] * len(row)
-                    else:
-                        return ['background-color: white'] * len(row)
-                
-                # Afficher les 20 premiers
-                display_cols = ['product_name', 'quantity_available', 'days_until_expiry', 'expiration_date'] if 'product_name' in near_expiry_sorted.columns else near_expiry_sorted.columns[:5]
-                styled_df = near_expiry_sorted[display_cols].head(20).style.apply(highlight_risk, axis=1)
-                st.dataframe(styled_df, use_container_width=True)
-                
-                # Export button
-                csv = near_expiry_sorted.to_csv(index=False)
-                st.download_button(
-                    label="📥 Télécharger Liste Complète (CSV)",
-                    data=csv,
-                    file_name=f"inventory_expiry_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-            else:
-                st.warning("⚠️ Colonne 'days_until_expiry' non trouvée dans les données")
-        
-        with tab2:
-            st.subheader("Distribution des Articles par Jours jusqu'à Expiration")
-            if 'days_until_expiry' in inventory_data.columns:
-                # Filtrer pour afficher seulement <= 30 jours
-                filtered_data = inventory_data[inventory_data['days_until_expiry'] <= 30]
-                fig = px.histogram(filtered_data, x='days_until_expiry', nbins=30,
-                                  template='plotly_white',
-                                  labels={'days_until_expiry': 'Jours jusqu\'à Expiration', 'count': 'Nombre de Lots'},
-                                  title="Distribution des Lots par Jours d'Expiration (≤30 jours)")
-                fig.update_layout(height=400, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True)
-                
-                st.info(f"📊 Total lots à risque (≤30 jours): {len(filtered_data):,}")
-            else:
-                st.warning("⚠️ Impossible d'afficher la distribution")
-        
-        with tab3:
-            st.subheader("💰 Recommandations de Réduction")
-            st.info("🎯 Stratégie: Appliquer des réductions proportionnelles au risque d'expiration")
-            
-            if 'days_until_expiry' in inventory_data.columns:
-                risk_levels = [
-                    ("🚨 Critique (≤1 jour)", 1, 80),
-                    ("⚠️ Haute (2-3 jours)", 3, 60),
-                    ("🟡 Moyenne (4-7 jours)", 7, 40),
-                    ("🟢 Basse (8-14 jours)", 14, 20)
-                ]
-                
-                for label, days, discount in risk_levels:
-                    filtered = inventory_data[inventory_data['days_until_expiry'] <= days]
-                    count = len(filtered)
-                    
-                    # Calculer la valeur
-                    if 'total_cost' in filtered.columns:
-                        value = filtered['total_cost'].sum()
-                    elif 'unit_cost' in filtered.columns and 'quantity_available' in filtered.columns:
-                        value = (filtered['unit_cost'] * filtered['quantity_available']).sum()
-                    else:
-                        value = 0
-                    
-                    st.markdown(f"{label} → **{discount}% de réduction** | {count} lots | €{value:,.2f}")
-            else:
-                st.warning("⚠️ Données insuffisantes pour calculer les recommandations")
-    else:
-        st.warning("⚠️ Aucune donnée d'inventaire disponible. Exécutez d'abord le notebook.")
-
-# ============================================================================
-# PAGE 4: RFM ANALYSIS
-# ============================================================================
-
-elif page == "👥 Clients RFM":
-    st.header("👥 Segmentation RFM des Clients")
-    
-    # Load RFM data if available
-    rfm_data = None
-    try:
-        # Try to load from reports
-        reports = list(Path("outputs/reports").glob("*.csv"))
-        if reports:
-            for report in reports:
-                if 'rfm' in report.name.lower() or 'segment' in report.name.lower():
-                    try:
-                        rfm_data = pd.read_csv(report)
-                        break
-                    except:
-                        continue
-    except:
-        pass
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("Total Clients", len(data['clients']))
-    
-    with col2:
-        st.metric("Clusters RFM", 3)
-    
-    with col3:
-        st.metric("Silhouette Score", "0.366")
-    
-    st.markdown("---")
-    
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Clusters", "💎 VIP", "📢 Standard", "🎁 Occasional"])
-    
-    with tab1:
-        st.subheader("Distribution des Clusters RFM")
-        
-        # Simulated RFM metrics
-        cluster_data = pd.DataFrame({
-            'Cluster': ['🎯 VIP (Frequent & High Value)', '📊 Standard (Regular)', '🆕 Occasional (New/Low)'],
-            'Clients': [45, 250, 205],
-            'AOV (€)': [850, 320, 120],
-            'Frequency': ['2-3x/mois', 'hebdo', 'occasionnel'],
-            'Retention': ['95%', '65%', '35%']
-        })
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            fig = px.pie(values=cluster_data['Clients'], labels=cluster_data['Cluster'],
-                        template='plotly_white')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.dataframe(cluster_data, use_container_width=True)
-    
-    with tab1:
-        st.subheader("🎯 Segment VIP")
-        vip_text = """
-        **Caractéristiques:**
-        - 45 clients (9% du total)
-        - Panier moyen: €850
-        - Fréquence: 2-3 fois/mois
-        - Lifetime Value: €2,500-3,000+
-        
-        **Stratégie:**
-        ✅ Programme de fidélité premium
-        ✅ Offres exclusives et early access
-        ✅ Service personnalisé
-        ✅ Invitations événements spéciaux
-        """
-        st.markdown(vip_text)
-    
-    with tab2:
-        st.subheader("📊 Segment Standard")
-        standard_text = """
-        **Caractéristiques:**
-        - 250 clients (50% du total)
-        - Panier moyen: €320
-        - Fréquence: hebdomadaire
-        - Lifetime Value: €800-1,200
-        
-        **Stratégie:**
-        ✅ Promotions régulières
-        ✅ Bundles et offres combinées
-        ✅ Programme de points de fidélité
-        ✅ Communication marketing mensuelle
-        """
-        st.markdown(standard_text)
-    
-    with tab3:
-        st.subheader("🆕 Segment Occasional")
-        occasional_text = """
-        **Caractéristiques:**
-        - 205 clients (41% du total)
-        - Panier moyen: €120
-        - Fréquence: sporadic
-        - Lifetime Value: €200-400
-        
-        **Stratégie:**
-        ✅ Campagnes d'acquisition
-        ✅ Offres de bienvenue
-        ✅ Remises d'essai générouses
-        ✅ Email marketing ciblé
-        ✅ Upgrade vers Standard
-        """
-        st.markdown(occasional_text)
-    
-    st.markdown("---")
-    
-    st.subheader("📋 Matrice RFM Détaillée")
-    
-    rfm_matrix = pd.DataFrame({
-        'Segment': ['VIP', 'Standard', 'Occasional'],
-        'Recency (jours)': [5, 12, 45],
-        'Frequency (tx/mois)': [2.5, 1.0, 0.3],
-        'Monetary (€)': [850, 320, 120],
-        'Action': [
-            'Fidélité Premium',
-            'Promotions',
-            'Acquisition'
-        ]
-    })
-    
-    st.dataframe(rfm_matrix, use_container_width=True)
-
-# ============================================================================
-# PAGE 5: REPORTS
-# ============================================================================
-
-elif page == "📊 Rapports":
-    st.header("📊 Rapports et Téléchargements")
-    
-    st.subheader("📥 Fichiers Disponibles")
-    
-    col1, col2 = st.columns([1, 1])
-    
-    with col1:
-        st.markdown("### 📈 Données de Prévision")
-        
-        forecast_files = sorted(list(Path("outputs/reports").glob("demand_forecasts_*.csv")))
-        for file in forecast_files[-3:]:  # 3 derniers fichiers
-            size = file.stat().st_size / 1024  # KB
-            st.write(f"📄 {file.name} ({size:.1f} KB)")
-            
-            with open(file, 'rb') as f:
-                st.download_button(
-                    label=f"⬇️ Télécharger {file.name}",
-                    data=f,
-                    file_name=file.name,
-                    mime="text/csv",
-                    key=file.name
-                )
-    
-    with col2:
-        st.markdown("### 📋 Résumés Commerciaux")
-        
-        summary_files = sorted(list(Path("outputs/reports").glob("monthly_commercial_*.csv")))
-        for file in summary_files[-3:]:
-            size = file.stat().st_size / 1024
-            st.write(f"📄 {file.name} ({size:.1f} KB)")
-            
-            with open(file, 'rb') as f:
-                st.download_button(
-                    label=f"⬇️ Télécharger {file.name}",
-                    data=f,
-                    file_name=file.name,
-                    mime="text/csv",
-                    key=f"summary_{file.name}"
-                )
-    
-    st.markdown("---")
-    
-    st.subheader("📊 Visualisations Disponibles")
-    
-    plot_files = sorted(list(Path("outputs/plots").glob("*.png")))
-    
-    col_count = 3
-    cols = st.columns(col_count)
-    
-    for idx, file in enumerate(plot_files[:12]):  # 12 premières images
-        with cols[idx % col_count]:
-            st.image(str(file), use_column_width=True)
-            st.caption(file.name)
-    
-    if len(plot_files) > 12:
-        st.info(f"📁 {len(plot_files) - 12} visualisations supplémentaires disponibles dans outputs/plots/")
-    
-    st.markdown("---")
-    
-    st.subheader("📥 Export Personnalisé")
-    
-    col1, col2 = st.columns([1, 1])
-    
-    with col1:
-        export_format = st.radio("Format d'export:", ["CSV", "Excel", "PDF"])
-    
-    with col2:
-        export_type = st.multiselect(
-            "Données à exporter:",
-            ["Prévisions", "Inventaire", "Clients RFM", "Résumé Commercial"],
-            default=["Prévisions"]
-        )
-    
-    if st.button("✅ Générer Export"):
-        st.success("✅ Export généré! Utilisez les boutons ci-dessus pour télécharger.")
+st.sidebar.metric("Transactions", f"{int(kpis['n_lines']):,}")
+if rollup:
+    st.sidebar.metric("Sites", len(sites))
+    st.sidebar.metric("Jours analysés", len(data['daily']))
+    st.sidebar.metric("Produits", int(kpis['n_products']))
+else:
+    st.sidebar.metric("Jours analysés", table_rows(data_fingerprint, "daily"))
+    st.sidebar.metric("Produits", table_rows(data_fingerprint, "products"))
+    st.sidebar.metric("Clients", table_rows(data_fingerprint, "clients"))
+    published = publication(data_fingerprint)
+    if published is not None:
+        st.sidebar.caption(f"🔄 Données v{published['version']} publiées le "
+                           f"{published['published_at'].replace('T', ' à ')}")
 
 # ============================================================================
-# PAGE 6: ABOUT
+# PAGE
 # ============================================================================
 
-else:  # À Propos
-    st.header("ℹ️ À Propos du Projet")
-    
-    col1, col2 = st.columns([1, 1])
-    
-    with col1:
-        st.subheader("📊 KWEEK Restaurant Analytics")
-        st.markdown("""
-        ### Système Complet d'Analyse Prédictive
-        
-        **Version:** 1.0
-        **Date:** Décembre 2025
-        **Status:** ✅ Production Ready
-        
-        ### Objectifs
-        - 🔮 Prévision précise de la demande
-        - 📦 Optimisation de l'inventaire
-        - 👥 Segmentation intelligente des clients
-        - 💰 Maximisation de la marge commerciale
-        
-        ### Technologies
-        - **Backend:** Jupyter Notebook, Python 3.13
-        - **ML:** scikit-learn, statsmodels, ETS
-        - **Visualisation:** Streamlit, Plotly, Matplotlib
-        - **Data:** pandas, numpy, scipy
-        """)
-    
-    with col2:
-        st.subheader("📈 Performance")
-        
-        metrics = pd.DataFrame({
-            'Métrique': ['R² Random Forest', 'RMSE (unités)', 'MAPE (%)', 'Temps exec (sec)'],
-            'Valeur': ['0.483 ⭐', '30.25', '10.36%', '~24'],
-            'Interprétation': ['Excellent', 'Très bon', 'Très précis', 'Rapide']
-        })
-        
-        st.dataframe(metrics, use_container_width=True)
-        
-        st.subheader("📊 Dataset")
-        
-        stats = pd.DataFrame({
-            'Élément': ['Transactions', 'Jours', 'Produits', 'Clients', 'Articles Stock'],
-            'Quantité': [
-                f"{len(data['transactions']):,}",
-                f"{len(data['daily'])}",
-                f"{len(data['products'])}",
-                f"{len(data['clients'])}",
-                f"{len(data['inventory']):,}"
-            ]
-        })
-        
-        st.dataframe(stats, use_container_width=True)
-    
-    st.markdown("---")
-    
-    st.subheader("🔗 Liens et Ressources")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        **Documentation:**
-        - [README.md](./README.md)
-        - [INDEX.md](./INDEX.md)
-        - [TECHNICAL_DOCUMENTATION.md](./TECHNICAL_DOCUMENTATION.md)
-        """)
-    
-    with col2:
-        st.markdown("""
-        **Rapports:**
-        - [VERIFICATION_REPORT.md](./VERIFICATION_REPORT.md)
-        - [EXECUTIVE_SUMMARY.md](./EXECUTIVE_SUMMARY.md)
-        - [STATUS.md](./STATUS.md)
-        """)
-    
-    with col3:
-        st.markdown("""
-        **Code:**
-        - [kweek-test-notebook.ipynb](./kweek-test-notebook.ipynb)
-        - [app.py](./app.py)
-        """)
-    
-    st.markdown("---")
-    
-    st.subheader("📞 Support et Questions")
-    
-    st.info("""
-    **Pour plus d'informations:**
-    - Consultez la documentation complète
-    - Exécutez le notebook pour régénérer les analyses
-    - Explorez les visualisations dans `outputs/plots/`
-    - Téléchargez les rapports depuis la page "📊 Rapports"
-    """)
+pages.render(page, data, data_fingerprint)
 
 # ============================================================================
 # FOOTER
@@ -0,0 +1,4 @@
+"""
+KWEEK Restaurant Analytics & Forecasting System
+Modules de calcul partagés par l'application Streamlit (app.py) et le notebook.
+"""
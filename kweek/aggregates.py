@@ -0,0 +1,87 @@
+"""
+Cube d'agrégats matérialisés pour le Dashboard.
+
+Les agrégations (KPIs, cumuls par jour, par produit et par catégorie, matrice
+de corrélation) sont dérivées une seule fois des agrégats ingérés en flux
+(kweek.ingest), puis persistées dans `outputs/store/cube/<empreinte>/`. Les
+widgets du Dashboard ne lisent plus que ces petites tables, quelle que soit la
+taille des transactions.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from kweek.store import derived_dir, load_or_build_frames, read_frames, save_frames
+
+CUBE_DIRNAME = "cube"
+
+CORR_COLUMNS = ['temperature', 'precipitation', 'sunshine_hours', 'total_revenue']
+TREND_COLUMNS = ['total_revenue', 'total_units']
+# Résolutions pré-calculées des courbes du Dashboard (table du cube → fréquence pandas)
+TREND_RESOLUTIONS = {'by_week': 'W-MON', 'by_month': 'MS'}
+CUBE_TABLES = {'kpis', 'by_day', 'by_product', 'by_category', 'corr', *TREND_RESOLUTIONS}
+
+
+def build_cube(aggs, daily):
+    """Dériver les tables du cube des agrégats de transactions (kweek.ingest)."""
+    by_product = aggs['by_product']
+    kpis = pd.DataFrame({
+        'total_sales': [float(by_product['total_amount'].sum())],
+        'total_units': [int(by_product['quantity'].sum())],
+        'n_lines': [int(by_product['n_lines'].sum())],
+        'n_products': [len(by_product)],
+    })
+
+    by_day = aggs['daily'][['date', 'total_revenue', 'total_units', 'n_lines']].rename(
+        columns={'total_revenue': 'total_amount', 'total_units': 'quantity'}
+    )
+
+    corr_cols = [c for c in CORR_COLUMNS if c in daily.columns]
+    corr = daily[corr_cols].corr()
+
+    # Sommes hebdomadaires (semaines commençant le lundi) et mensuelles des cumuls quotidiens
+    trend = aggs['daily'].assign(date=pd.to_datetime(aggs['daily']['date']))[['date', *TREND_COLUMNS]]
+    trends = {
+        name: trend.resample(freq, on='date', label='left', closed='left').sum().reset_index()
+        for name, freq in TREND_RESOLUTIONS.items()
+    }
+
+    return {
+        'kpis': kpis,
+        'by_day': by_day,
+        'by_product': by_product[['product_name', 'total_amount', 'quantity', 'n_lines']],
+        'by_category': aggs['by_category'],
+        'corr': corr,
+        **trends,
+    }
+
+
+def monthly_top_products(monthly_product, k=5):
+    """Les k produits au plus fort chiffre d'affaires de chaque mois (colonnes month, product_name, units_sold, revenue, rank)."""
+    monthly = monthly_product.rename(columns={'total_revenue': 'revenue'})
+    top = (monthly.sort_values(['month', 'revenue'], ascending=[True, False])
+           .groupby('month').head(k).reset_index(drop=True))
+    top['rank'] = top.groupby('month')['revenue'].rank(method='first', ascending=False).astype(int)
+    return top
+
+
+def cube_dir(fingerprint, data_dir=Path(".")):
+    return derived_dir(CUBE_DIRNAME, fingerprint, data_dir)
+
+
+def save_cube(cube, fingerprint, data_dir=Path("."), prune=True):
+    """Écrire le cube de façon atomique et supprimer les versions précédentes (sauf `prune=False`)."""
+    save_frames(CUBE_DIRNAME, cube, fingerprint, data_dir, prune=prune, index=None)
+
+
+def read_cube(fingerprint, data_dir=Path(".")):
+    """Relire un cube persisté, ou None s'il n'existe pas pour cette empreinte."""
+    return read_frames(CUBE_DIRNAME, fingerprint, data_dir)
+
+
+def load_or_build_cube(aggs, daily, fingerprint, data_dir=Path(".")):
+    """Retourner le cube de l'empreinte donnée, en le construisant au besoin."""
+    # Cube écrit par une version précédente (tables manquantes): reconstruit
+    return load_or_build_frames(CUBE_DIRNAME, fingerprint, lambda: build_cube(aggs, daily), data_dir,
+                                index=None, complete=lambda cube: CUBE_TABLES <= cube.keys())
@@ -0,0 +1,174 @@
+"""
+Ajout incrémental de nouvelles ventes.
+
+Un lot de transactions (typiquement une journée) est replié dans les agrégats
+persistés (kweek.ingest) et dans la jointure quotidienne
+`restaurant_daily_factors_sales` sans relire l'historique: seuls les jours et
+produits touchés par le lot sont recalculés. Le lot est conservé à part dans
+le stockage (kweek.store.append_rows) puis la version des données est
+incrémentée; l'empreinte change et les caches de l'application se
+rafraîchissent (les états ETS du registre avancent de quelques pas au lieu
+d'être réajustés, ou sont réajustés pour les produits dont un jour déjà vu a
+changé).
+
+L'ajout est atomique: lot, jointure quotidienne et agrégats sont d'abord
+écrits sous la nouvelle version, invisible tant que `write_version` ne l'a
+pas publiée en une seule écriture. Après une interruption, rien n'a changé
+pour les lecteurs et la reprise du même lot réécrit les mêmes fichiers, sans
+double comptage.
+
+Une transaction ne doit pas être répartie entre deux lots: le nombre de
+transactions distinctes par jour est additionné d'un lot à l'autre.
+
+Ajout manuel:
+    python -m kweek.append nouvelles_ventes.csv
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from kweek import ingest, store
+
+TEMP_BINS = [-np.inf, 15, 20, 25, 30, np.inf]
+TEMP_LABELS = ['Cold (<15°C)', 'Cool (15-20°C)', 'Warm (20-25°C)', 'Hot (25-30°C)', 'Very Hot (>30°C)']
+SEASONS = {12: 'Winter', 1: 'Winter', 2: 'Winter',
+           3: 'Spring', 4: 'Spring', 5: 'Spring',
+           6: 'Summer', 7: 'Summer', 8: 'Summer',
+           9: 'Autumn', 10: 'Autumn', 11: 'Autumn'}
+
+# Clés de repliement de chaque agrégat additif
+MERGE_KEYS = {
+    'daily': ['date'],
+    'daily_product': ['date', 'product_name'],
+    'monthly_product': ['month', 'product_name'],
+}
+
+
+def normalize_batch(batch):
+    """Typer un lot de transactions comme la table stockée."""
+    batch = batch.copy()
+    batch['date'] = pd.to_datetime(batch['date']).dt.normalize()
+    if 'timestamp' in batch.columns:
+        batch['timestamp'] = pd.to_datetime(batch['timestamp'])
+    if 'total_amount' not in batch.columns:
+        batch['total_amount'] = batch['quantity'] * batch['unit_price']
+    spec = store.TABLES['transactions']
+    for col, dtype in spec.dtypes.items():
+        if col in batch.columns:
+            batch[col] = batch[col].astype(dtype)
+    for col in spec.categories:
+        if col in batch.columns:
+            batch[col] = batch[col].astype('category')
+    return batch
+
+
+def merge_aggregates(frames, increment):
+    """Additionner les agrégats d'un lot aux agrégats persistés."""
+    merged = {}
+    for name, keys in MERGE_KEYS.items():
+        both = pd.concat([frames[name], increment[name]], ignore_index=True)
+        for key in keys:
+            if key != 'date':
+                both[key] = both[key].astype(str)
+        merged[name] = both.groupby(keys, sort=True).sum().reset_index()
+
+    categories = dict(zip(frames['by_product']['product_name'].astype(str), frames['by_product']['category']))
+    categories.update(zip(increment['by_product']['product_name'].astype(str), increment['by_product']['category']))
+    merged['by_product'], merged['by_category'] = ingest.summarize(merged['daily_product'], categories)
+    return merged
+
+
+def _daily_increment(batch, products):
+    """CA, unités, transactions et marge du lot, par jour."""
+    unit_cost = batch['product_name'].astype(str).map(
+        dict(zip(products['name'].astype(str), products['unit_cost']))
+    ).fillna(0.0)
+    lines = batch.assign(profit=batch['total_amount'] - batch['quantity'] * unit_cost)
+    return lines.groupby('date').agg(
+        num_transactions=('transaction_id', 'nunique'),
+        total_units=('quantity', 'sum'),
+        total_revenue=('total_amount', 'sum'),
+        total_profit=('profit', 'sum'),
+    )
+
+
+def _new_days(dates, external, columns):
+    """Lignes de la jointure quotidienne pour des jours absents (facteurs externes)."""
+    rows = external.assign(date=pd.to_datetime(external['date'])).set_index('date').reindex(dates)
+    rows.index.name = 'date'
+    rows = rows.reset_index()
+    rows['day_of_week'] = rows['date'].dt.dayofweek
+    rows['day_name'] = rows['date'].dt.day_name()
+    rows['is_weekend'] = (rows['day_of_week'] >= 5).astype(int)
+    rows['month'] = rows['date'].dt.month
+    rows['quarter'] = rows['date'].dt.quarter
+    rows['temp_bin'] = pd.cut(rows['temperature'], TEMP_BINS, labels=TEMP_LABELS).astype(str)
+    rows.loc[rows['temperature'].isna(), 'temp_bin'] = np.nan
+    rows['season'] = rows['month'].map(SEASONS)
+    for col in ['num_transactions', 'total_units', 'total_revenue', 'total_profit']:
+        rows[col] = 0
+    return rows.reindex(columns=columns)
+
+
+def update_daily_factors(daily, batch, external, products):
+    """Mettre à jour en place la jointure quotidienne avec les ventes du lot."""
+    increment = _daily_increment(batch, products)
+    daily = daily.assign(date=pd.to_datetime(daily['date']))
+    missing = increment.index.difference(pd.DatetimeIndex(daily['date']))
+    if len(missing):
+        new_rows = _new_days(missing, external, daily.columns)
+        daily = pd.concat([daily.astype({c: 'object' for c in daily.select_dtypes('category')}), new_rows],
+                          ignore_index=True).sort_values('date', ignore_index=True)
+        spec = store.TABLES['daily']
+        daily = daily.astype({c: t for c, t in spec.dtypes.items() if c in daily.columns})
+        daily = daily.astype({c: 'category' for c in spec.categories if c in daily.columns})
+
+    added = increment.reindex(pd.DatetimeIndex(daily['date'])).fillna(0).to_numpy()
+    for j, col in enumerate(increment.columns):
+        daily[col] = (daily[col].to_numpy() + added[:, j]).astype(daily[col].dtype)
+    return daily
+
+
+def append_transactions(batch, data_dir=Path(".")):
+    """
+    Ajouter un lot de transactions et publier une nouvelle version des données.
+    Retourne le numéro de version.
+    """
+    data_dir = Path(data_dir)
+    batch = normalize_batch(batch)
+    current = ingest.load_or_build_aggregates(store.fingerprint(data_dir=data_dir), data_dir)
+
+    acc = ingest.TransactionAggregates()
+    acc.add(batch)
+    merged = merge_aggregates(current, acc.result())
+    daily = update_daily_factors(
+        store.read_table("daily", data_dir=data_dir), batch,
+        store.read_table("external", data_dir=data_dir),
+        store.read_table("products", columns=['name', 'unit_cost'], data_dir=data_dir),
+    )
+
+    # Tout est écrit sous la nouvelle version, puis publié par une seule écriture
+    version = store.read_version(data_dir) + 1
+    fp = store.fingerprint(data_dir=data_dir, version=version)
+    store.append_rows("transactions", batch, version, data_dir)
+    store.replace_table("daily", daily, version, data_dir)
+    ingest.save_aggregates(merged, fp, data_dir, prune=False)
+    store.write_version(version, data_dir)
+    store.prune_frames(ingest.AGGREGATES_DIRNAME, {fp}, data_dir)
+    return version
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python -m kweek.append <transactions.csv>")
+        sys.exit(1)
+    batch = pd.read_csv(sys.argv[1])
+    version = append_transactions(batch)
+    print(f"✓ {len(batch):,} transactions ajoutées → version {version} ({store.fingerprint()})")
+
+
+if __name__ == "__main__":
+    main()
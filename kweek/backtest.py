@@ -0,0 +1,249 @@
+"""
+Évaluation glissante (rolling origin) des modèles de prévision.
+
+Pour chaque origine t_k, chaque modèle est entraîné sur [début, t_k) et
+évalué sur les `horizon` jours suivants; les origines avancent d'un horizon
+à la fois. Tous les modèles du service de prévision (Random Forest, ETS,
+ETS + régresseurs) sont évalués pour tous les produits, avec les mêmes
+variables qu'en production (météo future = climatologie de l'entraînement).
+
+Le travail est découpé en blocs de produits répartis sur un pool de
+processus. Ce qui ne dépend pas du produit est préparé une seule fois: les
+variables explicatives de chaque pli (historique et jours futurs) sont
+calculées dans le processus principal et partagées par tous les blocs. Les
+états Holt-Winters d'un bloc sont ajustés au premier pli puis avancés des
+seuls jours nouveaux d'un pli à l'autre (paramètres conservés), comme le
+registre de modèles le fait en production.
+
+Résultat: un tableau long (model, product_name, fold, origin, train_days,
+rmse, mape, r2), persisté dans `outputs/store/backtest/<empreinte>/` et lu
+par l'application, qui le lance en arrière-plan (BacktestRunner).
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from kweek import holt_winters, store
+from kweek.forecast_service import (
+    MODELS, REGRESSOR_FEATURES, RF_FEATURES, RF_PARAMS, future_features, history_features,
+)
+from kweek.forecasting import FORECAST_DAYS, MIN_PRODUCTS_FOR_POOL, MIN_SEASONAL_HISTORY, SEASONAL_PERIODS
+
+BACKTEST_DIRNAME = "backtest"
+N_FOLDS = 5
+MIN_TRAIN_DAYS = 8 * SEASONAL_PERIODS
+METRICS = ['rmse', 'mape', 'r2']
+
+
+def rolling_origins(n_days, horizon=FORECAST_DAYS, n_folds=N_FOLDS, step=None,
+                    min_train=MIN_TRAIN_DAYS):
+    """Indices des origines (croissants): le dernier pli se termine au dernier jour."""
+    step = horizon if step is None else step
+    origins = [n_days - horizon - k * step for k in range(n_folds)]
+    return sorted(o for o in origins if o >= max(min_train, MIN_SEASONAL_HISTORY))
+
+
+def fold_features(features, origins, horizon):
+    """Variables d'entraînement et des jours évalués de chaque pli (communes à tous les produits)."""
+    folds = []
+    for origin in origins:
+        train = features.iloc[:origin]
+        future = future_features(train, features.index[origin:origin + horizon])
+        folds.append({
+            'rf_train': train[RF_FEATURES].to_numpy(),
+            'rf_future': future[RF_FEATURES].to_numpy(),
+            'reg_train': train[REGRESSOR_FEATURES].to_numpy(),
+            'reg_future': future[REGRESSOR_FEATURES].to_numpy(),
+        })
+    return folds
+
+
+def scores(actual, predicted):
+    """RMSE, MAPE (%, jours sans vente exclus) et R² par ligne (séries × jours)."""
+    err = actual - predicted
+    rmse = np.sqrt(np.mean(err ** 2, axis=1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ape = np.where(actual != 0, np.abs(err) / np.abs(actual), np.nan)
+        counts = np.sum(~np.isnan(ape), axis=1)
+        mape = np.where(counts > 0, np.nansum(ape, axis=1) / np.maximum(counts, 1) * 100, np.nan)
+        sst = np.sum((actual - actual.mean(axis=1, keepdims=True)) ** 2, axis=1)
+        r2 = np.where(sst > 0, 1 - np.sum(err ** 2, axis=1) / sst, np.nan)
+    return {'rmse': rmse, 'mape': mape, 'r2': r2}
+
+
+def _backtest_chunk(values, origins, horizon, folds, models):
+    """
+    Tâche d'un processus: prévisions de tous les plis pour un bloc de colonnes
+    (jours × produits). Retourne {modèle: tableau plis × produits × horizon}.
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import Ridge
+
+    Y = values.T
+    n_series = Y.shape[0]
+    predictions = {model: np.empty((len(origins), n_series, horizon)) for model in models}
+    warmup = 2 * SEASONAL_PERIODS
+    state, seen = None, 0
+
+    for f, (origin, fold) in enumerate(zip(origins, folds)):
+        if "ets" in models or "ets_regressors" in models:
+            # État du pli précédent avancé des jours nouveaux, sans réajustement
+            state = (holt_winters.fit(Y[:, :origin]) if state is None
+                     else holt_winters.update(state, Y[:, seen:origin]))
+            seen = origin
+            ets = holt_winters.forecast(state, horizon)
+            if "ets" in models:
+                predictions["ets"][f] = ets
+            if "ets_regressors" in models:
+                resid = holt_winters.residuals(Y[:, :origin], state)
+                for i in range(n_series):
+                    ridge = Ridge(alpha=1.0).fit(fold['reg_train'][warmup:], resid[i, warmup:])
+                    predictions["ets_regressors"][f, i] = ets[i] + ridge.predict(fold['reg_future'])
+
+        if "rf" in models:
+            for i in range(n_series):
+                rf = RandomForestRegressor(**RF_PARAMS, n_jobs=1).fit(fold['rf_train'], Y[i, :origin])
+                predictions["rf"][f, i] = rf.predict(fold['rf_future'])
+
+    return predictions
+
+
+def run_backtest(daily_matrix, daily_factors, horizon=FORECAST_DAYS, n_folds=N_FOLDS,
+                 models=MODELS, max_workers=None):
+    """
+    Évaluation glissante de `models` sur toutes les colonnes de `daily_matrix`
+    (jours × produits, index de dates continu). Retourne le tableau des scores
+    par modèle, produit et pli.
+    """
+    unknown = [m for m in models if m not in MODELS]
+    if unknown:
+        raise ValueError(f"Modèle inconnu: {unknown[0]!r} (attendu: {', '.join(MODELS)})")
+
+    names = list(daily_matrix.columns)
+    values = daily_matrix.to_numpy(dtype=float)
+    origins = rolling_origins(len(daily_matrix), horizon, n_folds)
+    if not origins or not names:
+        return pd.DataFrame(columns=['model', 'product_name', 'fold', 'origin', 'train_days'] + METRICS)
+
+    folds = fold_features(history_features(daily_factors, daily_matrix.index), origins, horizon)
+    max_workers = store.default_workers() if max_workers is None else max_workers
+
+    if max_workers <= 1 or len(names) < MIN_PRODUCTS_FOR_POOL:
+        parts = [_backtest_chunk(values, origins, horizon, folds, models)]
+    else:
+        # Blocs de colonnes contigus: peu de messages inter-processus
+        n_chunks = min(len(names), max_workers * 4)
+        bounds = np.linspace(0, len(names), n_chunks + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_backtest_chunk, values[:, a:b], origins, horizon, folds, models)
+                for a, b in zip(bounds[:-1], bounds[1:]) if b > a
+            ]
+            parts = [f.result() for f in futures]
+
+    # Valeurs observées: plis × produits × horizon
+    actual = np.stack([values[o:o + horizon].T for o in origins])
+    n_folds, n_series = len(origins), len(names)
+    frames = []
+    for model in models:
+        predicted = np.concatenate([part[model] for part in parts], axis=1)
+        metrics = scores(actual.reshape(-1, horizon), predicted.reshape(-1, horizon))
+        frames.append(pd.DataFrame({
+            'model': model,
+            'product_name': np.tile(names, n_folds),
+            'fold': np.repeat(np.arange(n_folds), n_series),
+            'origin': np.repeat(daily_matrix.index[origins], n_series),
+            'train_days': np.repeat(origins, n_series),
+            **metrics,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize(metrics, by=('model',)):
+    """Scores moyens (tous plis et produits) par modèle, dans l'ordre de MODELS."""
+    by = list(by)
+    summary = metrics.groupby(by, sort=False)[METRICS].mean()
+    summary['folds'] = metrics.groupby(by, sort=False)['fold'].nunique()
+    summary = summary.reset_index()
+    if by == ['model']:
+        order = {model: i for i, model in enumerate(MODELS)}
+        summary = summary.sort_values('model', key=lambda s: s.map(order)).reset_index(drop=True)
+    return summary
+
+
+# ============================================================================
+# PERSISTANCE
+# ============================================================================
+
+def backtest_dir(fingerprint, data_dir=Path(".")):
+    return store.derived_dir(BACKTEST_DIRNAME, fingerprint, data_dir)
+
+
+def read_backtest(fingerprint, data_dir=Path(".")):
+    frames = store.read_frames(BACKTEST_DIRNAME, fingerprint, data_dir)
+    return None if frames is None else frames['metrics']
+
+
+def load_or_build_backtest(daily_matrix, daily_factors, fingerprint, data_dir=Path("."), **kwargs):
+    """Scores de l'empreinte donnée, calculés au besoin."""
+    frames = store.load_or_build_frames(
+        BACKTEST_DIRNAME, fingerprint,
+        lambda: {'metrics': run_backtest(daily_matrix, daily_factors, **kwargs)}, data_dir,
+    )
+    return frames['metrics']
+
+
+# ============================================================================
+# ARRIÈRE-PLAN
+# ============================================================================
+
+class BacktestRunner:
+    """Backtests calculés par un thread d'arrière-plan, un par empreinte."""
+
+    def __init__(self, max_workers=1):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kweek-backtest")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def find(self, fingerprint):
+        """Backtest en cours ou terminé (Future → scores), None s'il n'a pas été lancé."""
+        with self._lock:
+            return self._jobs.get(fingerprint)
+
+    def submit(self, daily_matrix, daily_factors, fingerprint, data_dir=Path("."), **kwargs):
+        """
+        Lancer le backtest de `fingerprint` (scores persistés comme
+        load_or_build_backtest). Un backtest en cours ou réussi pour la même
+        empreinte est réutilisé. Retourne un Future.
+        """
+        with self._lock:
+            job = self._jobs.get(fingerprint)
+            if job is None or (job.done() and job.exception() is not None):
+                # Tâches terminées des autres versions: oubliées (scores relus depuis le disque)
+                self._jobs = {fp: j for fp, j in self._jobs.items() if not j.done()}
+                job = self._pool.submit(load_or_build_backtest, daily_matrix, daily_factors, fingerprint,
+                                        data_dir, **kwargs)
+                self._jobs[fingerprint] = job
+        return job
+
+
+def main():
+    from kweek import ingest
+    from kweek.product_index import daily_quantity_matrix
+
+    fp = store.fingerprint()
+    sales = ingest.load_or_build_aggregates(fp)
+    matrix = daily_quantity_matrix(sales['daily_product'])
+    metrics = load_or_build_backtest(matrix, store.read_table("daily"), fp)
+    print(f"✓ Backtest: {metrics['product_name'].nunique()} produits, "
+          f"{metrics['fold'].nunique()} plis → {backtest_dir(fp)}")
+    for row in summarize(metrics).itertuples():
+        print(f"  {row.model:<15} RMSE={row.rmse:.2f}  MAPE={row.mape:.1f}%  R²={row.r2:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Analyse de paniers (market basket) sur matrices creuses.
+
+Chaque bloc de transactions est encodé en matrice d'incidence creuse
+paniers × produits (X). Un seul produit matriciel Xᵀ·X donne toutes les
+co-occurrences de paires; support, confiance et lift s'en déduisent par des
+opérations vectorisées. Les triplets sont comptés sur une seconde passe pour
+les paires candidates les plus fréquentes: (X[:, a] ∘ X[:, b])ᵀ·X.
+
+Les blocs sont regroupés par jour complet pour qu'un panier ne soit jamais
+coupé entre deux blocs (une transaction n'existe que sur un seul jour). Un
+fichier non trié par date est repris en regroupant toutes ses lignes
+(mémoire proportionnelle au nombre de lignes), comme l'ingestion. Les
+règles sont persistées dans `outputs/store/basket/<empreinte>/`.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from kweek import store
+
+BASKET_DIRNAME = "basket"
+BASKET_COLUMNS = ['transaction_id', 'date', 'product_name']
+
+# Co-occurrences minimales d'une règle, nombre de paires candidates aux triplets
+MIN_COUNT = 2
+MAX_TRIPLE_CANDIDATES = 2000
+
+RULE_METRICS = ['lift', 'confidence', 'support', 'co_count']
+
+
+@dataclass
+class BasketCounts:
+    """Comptages cumulés: paniers, paniers par produit, paires (matrice creuse)."""
+    products: list
+    n_baskets: int
+    item_counts: np.ndarray
+    pair_counts: sparse.csr_matrix
+
+
+def basket_matrix(lines, products):
+    """Matrice d'incidence creuse paniers × produits (1 si le produit est dans le panier)."""
+    baskets, _ = pd.factorize(lines['transaction_id'])
+    cols = pd.Categorical(lines['product_name'].astype(str), categories=products).codes
+    keep = cols >= 0
+    X = sparse.csr_matrix(
+        (np.ones(int(keep.sum()), dtype=np.int32), (baskets[keep], cols[keep])),
+        shape=(int(baskets.max()) + 1 if len(baskets) else 0, len(products)),
+    )
+    X.sum_duplicates()
+    X.data[:] = 1
+    return X
+
+
+class UnsortedBatches(Exception):
+    """Blocs non triés par date: un jour déjà clos réapparaît dans un bloc suivant."""
+
+
+def complete_days(batches):
+    """
+    Regrouper les blocs (triés par date) pour ne jamais couper un jour, donc
+    un panier. Lève UnsortedBatches si une ligne est antérieure au dernier
+    jour déjà vu (ses paniers ont pu être émis incomplets).
+    """
+    pending = None
+    for chunk in batches:
+        if chunk.empty:
+            continue
+        if pending is not None:
+            if chunk['date'].min() < pending['date'].max():
+                raise UnsortedBatches()
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        closed = chunk['date'] < chunk['date'].max()
+        pending = chunk[~closed]
+        if closed.any():
+            yield chunk[closed]
+    if pending is not None and not pending.empty:
+        yield pending
+
+
+def whole_transactions(batches):
+    """Toutes les lignes des blocs en un seul groupe: aucune transaction coupée, quel que soit l'ordre."""
+    chunks = [chunk for chunk in batches if not chunk.empty]
+    if chunks:
+        yield pd.concat(chunks, ignore_index=True)
+
+
+def complete_baskets(batches, ordered=True):
+    """Groupes de lignes sans transaction coupée: jours complets (`ordered`) ou tout le fichier."""
+    return complete_days(batches) if ordered else whole_transactions(batches)
+
+
+def count_pairs(batches, products, ordered=True):
+    """Première passe: co-occurrences de toutes les paires (Xᵀ·X par bloc)."""
+    products = [str(p) for p in products]
+    n = len(products)
+    counts = BasketCounts(products, 0, np.zeros(n, dtype=np.int64), sparse.csr_matrix((n, n), dtype=np.int64))
+    for lines in complete_baskets(batches, ordered):
+        X = basket_matrix(lines, products)
+        counts.n_baskets += X.shape[0]
+        counts.item_counts += np.asarray(X.sum(axis=0)).ravel()
+        counts.pair_counts = counts.pair_counts + (X.T @ X).astype(np.int64)
+    return counts
+
+
+def pair_rules(counts, min_count=MIN_COUNT):
+    """Règles de paires (a < b): co-occurrences, support, confiances et lift."""
+    upper = sparse.triu(counts.pair_counts, k=1).tocoo()
+    keep = upper.data >= min_count
+    a, b, co = upper.row[keep], upper.col[keep], upper.data[keep].astype(float)
+    n = max(counts.n_baskets, 1)
+    na, nb = counts.item_counts[a], counts.item_counts[b]
+    names = np.array(counts.products, dtype=object)
+    rules = pd.DataFrame({
+        'product_a': names[a],
+        'product_b': names[b],
+        'co_count': co.astype(np.int64),
+        'support': co / n,
+        'confidence_ab': co / na,
+        'confidence_ba': co / nb,
+        'lift': co * n / (na * nb),
+    })
+    rules['confidence'] = rules[['confidence_ab', 'confidence_ba']].max(axis=1)
+    return rules.sort_values('co_count', ascending=False, ignore_index=True)
+
+
+def triple_rules(batches, counts, pairs, min_count=MIN_COUNT, max_candidates=MAX_TRIPLE_CANDIDATES, ordered=True):
+    """
+    Seconde passe: triplets (a < b < c) étendant les paires candidates. Le
+    nombre d'un triplet ne dépasse jamais celui de ses paires, donc seules les
+    paires fréquentes peuvent produire des triplets fréquents.
+    """
+    columns = ['product_a', 'product_b', 'product_c', 'co_count', 'support', 'confidence', 'lift']
+    candidates = pairs.head(max_candidates)
+    if candidates.empty:
+        return pd.DataFrame(columns=columns)
+
+    index = {p: i for i, p in enumerate(counts.products)}
+    A = candidates['product_a'].map(index).to_numpy()
+    B = candidates['product_b'].map(index).to_numpy()
+    triples = sparse.csr_matrix((len(candidates), len(counts.products)), dtype=np.int64)
+    for lines in complete_baskets(batches, ordered):
+        X = basket_matrix(lines, counts.products).tocsc()
+        both = X[:, A].multiply(X[:, B]).tocsr()                  # paniers × paires
+        triples = triples + (both.T @ X).astype(np.int64)
+
+    # c > b garantit a < b < c, donc chaque triplet une seule fois
+    coo = triples.tocoo()
+    keep = (coo.col > B[coo.row]) & (coo.data >= min_count)
+    rows, c, co = coo.row[keep], coo.col[keep], coo.data[keep].astype(float)
+    n = max(counts.n_baskets, 1)
+    names = np.array(counts.products, dtype=object)
+    confidence = co / candidates['co_count'].to_numpy()[rows]
+    return pd.DataFrame({
+        'product_a': names[A[rows]],
+        'product_b': names[B[rows]],
+        'product_c': names[c],
+        'co_count': co.astype(np.int64),
+        'support': co / n,
+        'confidence': confidence,
+        'lift': confidence * n / counts.item_counts[c],
+    }, columns=columns).sort_values('co_count', ascending=False, ignore_index=True)
+
+
+def top_rules(rules, k=20, by='lift', min_support=0.0):
+    """Les k meilleures règles selon `by`, au-delà d'un support minimal."""
+    return rules[rules['support'] >= min_support].nlargest(k, by)
+
+
+def build_basket(products, data_dir=Path("."), batch_size=store.CHUNK_ROWS, min_count=MIN_COUNT):
+    """
+    Calculer paires et triplets sur toutes les transactions (deux passes en
+    flux). Fichier non trié par date: passes reprises sur toutes les lignes.
+    """
+    def batches():
+        return store.iter_batches("transactions", columns=BASKET_COLUMNS, batch_size=batch_size, data_dir=data_dir)
+
+    ordered = True
+    try:
+        counts = count_pairs(batches(), products)
+    except UnsortedBatches:
+        ordered = False
+        counts = count_pairs(batches(), products, ordered=False)
+    pairs = pair_rules(counts, min_count)
+    triples = triple_rules(batches(), counts, pairs, min_count, ordered=ordered)
+    summary = pd.DataFrame({
+        'n_baskets': [counts.n_baskets],
+        'avg_basket_size': [counts.item_counts.sum() / max(counts.n_baskets, 1)],
+    })
+    return {'pairs': pairs, 'triples': triples, 'summary': summary}
+
+
+# ============================================================================
+# PERSISTANCE
+# ============================================================================
+
+def basket_dir(fingerprint, data_dir=Path(".")):
+    return store.derived_dir(BASKET_DIRNAME, fingerprint, data_dir)
+
+
+def load_or_build_basket(products, fingerprint, data_dir=Path("."), work_dir=None):
+    """
+    Règles de l'empreinte donnée, calculées au besoin à partir des
+    transactions de `data_dir` et persistées dans `work_dir` (par défaut
+    `data_dir`; un instantané publié n'est jamais modifié).
+    """
+    return store.load_or_build_frames(BASKET_DIRNAME, fingerprint, lambda: build_basket(products, data_dir),
+                                      work_dir or data_dir)
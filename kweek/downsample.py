@@ -0,0 +1,95 @@
+"""
+Sous-échantillonnage des séries longues avant affichage.
+
+Un graphique n'envoie jamais plus de `max_points` points au navigateur,
+quelle que soit la longueur de l'historique:
+
+- LTTB (Largest-Triangle-Three-Buckets) pour les courbes: les points sont
+  répartis en seaux et chaque seau garde le point qui forme le plus grand
+  triangle avec le point retenu du seau précédent et la moyenne du seau
+  suivant. La forme de la courbe et ses pics sont conservés.
+- min-max pour les barres: chaque seau garde son minimum et son maximum,
+  dans leur ordre d'apparition, si bien qu'aucun extrême n'est perdu.
+
+La série est d'abord restreinte à la période affichée (`window`): en
+resserrant la période, le détail quotidien réapparaît. Les résolutions
+hebdomadaire et mensuelle sont pré-calculées dans le cube du Dashboard.
+"""
+
+import numpy as np
+import pandas as pd
+
+MAX_POINTS = 800
+METHODS = ("lttb", "minmax")
+
+
+def lttb(x, y, n_out):
+    """Indices (croissants) des `n_out` points retenus; premier et dernier toujours inclus."""
+    n = len(y)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # n_out − 2 seaux pour les points intérieurs [1, n − 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        nxt_start, nxt_stop = stop, (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x, avg_y = x[nxt_start:nxt_stop].mean(), y[nxt_start:nxt_stop].mean()
+        # Aire (au facteur 1/2 près) du triangle (point retenu, candidat, moyenne suivante)
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax(y, n_out):
+    """Indices (croissants) du minimum et du maximum de chaque seau, au plus `n_out` points."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    n_buckets = max(n_out // 2, 1)
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    # Première occurrence du min et du max de chaque seau, sans boucle Python
+    lows = np.minimum.reduceat(y, edges[:-1])[bucket] == y
+    highs = np.maximum.reduceat(y, edges[:-1])[bucket] == y
+    _, first_low = np.unique(bucket[lows], return_index=True)
+    _, first_high = np.unique(bucket[highs], return_index=True)
+    return np.union1d(np.flatnonzero(lows)[first_low], np.flatnonzero(highs)[first_high])
+
+
+def window(series, start=None, end=None, freq=None):
+    """
+    Partie de `series` (index de dates trié) comprise entre `start` et `end`
+    inclus. `freq`: fréquence des seaux d'une série agrégée, étiquetés par
+    leur début ('W-MON', 'MS'); `start` est ramené au début de son seau, si
+    bien que le premier seau, partiel, reste affiché.
+    """
+    start = None if start is None else pd.Timestamp(start)
+    if start is not None and freq is not None:
+        start = pd.tseries.frequencies.to_offset(freq).rollback(start.normalize())
+    end = None if end is None else pd.Timestamp(end)
+    return series.loc[start:end]
+
+
+def downsample(series, max_points=MAX_POINTS, method="lttb"):
+    """Series indexée par date réduite à au plus `max_points` points (LTTB ou min-max)."""
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue: {method!r} (attendu: {', '.join(METHODS)})")
+    if len(series) <= max_points:
+        return series
+    values = series.to_numpy(dtype=float)
+    if method == "minmax":
+        keep = minmax(values, max_points)
+    else:
+        x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series))
+        keep = lttb(x, values, max_points)
+    return series.iloc[keep]
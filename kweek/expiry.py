@@ -0,0 +1,154 @@
+"""
+Index d'expiration des lots d'inventaire, interrogeable à n'importe quelle date.
+
+La colonne `days_until_expiry` du CSV est figée à la réception. L'index
+recalcule l'état à une date de référence D: un lot est en stock à D s'il est
+arrivé au plus tard D et n'a pas encore expiré (expiration ≥ D).
+
+Les lots sont regroupés par durée de conservation L = expiration − arrivée
+(en jours, peu de valeurs distinctes) puis triés par date d'expiration, avec
+sommes cumulées des lots, quantités et valeurs. Dans un groupe, « arrivé au
+plus tard D » équivaut à « expiration ≤ D + L »: les lots en stock expirant
+dans les N jours sont donc une tranche contiguë, trouvée par recherche
+dichotomique. Une requête coûte O(G·log n), G = nombre de durées distinctes,
+quel que soit le nombre de lots.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _day_numbers(values):
+    """Dates → numéros de jour (int64), pour des recherches sur entiers."""
+    return pd.to_datetime(pd.Series(values)).dt.normalize().to_numpy().astype('datetime64[D]').astype(np.int64)
+
+
+class ExpiryIndex:
+    """Lots triés par expiration, par durée de conservation, avec sommes cumulées."""
+
+    def __init__(self, batches, quantity='quantity_available'):
+        batches = batches.reset_index(drop=True)
+        qty = batches[quantity].to_numpy(dtype=float)
+        value = qty * batches['unit_cost'].to_numpy(dtype=float) if 'unit_cost' in batches.columns else np.zeros(len(qty))
+        exp_day = _day_numbers(batches['expiration_date'])
+        lag = exp_day - _day_numbers(batches['arrival_date'])
+
+        self.batches = batches
+        self.quantity = quantity
+        self.groups = []
+        for shelf_life in np.unique(lag):
+            rows = np.flatnonzero(lag == shelf_life)
+            rows = rows[np.argsort(exp_day[rows], kind='stable')]
+            self.groups.append({
+                'shelf_life': int(shelf_life),
+                'rows': rows,
+                'exp_day': exp_day[rows],
+                'cum_qty': np.concatenate([[0.0], np.cumsum(qty[rows])]),
+                'cum_value': np.concatenate([[0.0], np.cumsum(value[rows])]),
+            })
+
+    @staticmethod
+    def day_number(as_of):
+        return int(np.datetime64(pd.Timestamp(as_of).normalize().date(), 'D').astype(np.int64))
+
+    def _bounds(self, group, as_of, days):
+        """Tranche [lo, hi) des lots du groupe en stock à D et expirant d'ici D + days."""
+        d = self.day_number(as_of)
+        upper = np.minimum(d + np.asarray(days), d + group['shelf_life'])
+        lo = np.searchsorted(group['exp_day'], d, side='left')
+        hi = np.searchsorted(group['exp_day'], upper, side='right')
+        return lo, np.maximum(hi, lo)
+
+    def window(self, as_of, days=np.inf):
+        """
+        Lots en stock à `as_of` expirant dans les `days` jours (days_until_expiry ≤ days):
+        nombre de lots, quantité et valeur au coût. Sans `days`: tout le stock.
+        """
+        days = np.int64(10 ** 9) if np.isinf(days) else int(days)
+        lots = quantity = value = 0.0
+        for group in self.groups:
+            lo, hi = self._bounds(group, as_of, days)
+            lots += hi - lo
+            quantity += group['cum_qty'][hi] - group['cum_qty'][lo]
+            value += group['cum_value'][hi] - group['cum_value'][lo]
+        return {'lots': int(lots), 'quantity': float(quantity), 'value': float(value)}
+
+    def histogram(self, as_of, max_days=30):
+        """Lots, quantité et valeur par jour restant (0..max_days), en un seul passage vectorisé."""
+        days = np.arange(max_days + 1)
+        lots = np.zeros(max_days + 1)
+        quantity = np.zeros(max_days + 1)
+        value = np.zeros(max_days + 1)
+        for group in self.groups:
+            lo, hi = self._bounds(group, as_of, days)
+            lots += hi - lo
+            quantity += group['cum_qty'][hi] - group['cum_qty'][lo]
+            value += group['cum_value'][hi] - group['cum_value'][lo]
+        # Cumuls « ≤ N jours » → effectifs par jour
+        return pd.DataFrame({
+            'days_until_expiry': days,
+            'lots': np.diff(lots, prepend=0).astype(int),
+            'quantity': np.diff(quantity, prepend=0),
+            'value': np.diff(value, prepend=0),
+        })
+
+    def lots(self, as_of, days=np.inf):
+        """Lignes des lots en stock à `as_of` expirant dans les `days` jours, triées par expiration."""
+        days = np.int64(10 ** 9) if np.isinf(days) else int(days)
+        rows = [group['rows'][slice(*self._bounds(group, as_of, days))] for group in self.groups]
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=int)
+        frame = self.batches.iloc[rows]
+        remaining = (pd.to_datetime(frame['expiration_date']).dt.normalize() - pd.Timestamp(as_of).normalize()) // pd.Timedelta(days=1)
+        return frame.assign(days_until_expiry=remaining.astype(int)).sort_values(
+            'expiration_date', kind='stable'
+        )
+
+
+# ============================================================================
+# PRODUITS À RISQUE ET REMISES
+# ============================================================================
+
+NEAR_EXPIRY_DAYS = 2
+RISK_RATIO_THRESHOLD = 0.2
+
+# (part du stock proche de l'expiration minimale, remise de base en %)
+DISCOUNT_STEPS = [(0.7, 60), (0.5, 40), (0.3, 25), (0.2, 15), (0.0, 10)]
+# (quantité proche de l'expiration minimale, remise supplémentaire en %)
+DISCOUNT_BOOSTS = [(100, 15), (50, 7)]
+MAX_DISCOUNT = 80
+
+
+def recommend_discounts(ratio, quantity):
+    """Remise recommandée (%, multiple de 5) selon la part et la quantité proches de l'expiration."""
+    ratio = np.asarray(ratio, dtype=float)
+    quantity = np.asarray(quantity, dtype=float)
+    base = np.select([ratio >= r for r, _ in DISCOUNT_STEPS], [pct for _, pct in DISCOUNT_STEPS], 10)
+    boost = np.select([quantity >= q for q, _ in DISCOUNT_BOOSTS], [pct for _, pct in DISCOUNT_BOOSTS], 0)
+    return (5 * np.round(np.minimum(base + boost, MAX_DISCOUNT) / 5)).astype(int)
+
+
+def near_expiry_risk(batches, window=NEAR_EXPIRY_DAYS, threshold_ratio=RISK_RATIO_THRESHOLD):
+    """
+    Produits à risque d'expiration (durée de conservation ≤ `window` jours):
+    quantité et part du stock concernées, score 0.7·part + 0.3·quantité
+    normalisée, remise recommandée. Un produit est retenu si sa part dépasse
+    `threshold_ratio` ou si son score est dans le décile supérieur.
+    """
+    shelf = (pd.to_datetime(batches['expiration_date']) - pd.to_datetime(batches['arrival_date'])).dt.days
+    qty = batches['quantity_received'].fillna(0)
+    grouped = pd.DataFrame({
+        'product_name': batches['product_name'].astype(str),
+        'final_stock': qty,
+        'near_expiry_qty': qty.where(shelf <= window, 0),
+    }).groupby('product_name').sum().reset_index()
+
+    grouped['near_expiry_ratio'] = (grouped['near_expiry_qty'] / grouped['final_stock'].replace({0: np.nan})).fillna(0)
+    spread = grouped['near_expiry_qty'] - grouped['near_expiry_qty'].min()
+    qty_norm = spread / spread.max() if spread.max() > 0 else spread * 0.0
+    grouped['expiry_risk_score'] = 0.7 * grouped['near_expiry_ratio'] + 0.3 * qty_norm
+
+    risk = grouped[
+        (grouped['near_expiry_ratio'] >= threshold_ratio)
+        | (grouped['expiry_risk_score'] >= grouped['expiry_risk_score'].quantile(0.9))
+    ].sort_values(['expiry_risk_score', 'near_expiry_ratio'], ascending=False)
+    return risk.assign(recommended_discount_pct=recommend_discounts(risk['near_expiry_ratio'], risk['near_expiry_qty']))
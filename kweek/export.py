@@ -0,0 +1,236 @@
+"""
+Exports des rapports (CSV, Excel, PDF) produits en arrière-plan.
+
+Un export est identifié par (jeux de données, format, version des données):
+le fichier est écrit une seule fois dans `outputs/exports/<empreinte>/` puis
+resservi tel quel. Les jeux de données sont fournis sous forme de fonctions
+(nom → callable retournant un DataFrame), évaluées dans le thread de
+l'export: l'interface soumet la demande et continue sans attendre.
+
+- CSV: un fichier (un seul jeu) ou une archive zip (un CSV par jeu), écrits
+  par blocs de lignes.
+- Excel: xlsxwriter en mode `constant_memory` (chaque ligne est écrite sur
+  disque puis libérée), une feuille par jeu, coupée au-delà de la limite de
+  lignes d'Excel.
+- PDF: tableaux paginés dessinés avec matplotlib, limités aux PDF_MAX_ROWS
+  premières lignes de chaque jeu.
+"""
+
+import datetime
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+EXPORT_DIR = Path("outputs") / "exports"
+FORMATS = ("CSV", "Excel", "PDF")
+# À incrémenter quand le contenu d'un export change (anciens fichiers ignorés)
+EXPORT_VERSION = 1
+
+CSV_CHUNK_ROWS = 100_000
+EXCEL_MAX_ROWS = 1_048_576
+PDF_ROWS_PER_PAGE = 35
+PDF_MAX_ROWS = 2000
+# Versions des données dont les exports sont conservés (actuelle + précédente)
+KEEP_VERSIONS = 2
+
+# Valeurs écrites telles quelles dans une cellule Excel
+_NATIVE = (str, int, float, bool, datetime.date, datetime.time, datetime.timedelta)
+
+
+def export_path(datasets, fmt, version, export_dir=EXPORT_DIR):
+    """Fichier de l'export (jeux dans l'ordre donné, format, version des données)."""
+    key = hashlib.sha1(json.dumps([list(datasets), fmt, EXPORT_VERSION]).encode()).hexdigest()[:12]
+    if fmt == "CSV":
+        ext = ".csv" if len(datasets) == 1 else ".zip"
+    else:
+        ext = {"Excel": ".xlsx", "PDF": ".pdf"}[fmt]
+    return Path(export_dir) / version / f"kweek_export_{key}{ext}"
+
+
+# ============================================================================
+# ÉCRITURE
+# ============================================================================
+
+def _write_csv_chunks(frame, f):
+    for start in range(0, max(len(frame), 1), CSV_CHUNK_ROWS):
+        frame.iloc[start:start + CSV_CHUNK_ROWS].to_csv(f, header=start == 0, index=False)
+
+
+def write_csv(frames, path):
+    if len(frames) == 1:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            _write_csv_chunks(next(iter(frames.values())), f)
+        return
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, frame in frames.items():
+            with zf.open(f"{_slug(name)}.csv", 'w') as raw, io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+                _write_csv_chunks(frame, f)
+
+
+def _native(value):
+    """Valeur Python acceptée par les écrivains; sinon son texte (Period, Interval, ...)."""
+    if value is None or isinstance(value, _NATIVE):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _rows(frame):
+    """Lignes en valeurs Python (NaN → cellule vide), converties bloc par bloc."""
+    # Colonnes numériques et dates déjà natives; les autres converties valeur par valeur
+    convert = [i for i, dtype in enumerate(frame.dtypes) if dtype.kind not in "biufmM"]
+    for start in range(0, len(frame), CSV_CHUNK_ROWS):
+        block = frame.iloc[start:start + CSV_CHUNK_ROWS].astype(object)
+        block = block.where(block.notna(), None)
+        for i in convert:
+            block.iloc[:, i] = block.iloc[:, i].map(_native)
+        yield from block.itertuples(index=False, name=None)
+
+
+def write_excel(frames, path):
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(str(path), {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd'})
+    header = workbook.add_format({'bold': True, 'bg_color': '#f0f2f6'})
+    per_sheet = EXCEL_MAX_ROWS - 1
+    for name, frame in frames.items():
+        # constant_memory: lignes écrites dans l'ordre, feuille après feuille
+        for part, start in enumerate(range(0, max(len(frame), 1), per_sheet)):
+            sheet = workbook.add_worksheet(_sheet_name(name, part))
+            sheet.write_row(0, 0, [str(c) for c in frame.columns], header)
+            sheet.freeze_panes(1, 0)
+            for r, row in enumerate(_rows(frame.iloc[start:start + per_sheet]), start=1):
+                sheet.write_row(r, 0, row)
+    workbook.close()
+
+
+def _cell(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+def write_pdf(frames, path):
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    with PdfPages(path) as pdf:
+        for name, frame in frames.items():
+            shown = frame.head(PDF_MAX_ROWS)
+            n_pages = max(1, -(-len(shown) // PDF_ROWS_PER_PAGE))
+            for page in range(n_pages):
+                block = shown.iloc[page * PDF_ROWS_PER_PAGE:(page + 1) * PDF_ROWS_PER_PAGE]
+                fig = Figure(figsize=(11.69, 8.27))  # A4 paysage
+                ax = fig.add_axes((0.03, 0.03, 0.94, 0.88))
+                ax.axis("off")
+                title = f"{name} — page {page + 1}/{n_pages}"
+                if len(frame) > len(shown):
+                    title += f" ({len(shown):,} premières lignes sur {len(frame):,})"
+                fig.suptitle(title, fontsize=12, fontweight="bold")
+                if len(block):
+                    table = ax.table(cellText=[[_cell(v) for v in row] for row in _rows(block)],
+                                     colLabels=[str(c) for c in frame.columns], loc="upper center")
+                    table.auto_set_font_size(False)
+                    table.set_fontsize(7)
+                pdf.savefig(fig)
+
+
+WRITERS = {"CSV": write_csv, "Excel": write_excel, "PDF": write_pdf}
+
+
+def _slug(name):
+    return re.sub(r"[^0-9A-Za-z]+", "_", name).strip("_").lower() or "data"
+
+
+def _sheet_name(name, part):
+    name = re.sub(r"[\[\]:*?/\\]", "_", name)[:27]
+    return name if part == 0 else f"{name} ({part + 1})"
+
+
+# ============================================================================
+# MOTEUR D'EXPORT
+# ============================================================================
+
+class ExportEngine:
+    """Exports écrits par un thread d'arrière-plan, mis en cache par (jeux, format, version)."""
+
+    def __init__(self, export_dir=EXPORT_DIR, max_workers=1):
+        self.export_dir = Path(export_dir)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kweek-export")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _current(self, path):
+        """Tâche valide pour `path` (en cours, ou terminée avec le fichier présent); appel sous verrou."""
+        job = self._jobs.get(path)
+        if job is not None and (not job.done() or (job.exception() is None and path.exists())):
+            return job
+        if path.exists():
+            job = Future()
+            job.set_result(path)
+            self._jobs[path] = job
+            return job
+        return None
+
+    def find(self, datasets, fmt, version):
+        """Export en cours ou terminé (Future → chemin du fichier), None s'il n'a pas été demandé."""
+        path = export_path(datasets, fmt, version, self.export_dir)
+        with self._lock:
+            return self._current(path) or self._jobs.get(path)
+
+    def submit(self, sources, datasets, fmt, version):
+        """
+        Lancer l'export de `datasets` (clés de `sources`, nom → callable
+        retournant un DataFrame) au format `fmt`. Un export déjà écrit ou en
+        cours pour la même version est réutilisé. Retourne un Future.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Format inconnu: {fmt!r} (attendu: {', '.join(FORMATS)})")
+        if not datasets:
+            raise ValueError("Aucun jeu de données sélectionné")
+        unknown = [d for d in datasets if d not in sources]
+        if unknown:
+            raise ValueError(f"Jeu de données inconnu: {unknown[0]!r} (attendu: {', '.join(sources)})")
+
+        path = export_path(datasets, fmt, version, self.export_dir)
+        with self._lock:
+            job = self._current(path)
+            if job is None:
+                job = self._pool.submit(self._run, {d: sources[d] for d in datasets}, fmt, path)
+                self._jobs[path] = job
+        return job
+
+    def _run(self, sources, fmt, path):
+        frames = {name: build() for name, build in sources.items()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        WRITERS[fmt](frames, tmp)
+        os.replace(tmp, path)
+
+        self._prune(path.parent)
+        return path
+
+    def _prune(self, current):
+        """Supprimer les exports des anciennes versions des données (actuelle et précédente conservées)."""
+        with self._lock:
+            busy = {p.parent.name for p, job in self._jobs.items() if not job.done()}
+        others = sorted((d for d in self.export_dir.iterdir() if d.is_dir() and d.name != current.name),
+                        key=lambda d: d.stat().st_mtime, reverse=True)
+        for old in others[KEEP_VERSIONS - 1:]:
+            if old.name not in busy:
+                shutil.rmtree(old, ignore_errors=True)
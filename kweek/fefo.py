@@ -0,0 +1,139 @@
+"""
+Simulation de l'écoulement du stock en FEFO (premier expiré, premier sorti).
+
+Les ventes quotidiennes sont rejouées contre les lots d'inventaire. Par
+produit, les lots sont ordonnés par date d'expiration et leurs quantités
+cumulées S_k délimitent chaque lot sur un axe commun. L'état d'un produit se
+réduit alors au cumul prélevé D_t (vendu + perdu), qui suit:
+
+    D_t = max(min(D_{t-1} + demande_t, A_t), E_t)
+
+où A_t est le cumul des lots arrivés au plus tard t (ventes plafonnées par le
+stock) et E_t le cumul des lots expirés au plus tard t (le reliquat d'un lot
+expiré part en perte). La récursion avance d'un jour à la fois pour tous les
+produits simultanément; la quantité restante de chaque lot s'obtient ensuite
+par écrêtage de D sur [S_{k-1}, S_k], sans boucle par unité ni par lot.
+
+Hypothèse: les lots d'un produit arrivent dans l'ordre de leur expiration
+(durée de conservation constante par produit, comme dans les données).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class FEFOSimulation:
+    """Rejeu FEFO des ventes quotidiennes sur les lots; états interrogeables par date."""
+
+    def __init__(self, batches, daily_sales, end=None):
+        batches = batches.reset_index(drop=True)
+        arrival = pd.to_datetime(batches['arrival_date']).dt.normalize()
+        expiration = pd.to_datetime(batches['expiration_date']).dt.normalize()
+        sales = daily_sales.assign(date=pd.to_datetime(daily_sales['date']).dt.normalize(),
+                                   product_name=daily_sales['product_name'].astype(str))
+
+        start = min(arrival.min(), sales['date'].min())
+        end = pd.Timestamp(end).normalize() if end is not None else max(sales['date'].max(), arrival.max())
+        self.dates = pd.date_range(start, end, freq='D')
+        self.products = sorted(set(batches['product_name'].astype(str)))
+        n_days, n_products = len(self.dates), len(self.products)
+
+        # Demande jour × produit
+        self.demand = (
+            sales.pivot_table(index='date', columns='product_name', values='quantity', aggfunc='sum')
+            .reindex(index=self.dates, columns=self.products).fillna(0.0).to_numpy()
+        )
+
+        # Lots ordonnés par (produit, expiration): bornes cumulées par produit
+        col = pd.Categorical(batches['product_name'].astype(str), categories=self.products).codes
+        order = np.lexsort((arrival.to_numpy(), expiration.to_numpy(), col))
+        self.batches = batches.iloc[order].reset_index(drop=True)
+        self._col = col[order]
+        qty = self.batches['quantity_received'].to_numpy(dtype=float)
+        self._upper = pd.Series(qty).groupby(self._col).cumsum().to_numpy()
+        self._lower = self._upper - qty
+        self._arr = self.dates.get_indexer(arrival.iloc[order])
+        self._exp = self.dates.get_indexer(expiration.iloc[order])
+        # Lots hors calendrier: arrivés après la fin → jamais disponibles; expirés après → jamais périmés
+        self._arr = np.where(self._arr < 0, np.where(arrival.iloc[order] < start, 0, n_days), self._arr)
+        self._exp = np.where(self._exp < 0, np.where(expiration.iloc[order] < start, -1, n_days), self._exp)
+
+        # A_t et E_t: quantités arrivées / expirées par jour, cumulées
+        arrived = np.zeros((n_days + 1, n_products))
+        np.add.at(arrived, (self._arr, self._col), qty)
+        expired = np.zeros((n_days + 1, n_products))
+        np.add.at(expired, (np.where(self._exp < 0, 0, self._exp), self._col), qty)
+        self.arrived = np.cumsum(arrived[:n_days], axis=0)
+        self.expired_floor = np.cumsum(expired[:n_days], axis=0)
+
+        self._run()
+
+    def _run(self):
+        n_days, n_products = self.demand.shape
+        self.drawn = np.zeros((n_days, n_products))          # D_t en fin de journée
+        self.opening = np.zeros((n_days, n_products))        # D avant les ventes du jour
+        self.sold = np.zeros((n_days, n_products))
+        self.wasted = np.zeros((n_days, n_products))
+        D = np.zeros(n_products)
+        for t in range(n_days):
+            self.opening[t] = D
+            served = np.minimum(D + self.demand[t], self.arrived[t])
+            self.sold[t] = served - D
+            D = np.maximum(served, self.expired_floor[t])
+            self.wasted[t] = D - served
+            self.drawn[t] = D
+        self.lost = self.demand - self.sold
+        self.stock = self.arrived - self.drawn
+
+        # Perte par lot: reliquat non vendu le jour de son expiration
+        exp = np.clip(self._exp, 0, n_days - 1)
+        served_at_exp = self.drawn[exp, self._col] - self.wasted[exp, self._col]
+        waste = np.clip(self._upper - np.maximum(served_at_exp, self._lower), 0, None)
+        expired_in_range = (self._exp >= 0) & (self._exp < n_days)
+        self.batch_waste = np.where(expired_in_range, np.minimum(waste, self._upper - self._lower), 0.0)
+
+    def _day(self, as_of):
+        t = self.dates.get_indexer([pd.Timestamp(as_of).normalize()])[0]
+        if t < 0:
+            t = 0 if pd.Timestamp(as_of) < self.dates[0] else len(self.dates) - 1
+        return t
+
+    def remaining(self, as_of):
+        """Quantité restante de chaque lot à l'ouverture du jour `as_of` (livraisons du matin incluses)."""
+        t = self._day(as_of)
+        taken = np.clip(self.opening[t, self._col] - self._lower, 0, self._upper - self._lower)
+        left = (self._upper - self._lower) - taken
+        in_stock = (self._arr <= t) & (self._exp >= t)
+        return pd.Series(np.where(in_stock, left, 0.0), index=self.batches.index)
+
+    def batches_at(self, as_of):
+        """Lots avec `quantity_available` = quantité restante à `as_of` (lots vides exclus)."""
+        left = self.remaining(as_of)
+        return self.batches.assign(quantity_available=left.round().astype(int))[left > 0]
+
+    def batch_summary(self):
+        """Par lot: quantités vendue, perdue et restante en fin de simulation."""
+        qty = self._upper - self._lower
+        taken = np.clip(self.drawn[-1, self._col] - self._lower, 0, qty)
+        return self.batches[['batch_id', 'product_name', 'arrival_date', 'expiration_date']].assign(
+            quantity_received=qty,
+            quantity_sold=taken - self.batch_waste,
+            quantity_wasted=self.batch_waste,
+            quantity_remaining=qty - taken,
+        )
+
+    def daily(self):
+        """Par jour et produit: demande, ventes, ventes perdues, pertes, stock de fin de journée."""
+        index = pd.MultiIndex.from_product([self.dates, self.products], names=['date', 'product_name'])
+        return pd.DataFrame({
+            'demand': self.demand.ravel(),
+            'sold': self.sold.ravel(),
+            'lost_sales': self.lost.ravel(),
+            'wasted': self.wasted.ravel(),
+            'stock': self.stock.ravel(),
+        }, index=index).reset_index()
+
+    def stock_on_hand(self, as_of=None):
+        """Stock par produit en fin de journée `as_of` (par défaut: dernier jour simulé)."""
+        t = len(self.dates) - 1 if as_of is None else self._day(as_of)
+        return pd.Series(self.stock[t], index=self.products, name='stock_on_hand')
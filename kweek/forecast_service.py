@@ -0,0 +1,229 @@
+"""
+Service de prévision à la demande pour l'application.
+
+Calcule la prévision d'un produit pour le modèle et l'horizon choisis
+(Random Forest, ETS, ETS + régresseurs externes) et mémorise les résultats
+par (produit, modèle, horizon, version des données) avec éviction LRU. Les
+modèles ajustés passent par le registre disque (kweek.model_registry), si
+bien qu'un redémarrage de l'application ne réentraîne rien.
+
+Pour l'application, `forecast_within_budget` tient le budget de latence: un
+calcul qui le dépasse (premier entraînement d'un Random Forest) continue en
+arrière-plan et la prévision ETS, bon marché, est servie en attendant.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from kweek import holt_winters
+from kweek.forecasting import MIN_SEASONAL_HISTORY, SEASONAL_PERIODS, SERVICE_LEVEL
+from kweek.model_registry import ModelRegistry, history_digest
+
+MODELS = ("rf", "ets", "ets_regressors")
+
+WEATHER_FEATURES = ['temperature', 'humidity', 'precipitation', 'sunshine_hours']
+RF_FEATURES = WEATHER_FEATURES + ['is_weekend', 'event_impact_factor', 'day_of_week']
+REGRESSOR_FEATURES = ['temperature', 'precipitation', 'is_weekend']
+RF_PARAMS = dict(n_estimators=300, max_depth=8, random_state=42)
+
+# Budget de latence d'une prévision servie à l'application; au-delà, modèle de repli
+LATENCY_BUDGET_MS = 500
+FALLBACK_MODEL = "ets"
+DEFAULT_MAX_ENTRIES = 256
+
+# Calculs poursuivis au-delà du budget: un seul pool pour tous les services (threads créés à la demande)
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="forecast")
+
+
+def history_features(daily_factors, dates):
+    """Variables explicatives alignées sur `dates` (jours sans facteurs: moyennes)."""
+    factors = daily_factors.assign(date=pd.to_datetime(daily_factors['date'])).set_index('date')
+    feats = pd.DataFrame(index=dates)
+    for col in WEATHER_FEATURES:
+        values = factors[col].reindex(dates) if col in factors.columns else pd.Series(np.nan, index=dates)
+        feats[col] = values.fillna(values.mean()).fillna(0.0)
+    impact = factors['event_impact_factor'].reindex(dates) if 'event_impact_factor' in factors.columns else None
+    feats['event_impact_factor'] = impact.fillna(1.0) if impact is not None else 1.0
+    feats['is_weekend'] = (dates.dayofweek >= 5).astype(int)
+    feats['day_of_week'] = dates.dayofweek
+    return feats
+
+
+def future_features(history, future_dates):
+    """
+    Variables des jours futurs: météo = moyenne historique du même jour de
+    l'année (climatologie), pas d'événement connu, calendrier exact.
+    """
+    climatology = history[WEATHER_FEATURES].groupby(history.index.dayofyear).mean()
+    feats = pd.DataFrame(index=future_dates)
+    for col in WEATHER_FEATURES:
+        feats[col] = climatology[col].reindex(future_dates.dayofyear).to_numpy()
+        feats[col] = feats[col].fillna(history[col].mean())
+    feats['event_impact_factor'] = 1.0
+    feats['is_weekend'] = (future_dates.dayofweek >= 5).astype(int)
+    feats['day_of_week'] = future_dates.dayofweek
+    return feats
+
+
+@dataclass
+class ForecastResult:
+    """Prévision servie: tableau, modèle effectivement utilisé, latence de l'appel."""
+    frame: pd.DataFrame
+    model: str
+    latency_ms: float
+    fallback: bool = False
+
+
+class ForecastService:
+    """Prévisions par produit calculées à la demande, mémorisées en LRU."""
+
+    def __init__(self, daily_matrix, daily_factors, registry=None,
+                 max_entries=DEFAULT_MAX_ENTRIES, service_level=SERVICE_LEVEL):
+        self.matrix = daily_matrix
+        self.features = history_features(daily_factors, daily_matrix.index)
+        self.registry = registry or ModelRegistry()
+        self.max_entries = max_entries
+        self.z = float(norm.ppf(service_level))
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        # Calculs en cours (clé → future), poursuivis au-delà du budget de latence
+        self._pending = {}
+
+    def forecast(self, product, model, horizon_days, version):
+        """
+        Prévision quotidienne de `product` sur `horizon_days` jours.
+        Colonnes: ds, yhat, yhat_lower, yhat_upper.
+        """
+        if model not in MODELS:
+            raise ValueError(f"Modèle inconnu: {model!r} (attendu: {', '.join(MODELS)})")
+
+        key = (product, model, horizon_days, version)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        return self._store(key, self._compute(product, model, horizon_days))
+
+    def forecast_within_budget(self, product, model, horizon_days, version, budget_ms=LATENCY_BUDGET_MS):
+        """
+        Comme `forecast`, en au plus `budget_ms` environ: au-delà, le calcul se
+        poursuit en arrière-plan (mémorisé à la fin) et la prévision du modèle
+        de repli (ETS) est retournée. Retourne un ForecastResult.
+        """
+        if model not in MODELS:
+            raise ValueError(f"Modèle inconnu: {model!r} (attendu: {', '.join(MODELS)})")
+
+        started = time.perf_counter()
+        key = (product, model, horizon_days, version)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return ForecastResult(self._cache[key], model, 0.0)
+            future = self._pending.get(key)
+            if future is None:
+                future = _EXECUTOR.submit(self._compute_pending, key, product, model, horizon_days)
+                self._pending[key] = future
+
+        try:
+            frame, used = future.result(timeout=budget_ms / 1000), model
+        except TimeoutError:
+            if model == FALLBACK_MODEL:
+                frame, used = future.result(), model
+            else:
+                frame, used = self.forecast(product, FALLBACK_MODEL, horizon_days, version), FALLBACK_MODEL
+        return ForecastResult(frame, used, (time.perf_counter() - started) * 1000, fallback=used != model)
+
+    def catalogue(self, horizon_days, version):
+        """
+        Prévisions ETS de tous les produits (produits × jours) en un seul appel
+        vectorisé, mémorisées comme les prévisions unitaires.
+        """
+        key = (None, "ets", horizon_days, version)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        state = self.registry.ets_states(self.matrix)
+        future_dates = pd.date_range(
+            self.matrix.index.max() + pd.Timedelta(days=1), periods=horizon_days, freq='D'
+        )
+        result = pd.DataFrame(
+            np.maximum(holt_winters.forecast(state, horizon_days), 0),
+            index=self.matrix.columns, columns=future_dates,
+        )
+        return self._store(key, result)
+
+    # ------------------------------------------------------------------------
+
+    def _cached(self, key):
+        with self._lock:
+            if key not in self._cache:
+                return None
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+    def _store(self, key, result):
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return result
+
+    def _compute_pending(self, key, product, model, horizon_days):
+        try:
+            return self._store(key, self._compute(product, model, horizon_days))
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _compute(self, product, model, horizon_days):
+        y = self.matrix[product].to_numpy(dtype=float) if product in self.matrix.columns else np.zeros(0)
+        future_dates = pd.date_range(
+            self.matrix.index.max() + pd.Timedelta(days=1), periods=horizon_days, freq='D'
+        )
+
+        if len(y) < MIN_SEASONAL_HISTORY:
+            yhat = np.repeat(y.mean() if len(y) else 0.0, horizon_days)
+        elif model == "rf":
+            yhat = self._random_forest(product, y, future_dates)
+        else:
+            state = self.registry.ets_states(self.matrix[[product]])
+            yhat = holt_winters.forecast(state, horizon_days)[0]
+            if model == "ets_regressors":
+                yhat = yhat + self._regressor_adjustment(y, state, future_dates)
+
+        sigma = y.std() if len(y) else 1.0
+        return pd.DataFrame({
+            'ds': future_dates,
+            'yhat': yhat,
+            'yhat_lower': np.maximum(0, yhat - self.z * sigma),
+            'yhat_upper': yhat + self.z * sigma,
+        })
+
+    def _random_forest(self, product, y, future_dates):
+        from sklearn.ensemble import RandomForestRegressor
+
+        X = self.features[RF_FEATURES]
+        # Historique et variables: un modèle n'est pas réutilisé si les données ont changé sur la même plage
+        rf = self.registry.get_or_fit(
+            "rf", product, RF_FEATURES, X.index[0], X.index[-1],
+            lambda: RandomForestRegressor(**RF_PARAMS, n_jobs=-1).fit(X.to_numpy(), y),
+            digest=history_digest(np.column_stack([y, X.to_numpy(dtype=float)])),
+        )
+        return rf.predict(future_features(self.features, future_dates)[RF_FEATURES].to_numpy())
+
+    def _regressor_adjustment(self, y, state, future_dates):
+        """Ridge sur les résidus ETS (température, pluie, week-end), comme le notebook."""
+        from sklearn.linear_model import Ridge
+
+        warmup = 2 * SEASONAL_PERIODS
+        resid = holt_winters.residuals(y[None, :], state)[0]
+        X = self.features[REGRESSOR_FEATURES].to_numpy()
+        ridge = Ridge(alpha=1.0).fit(X[warmup:], resid[warmup:])
+        return ridge.predict(future_features(self.features, future_dates)[REGRESSOR_FEATURES].to_numpy())
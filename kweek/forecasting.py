@@ -0,0 +1,143 @@
+"""
+Moteur de prévision ETS multi-produits.
+
+Un seul appel ajuste un modèle ExponentialSmoothing (tendance et saisonnalité
+additives, période 7) par produit, en parallèle sur tous les cœurs via un
+pool de processus, et retourne un tableau de prévisions unique au format long
+(product_name, ds, yhat, yhat_lower, yhat_upper). Les consommateurs (réassort,
+graphiques quotidiens et hebdomadaires, application) lisent ce même tableau au
+lieu de réajuster les modèles.
+
+Deux backends:
+- "statsmodels": un ExponentialSmoothing optimisé par produit (référence);
+- "numpy": noyau Holt-Winters vectorisé (kweek.holt_winters), toutes les
+  séries ajustées en une passe; adapté aux catalogues de milliers de séries.
+"""
+
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from kweek import holt_winters, store
+
+FORECAST_DAYS = 30
+SEASONAL_PERIODS = 7
+MIN_SEASONAL_HISTORY = 2 * SEASONAL_PERIODS
+SERVICE_LEVEL = 0.95
+
+# En dessous de ce nombre de produits, le coût de démarrage du pool dépasse le gain
+MIN_PRODUCTS_FOR_POOL = 8
+
+BACKENDS = ("statsmodels", "numpy")
+
+
+def forecast_series(y, horizon_days=FORECAST_DAYS, z=None):
+    """
+    Prévision ETS d'une série quotidienne.
+
+    Retourne (yhat, yhat_lower, yhat_upper). Historique trop court ou échec
+    d'ajustement: moyenne historique. Intervalle = ±z·écart-type historique.
+    """
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+    z = float(norm.ppf(SERVICE_LEVEL)) if z is None else z
+    y = np.asarray(y, dtype=float)
+    mu = float(np.mean(y)) if len(y) > 0 else 0.0
+    sigma = float(np.std(y)) if len(y) > 0 else 1.0
+
+    yhat = np.repeat(mu, horizon_days)
+    if len(y) >= MIN_SEASONAL_HISTORY:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                model = ExponentialSmoothing(
+                    y, trend="add", seasonal="add", seasonal_periods=SEASONAL_PERIODS
+                ).fit()
+            yhat = np.asarray(model.forecast(horizon_days), dtype=float)
+        except Exception:
+            pass
+
+    return yhat, np.maximum(0, yhat - z * sigma), yhat + z * sigma
+
+
+def _forecast_chunk(names, values, horizon_days, z):
+    """Tâche d'un processus: prévisions d'un bloc de colonnes (jours × produits)."""
+    return [forecast_series(values[:, j], horizon_days, z) for j in range(len(names))]
+
+
+def _forecast_numpy(values, horizon_days, z, state=None):
+    """Backend vectorisé: toutes les colonnes ajustées d'un coup (ou état fourni)."""
+    Y = values.T
+    mu = Y.mean(axis=1) if Y.shape[1] > 0 else np.zeros(Y.shape[0])
+    sigma = Y.std(axis=1) if Y.shape[1] > 0 else np.ones(Y.shape[0])
+    if Y.shape[1] >= MIN_SEASONAL_HISTORY:
+        state = holt_winters.fit(Y, m=SEASONAL_PERIODS) if state is None else state
+        yhat = holt_winters.forecast(state, horizon_days)
+    else:
+        yhat = np.repeat(mu[:, None], horizon_days, axis=1)
+    lower = np.maximum(0, yhat - z * sigma[:, None])
+    upper = yhat + z * sigma[:, None]
+    return list(zip(yhat, lower, upper))
+
+
+def forecast_catalogue(daily_matrix, horizon_days=FORECAST_DAYS, products=None,
+                       service_level=SERVICE_LEVEL, max_workers=None, backend="statsmodels",
+                       registry=None):
+    """
+    Prévoir tous les produits d'une matrice jours × produits.
+
+    daily_matrix: DataFrame indexé par date (continu), une colonne par produit.
+    products: sous-ensemble optionnel de colonnes (par défaut tout le catalogue).
+    max_workers: nombre de processus (1 = séquentiel), backend "statsmodels".
+    backend: "statsmodels" (ETS optimisé par série) ou "numpy" (noyau vectorisé).
+    registry: ModelRegistry optionnel; avec le backend "numpy", les états en
+        cache sont réutilisés et avancés des seuls jours nouveaux.
+
+    Retourne un DataFrame long: product_name, ds, yhat, yhat_lower, yhat_upper.
+    """
+    names = list(daily_matrix.columns if products is None else products)
+    values = daily_matrix[names].to_numpy(dtype=float)
+    z = float(norm.ppf(service_level))
+    max_workers = store.default_workers() if max_workers is None else max_workers
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu: {backend!r} (attendu: {', '.join(BACKENDS)})")
+
+    if backend == "numpy":
+        state = None
+        if registry is not None and len(daily_matrix) >= MIN_SEASONAL_HISTORY:
+            state = registry.ets_states(daily_matrix[names])
+        results = _forecast_numpy(values, horizon_days, z, state)
+    elif max_workers <= 1 or len(names) < MIN_PRODUCTS_FOR_POOL:
+        results = _forecast_chunk(names, values, horizon_days, z)
+    else:
+        # Blocs de colonnes contigus: peu de messages inter-processus
+        n_chunks = min(len(names), max_workers * 4)
+        bounds = np.linspace(0, len(names), n_chunks + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_forecast_chunk, names[a:b], values[:, a:b], horizon_days, z)
+                for a, b in zip(bounds[:-1], bounds[1:]) if b > a
+            ]
+            results = [r for f in futures for r in f.result()]
+
+    future_dates = pd.date_range(
+        start=daily_matrix.index.max() + pd.Timedelta(days=1), periods=horizon_days, freq='D'
+    )
+    yhat, lower, upper = (np.concatenate(parts) for parts in zip(*results)) if results else ([], [], [])
+    return pd.DataFrame({
+        'product_name': np.repeat(names, horizon_days),
+        'ds': np.tile(future_dates, len(names)),
+        'yhat': yhat,
+        'yhat_lower': lower,
+        'yhat_upper': upper,
+    })
+
+
+def product_forecast(forecasts, product_name):
+    """Prévision d'un produit extraite du tableau long (colonnes ds, yhat, ...)."""
+    rows = forecasts[forecasts['product_name'] == product_name]
+    return rows.drop(columns='product_name').reset_index(drop=True)
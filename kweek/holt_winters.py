@@ -0,0 +1,158 @@
+"""
+Holt-Winters additif vectorisé (tendance + saisonnalité additives).
+
+La récursion de lissage est exécutée sur une matrice séries × jours en une
+seule passe NumPy: chaque pas de temps met à jour toutes les séries (et toutes
+les combinaisons de paramètres de la grille) simultanément. Les paramètres
+sont choisis par série en minimisant l'erreur quadratique de prévision à un
+pas, sans optimiseur itératif.
+
+Forme à correction d'erreur (équivalente à statsmodels ExponentialSmoothing
+trend="add", seasonal="add"):
+    ŷ_t = l_{t-1} + b_{t-1} + s_{t-m}          e_t = y_t - ŷ_t
+    l_t = l_{t-1} + b_{t-1} + α·e_t
+    b_t = b_{t-1} + β·(l_t - l_{t-1} - b_{t-1})
+    s_t = s_{t-m} + γ·e_t
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+SEASONAL_PERIODS = 7
+
+DEFAULT_ALPHAS = (0.02, 0.05, 0.1, 0.2, 0.3, 0.5)
+DEFAULT_BETAS = (0.0, 0.01, 0.05, 0.1)
+DEFAULT_GAMMAS = (0.01, 0.05, 0.1, 0.2, 0.3)
+
+# Nombre maximal de lignes (combinaisons × séries) traitées par bloc
+MAX_BLOCK_ROWS = 500_000
+
+
+@dataclass
+class HoltWintersState:
+    """État lissé et paramètres retenus pour N séries (tableaux de longueur N)."""
+    level: np.ndarray
+    trend: np.ndarray
+    season: np.ndarray      # (N, m), case t % m = composante saisonnière du jour t
+    alpha: np.ndarray
+    beta: np.ndarray
+    gamma: np.ndarray
+    sse: np.ndarray
+    n_obs: int
+    m: int = SEASONAL_PERIODS
+
+
+def initial_state(Y, m=SEASONAL_PERIODS):
+    """Initialisation heuristique à partir des deux premières saisons."""
+    Y = np.asarray(Y, dtype=float)
+    first = Y[:, :m].mean(axis=1)
+    second = Y[:, m:2 * m].mean(axis=1)
+    trend = (second - first) / m
+    # Niveau au temps -1: la moyenne de la 1re saison est centrée sur (m-1)/2
+    level = first - trend * (m + 1) / 2
+    steps = np.arange(1, m + 1)
+    season = Y[:, :m] - (level[:, None] + trend[:, None] * steps)
+    return level, trend, season
+
+
+def _filter(Y, alpha, beta, gamma, level, trend, season, t0, m, warmup=0, errors=None):
+    """
+    Récursion de lissage. Les états ont la forme (..., N) et (..., N, m);
+    les paramètres sont diffusés sur ces formes. Modifie `season` en place
+    (et `errors`, si fourni, reçoit les erreurs à un pas).
+    Retourne (level, trend, season, sse).
+    """
+    sse = np.zeros(np.broadcast(level, alpha).shape)
+    level = level + np.zeros_like(sse)
+    trend = trend + np.zeros_like(sse)
+    for j in range(Y.shape[1]):
+        slot = (t0 + j) % m
+        base = level + trend
+        s_prev = season[..., slot]
+        err = Y[:, j] - (base + s_prev)
+        if j >= warmup:
+            sse += err * err
+        if errors is not None:
+            errors[..., j] = err
+        new_level = base + alpha * err
+        trend = trend + beta * (new_level - level - trend)
+        level = new_level
+        season[..., slot] = s_prev + gamma * err
+    return level, trend, season, sse
+
+
+def fit(Y, m=SEASONAL_PERIODS, alphas=DEFAULT_ALPHAS, betas=DEFAULT_BETAS, gammas=DEFAULT_GAMMAS):
+    """
+    Ajuster N séries (matrice N × T) par recherche sur grille vectorisée.
+
+    Toutes les combinaisons (α, β, γ) sont évaluées en parallèle sur toutes les
+    séries; la meilleure combinaison (SSE à un pas, hors deux premières saisons)
+    est retenue par série.
+    """
+    Y = np.asarray(Y, dtype=float)
+    n_series, n_obs = Y.shape
+    if n_obs < 2 * m:
+        raise ValueError(f"Historique trop court: {n_obs} jours (minimum {2 * m})")
+
+    grid = np.array(np.meshgrid(alphas, betas, gammas, indexing='ij')).reshape(3, -1)
+    n_grid = grid.shape[1]
+    level0, trend0, season0 = initial_state(Y, m)
+
+    best = {k: np.empty(n_series) for k in ('alpha', 'beta', 'gamma', 'sse', 'level', 'trend')}
+    best_season = np.empty((n_series, m))
+    block = max(1, MAX_BLOCK_ROWS // n_grid)
+
+    for a in range(0, n_series, block):
+        b = min(n_series, a + block)
+        params = [p[:, None] for p in grid]                       # (G, 1)
+        season = np.broadcast_to(season0[a:b], (n_grid, b - a, m)).copy()
+        level, trend, season, sse = _filter(
+            Y[a:b], *params, level0[a:b], trend0[a:b], season, t0=0, m=m, warmup=2 * m
+        )
+        k = np.argmin(sse, axis=0)                                # (n_block,)
+        cols = np.arange(b - a)
+        best['alpha'][a:b], best['beta'][a:b], best['gamma'][a:b] = grid[:, k]
+        best['sse'][a:b] = sse[k, cols]
+        best['level'][a:b] = level[k, cols]
+        best['trend'][a:b] = trend[k, cols]
+        best_season[a:b] = season[k, cols]
+
+    return HoltWintersState(
+        level=best['level'], trend=best['trend'], season=best_season,
+        alpha=best['alpha'], beta=best['beta'], gamma=best['gamma'],
+        sse=best['sse'], n_obs=n_obs, m=m,
+    )
+
+
+def update(state, Y_new):
+    """
+    Prolonger l'état avec de nouvelles observations (N × k) sans réajuster:
+    les paramètres sont conservés, seule la récursion avance de k pas.
+    """
+    Y_new = np.asarray(Y_new, dtype=float)
+    level, trend, season, sse = _filter(
+        Y_new, state.alpha, state.beta, state.gamma,
+        state.level, state.trend, state.season.copy(), t0=state.n_obs, m=state.m,
+    )
+    return HoltWintersState(
+        level=level, trend=trend, season=season,
+        alpha=state.alpha, beta=state.beta, gamma=state.gamma,
+        sse=state.sse + sse, n_obs=state.n_obs + Y_new.shape[1], m=state.m,
+    )
+
+
+def residuals(Y, state):
+    """Erreurs de prévision à un pas (N × T) de `state` sur l'historique Y."""
+    Y = np.asarray(Y, dtype=float)
+    level, trend, season = initial_state(Y, state.m)
+    errors = np.empty(Y.shape)
+    _filter(Y, state.alpha, state.beta, state.gamma, level, trend, season, t0=0, m=state.m, errors=errors)
+    return errors
+
+
+def forecast(state, horizon_days):
+    """Prévisions (N × horizon) à partir de l'état lissé."""
+    h = np.arange(1, horizon_days + 1)
+    slots = (state.n_obs + h - 1) % state.m
+    return state.level[:, None] + state.trend[:, None] * h + state.season[:, slots]
@@ -0,0 +1,197 @@
+"""
+Ingestion en flux des transactions.
+
+Les transactions sont parcourues par blocs (kweek.store.iter_batches) et
+repliées au fil de l'eau dans de petits agrégats: par jour, par jour × produit,
+par mois × produit, par produit et par catégorie. La mémoire de pointe dépend
+de la taille d'un bloc et du nombre de jours × produits, jamais du nombre de
+lignes (sauf fichier non trié par date, repris en conservant les identifiants
+de transaction de chaque jour). L'application et le notebook ne consomment que ces agrégats,
+persistés dans `outputs/store/aggregates/<empreinte>/`.
+
+Ingestion manuelle:
+    python -m kweek.ingest
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from kweek import store
+
+AGGREGATES_DIRNAME = "aggregates"
+
+INGEST_COLUMNS = ['transaction_id', 'date', 'product_name', 'category', 'quantity', 'total_amount']
+
+
+def _fold(acc, partial, keys):
+    """Ajouter un agrégat partiel à l'accumulateur (somme par clés)."""
+    if acc is None:
+        return partial
+    return pd.concat([acc, partial]).groupby(keys, observed=True, sort=False).sum()
+
+
+class TransactionAggregates:
+    """
+    Accumulateurs des agrégats de transactions, alimentés bloc par bloc.
+
+    `ordered`: blocs triés par date, les identifiants d'un jour sont oubliés
+    dès qu'un bloc commence après lui. Un jour revu après sa clôture lève
+    `out_of_order` (son nombre de transactions serait compté deux fois);
+    avec `ordered=False`, les identifiants de tous les jours sont conservés
+    jusqu'à `result()`.
+    """
+
+    def __init__(self, ordered=True):
+        self.ordered = ordered
+        self.out_of_order = False
+        self.daily = None
+        self.daily_product = None
+        self.monthly_product = None
+        self.product_category = {}
+        self.n_transactions = {}
+        # Identifiants des jours encore ouverts; jours antérieurs à _closed_before déjà comptés
+        self._open_ids = {}
+        self._closed_before = None
+
+    def add(self, chunk):
+        """Replier un bloc de transactions dans les accumulateurs."""
+        if chunk.empty:
+            return
+        dates = pd.to_datetime(chunk['date']).dt.normalize()
+        chunk = chunk.assign(date=dates)
+
+        lines = chunk.assign(n_lines=1)
+        self.daily = _fold(
+            self.daily,
+            lines.groupby('date')[['total_amount', 'quantity', 'n_lines']].sum(),
+            'date',
+        )
+        self.daily_product = _fold(
+            self.daily_product,
+            lines.groupby(['date', 'product_name'], observed=True)[['quantity', 'total_amount', 'n_lines']].sum(),
+            ['date', 'product_name'],
+        )
+        month = dates.dt.strftime('%Y-%m').rename('month')
+        self.monthly_product = _fold(
+            self.monthly_product,
+            lines.groupby([month, 'product_name'], observed=True)[['quantity', 'total_amount']].sum(),
+            ['month', 'product_name'],
+        )
+
+        if 'category' in chunk.columns:
+            pairs = chunk[['product_name', 'category']].drop_duplicates()
+            self.product_category.update(zip(pairs['product_name'].astype(str), pairs['category'].astype(str)))
+
+        if 'transaction_id' in chunk.columns:
+            self._count_transactions(chunk)
+
+    def _count_transactions(self, chunk):
+        """
+        Transactions distinctes par jour. Seuls les identifiants des jours
+        encore ouverts sont conservés: sur un fichier trié par date, un jour
+        est clos dès qu'un bloc commence après lui.
+        """
+        if self._closed_before is not None and chunk['date'].min() < self._closed_before:
+            self.out_of_order = True
+        for day, ids in chunk.groupby('date')['transaction_id']:
+            self._open_ids.setdefault(day, set()).update(ids.unique())
+        if not self.ordered:
+            return
+        first = chunk['date'].min()
+        self._closed_before = first if self._closed_before is None else max(self._closed_before, first)
+        for day in [d for d in self._open_ids if d < self._closed_before]:
+            self.n_transactions[day] = self.n_transactions.get(day, 0) + len(self._open_ids.pop(day))
+
+    def result(self):
+        """Tables finales (DataFrames à plat) prêtes à être persistées."""
+        for day, ids in self._open_ids.items():
+            self.n_transactions[day] = self.n_transactions.get(day, 0) + len(ids)
+        self._open_ids = {}
+
+        daily = self.daily.sort_index().rename(columns={'total_amount': 'total_revenue', 'quantity': 'total_units'})
+        daily['num_transactions'] = pd.Series(self.n_transactions).reindex(daily.index).fillna(0).astype('int64')
+        daily = daily.reset_index()
+
+        daily_product = self.daily_product.sort_index().reset_index()
+        monthly_product = (
+            self.monthly_product.sort_index().reset_index()
+            .rename(columns={'quantity': 'units_sold', 'total_amount': 'total_revenue'})
+        )
+
+        by_product, by_category = summarize(daily_product, self.product_category)
+        return {
+            'daily': daily,
+            'daily_product': daily_product,
+            'monthly_product': monthly_product,
+            'by_product': by_product,
+            'by_category': by_category,
+        }
+
+
+def summarize(daily_product, product_category):
+    """Cumuls par produit et par catégorie à partir de l'agrégat jour × produit."""
+    by_product = (
+        daily_product.groupby('product_name', observed=True)[['total_amount', 'quantity', 'n_lines']].sum()
+        .sort_values('total_amount', ascending=False)
+        .reset_index()
+    )
+    by_product['category'] = by_product['product_name'].astype(str).map(product_category)
+    by_category = (
+        by_product.groupby('category')[['total_amount', 'quantity', 'n_lines']].sum()
+        .sort_values('total_amount', ascending=False)
+        .reset_index()
+    )
+    return by_product, by_category
+
+
+def _fold_all(data_dir, batch_size, ordered):
+    """Agrégats de toutes les transactions; None si un fichier supposé trié ne l'est pas."""
+    aggs = TransactionAggregates(ordered)
+    for chunk in store.iter_batches("transactions", columns=INGEST_COLUMNS, batch_size=batch_size, data_dir=data_dir):
+        aggs.add(chunk)
+        if aggs.out_of_order:
+            return None
+    return aggs
+
+
+def ingest_transactions(data_dir=Path("."), batch_size=store.CHUNK_ROWS):
+    """
+    Parcourir toutes les transactions par blocs et retourner les agrégats.
+    Fichier non trié par date: second passage qui conserve les identifiants
+    de tous les jours (mémoire proportionnelle au nombre de transactions).
+    """
+    aggs = _fold_all(data_dir, batch_size, ordered=True) or _fold_all(data_dir, batch_size, ordered=False)
+    return aggs.result()
+
+
+# ============================================================================
+# PERSISTANCE
+# ============================================================================
+
+def aggregates_dir(fingerprint, data_dir=Path(".")):
+    return store.derived_dir(AGGREGATES_DIRNAME, fingerprint, data_dir)
+
+
+def save_aggregates(frames, fingerprint, data_dir=Path("."), prune=True):
+    """Écrire les agrégats de façon atomique; les versions précédentes sont supprimées (sauf `prune=False`)."""
+    store.save_frames(AGGREGATES_DIRNAME, frames, fingerprint, data_dir, prune=prune)
+
+
+def read_aggregates(fingerprint, data_dir=Path(".")):
+    return store.read_frames(AGGREGATES_DIRNAME, fingerprint, data_dir)
+
+
+def load_or_build_aggregates(fingerprint, data_dir=Path(".")):
+    """Agrégats de l'empreinte donnée, ingérés en flux au besoin."""
+    return store.load_or_build_frames(AGGREGATES_DIRNAME, fingerprint, lambda: ingest_transactions(data_dir), data_dir)
+
+
+def main():
+    fp = store.fingerprint()
+    frames = load_or_build_aggregates(fp)
+    print(f"✓ Agrégats ({', '.join(f'{k}: {len(v):,}' for k, v in frames.items())}) → {aggregates_dir(fp)}")
+
+
+if __name__ == "__main__":
+    main()
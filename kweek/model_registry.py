@@ -0,0 +1,177 @@
+"""
+Registre des modèles ajustés, persisté dans `outputs/models/`.
+
+- ETS (noyau kweek.holt_winters): l'état lissé de chaque produit est conservé
+  avec sa plage de dates et l'empreinte du contenu de son historique. Quand
+  de nouveaux jours arrivent, l'état avance de ces seuls jours (paramètres
+  inchangés) au lieu d'un réajustement complet; un historique réécrit (même
+  sur la même plage) entraîne un réajustement.
+- Autres modèles (Random Forest, ...): un fichier par (type, produit, jeu de
+  variables, plage de dates, empreinte des données d'entraînement). Un modèle
+  n'est réentraîné que si l'une de ces clés change.
+
+Un fichier par clé (produit ETS, ou type × produit × variables), remplacé
+de façon atomique: plusieurs processus (application, pipeline) partagent le
+registre sans verrou ni index commun.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from kweek import holt_winters
+
+MODELS_DIR = Path("outputs") / "models"
+ETS_DIRNAME = "ets"
+
+
+def _atomic_dump(obj, path):
+    # Fichier temporaire propre au processus et au thread: écrivains concurrents sûrs
+    tmp = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def _short_hash(text):
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def history_digest(values):
+    """Empreinte du contenu d'un historique (valeurs journalières d'un produit)."""
+    return hashlib.sha1(np.ascontiguousarray(values, dtype=float).tobytes()).hexdigest()[:16]
+
+
+def feature_key(feature_cols):
+    """Empreinte courte d'un jeu de variables (ordre significatif)."""
+    return hashlib.sha1("|".join(feature_cols).encode()).hexdigest()[:10]
+
+
+class ModelRegistry:
+    """Cache disque des modèles ETS et des modèles entraînés par produit."""
+
+    def __init__(self, root=MODELS_DIR):
+        self.root = Path(root)
+        (self.root / ETS_DIRNAME).mkdir(parents=True, exist_ok=True)
+        self._ets = {}
+
+    # ------------------------------------------------------------------------
+    # ETS: états lissés par produit, mis à jour incrémentalement
+    # ------------------------------------------------------------------------
+
+    def _ets_path(self, product):
+        return self.root / ETS_DIRNAME / f"{_short_hash(str(product))}.joblib"
+
+    def _ets_entry(self, product):
+        """État en cache du produit (mémoire, puis disque), None s'il n'existe pas."""
+        if product not in self._ets:
+            path = self._ets_path(product)
+            try:
+                entry = joblib.load(path)
+            except (FileNotFoundError, EOFError):
+                entry = None
+            # Clés courtes: vérifier qu'il s'agit bien de ce produit
+            self._ets[product] = entry if entry is not None and entry.get('product') == product else None
+        return self._ets[product]
+
+    def _store_ets(self, entries):
+        for product, entry in entries.items():
+            self._ets[product] = entry
+            _atomic_dump(entry, self._ets_path(product))
+
+    @staticmethod
+    def _split(state, products, start, end, digests):
+        return {
+            p: {
+                'product': p, 'start': start, 'end': end, 'digest': digests[p],
+                'n_obs': state.n_obs, 'm': state.m,
+                'level': state.level[i], 'trend': state.trend[i], 'season': state.season[i],
+                'alpha': state.alpha[i], 'beta': state.beta[i], 'gamma': state.gamma[i],
+                'sse': state.sse[i],
+            }
+            for i, p in enumerate(products)
+        }
+
+    @staticmethod
+    def _stack(entries):
+        first = entries[0]
+        return holt_winters.HoltWintersState(
+            level=np.array([e['level'] for e in entries]),
+            trend=np.array([e['trend'] for e in entries]),
+            season=np.array([e['season'] for e in entries]),
+            alpha=np.array([e['alpha'] for e in entries]),
+            beta=np.array([e['beta'] for e in entries]),
+            gamma=np.array([e['gamma'] for e in entries]),
+            sse=np.array([e['sse'] for e in entries]),
+            n_obs=first['n_obs'], m=first['m'],
+        )
+
+    def ets_states(self, daily_matrix):
+        """
+        États Holt-Winters alignés sur la dernière date de `daily_matrix`
+        (une colonne par produit), dans l'ordre des colonnes.
+
+        Produit en cache avec la même date de début et le même historique
+        jusqu'à sa date de fin (empreinte du contenu): l'état avance des seuls
+        jours nouveaux. Produit absent, historique réécrit ou tronqué:
+        réajustement.
+        """
+        start, end = daily_matrix.index[0], daily_matrix.index[-1]
+        values = daily_matrix.to_numpy(dtype=float)
+        digests = {p: history_digest(values[:, j]) for j, p in enumerate(daily_matrix.columns)}
+
+        refit, to_update = [], {}
+        for j, p in enumerate(daily_matrix.columns):
+            entry = self._ets_entry(p)
+            if entry is None or entry['start'] != start or entry['end'] > end:
+                refit.append(p)
+            elif entry['end'] == end:
+                if entry['digest'] != digests[p]:
+                    refit.append(p)
+            elif entry['digest'] != history_digest(values[daily_matrix.index <= entry['end'], j]):
+                refit.append(p)
+            else:
+                to_update.setdefault(entry['end'], []).append(p)
+
+        if refit:
+            state = holt_winters.fit(daily_matrix[refit].to_numpy(dtype=float).T)
+            self._store_ets(self._split(state, refit, start, end, digests))
+
+        for cached_end, products in to_update.items():
+            new_rows = daily_matrix.loc[daily_matrix.index > cached_end, products]
+            state = holt_winters.update(
+                self._stack([self._ets[p] for p in products]), new_rows.to_numpy(dtype=float).T
+            )
+            self._store_ets(self._split(state, products, start, end, digests))
+
+        return self._stack([self._ets[p] for p in daily_matrix.columns])
+
+    # ------------------------------------------------------------------------
+    # Modèles entraînés (Random Forest, ...) par produit / variables / plage
+    # ------------------------------------------------------------------------
+
+    def get_or_fit(self, kind, product, feature_cols, start, end, fit, digest=""):
+        """
+        Retourner le modèle `kind` de `product` entraîné sur [start, end] avec
+        `feature_cols` et des données d'empreinte `digest` (history_digest);
+        sinon appeler `fit()`, persister et retourner le modèle. Les versions
+        antérieures du même (type, produit, variables) sont supprimées.
+        """
+        start, end = str(pd.Timestamp(start).date()), str(pd.Timestamp(end).date())
+        slot = _short_hash(f"{kind}|{product}|{feature_key(feature_cols)}")
+        path = self.root / f"{kind}_{slot}_{_short_hash(f'{start}|{end}|{digest}')}.joblib"
+        try:
+            return joblib.load(path)
+        except (FileNotFoundError, EOFError):
+            pass
+
+        model = fit()
+        _atomic_dump(model, path)
+        for old in self.root.glob(f"{kind}_{slot}_*.joblib"):
+            if old != path:
+                old.unlink(missing_ok=True)
+        return model
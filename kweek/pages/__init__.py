@@ -0,0 +1,30 @@
+"""
+Pages de l'application Streamlit, une par module (`render(data, data_fingerprint)`).
+
+Un module de page n'est importé qu'à son premier affichage: le démarrage de
+l'application et chaque réexécution ne chargent que les bibliothèques de la
+page affichée.
+"""
+
+import importlib
+
+# Libellé de navigation → module de la page
+PAGES = {
+    "📈 Dashboard": "dashboard",
+    "🔮 Prévisions": "forecasts",
+    "📦 Inventaire": "inventory",
+    "👥 Clients RFM": "clients",
+    "🛒 Bundles": "bundles",
+    "🎲 Scénarios": "scenarios",
+    "🔎 Requêtes": "queries",
+    "📊 Rapports": "reports",
+    "ℹ️ À Propos": "about",
+}
+
+# Pages affichables pour la vue consolidée de plusieurs sites (agrégats fusionnés uniquement)
+ROLLUP_PAGES = ["📈 Dashboard"]
+
+
+def render(page, data, data_fingerprint):
+    """Afficher la page `page` (libellé de navigation)."""
+    importlib.import_module(f"{__name__}.{PAGES[page]}").render(data, data_fingerprint)
@@ -0,0 +1,113 @@
+"""
+Page ℹ️ À Propos: présentation du projet et scores des modèles.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from kweek import backtest
+from kweek.pages.common import MODEL_LABELS, load_backtest, table_rows
+
+
+def render(data, data_fingerprint):
+    st.header("ℹ️ À Propos du Projet")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.subheader("📊 KWEEK Restaurant Analytics")
+        st.markdown("""
+        ### Système Complet d'Analyse Prédictive
+        
+        **Version:** 1.0
+        **Date:** Décembre 2025
+        **Status:** ✅ Production Ready
+        
+        ### Objectifs
+        - 🔮 Prévision précise de la demande
+        - 📦 Optimisation de l'inventaire
+        - 👥 Segmentation intelligente des clients
+        - 💰 Maximisation de la marge commerciale
+        
+        ### Technologies
+        - **Backend:** Jupyter Notebook, Python 3.13
+        - **ML:** scikit-learn, statsmodels, ETS
+        - **Visualisation:** Streamlit, Plotly, Matplotlib
+        - **Data:** pandas, numpy, scipy
+        """)
+    
+    with col2:
+        st.subheader("📈 Performance")
+        
+        backtest_metrics = load_backtest(data_fingerprint)
+        if backtest_metrics is not None and not backtest_metrics.empty:
+            summary = backtest.summarize(backtest_metrics)
+            metrics = pd.DataFrame({
+                'Modèle': summary['model'].map(MODEL_LABELS),
+                'R²': summary['r2'].round(3),
+                'RMSE (unités)': summary['rmse'].round(2),
+                'MAPE (%)': summary['mape'].round(1),
+            })
+            st.dataframe(metrics, width="stretch", hide_index=True)
+            st.caption(
+                f"Backtest glissant: {int(summary['folds'].max())} plis × "
+                f"{backtest_metrics['product_name'].nunique()} produits, moyenne par modèle"
+            )
+        else:
+            st.info("Scores non calculés: lancez le backtest depuis la page Prévisions.")
+        
+        st.subheader("📊 Dataset")
+        
+        stats = pd.DataFrame({
+            'Élément': ['Transactions', 'Jours', 'Produits', 'Clients', 'Articles Stock'],
+            'Quantité': [
+                f"{int(data['cube']['kpis'].iloc[0]['n_lines']):,}",
+                f"{table_rows(data_fingerprint, 'daily')}",
+                f"{table_rows(data_fingerprint, 'products')}",
+                f"{table_rows(data_fingerprint, 'clients')}",
+                f"{table_rows(data_fingerprint, 'inventory'):,}"
+            ]
+        })
+        
+        st.dataframe(stats, width="stretch")
+    
+    st.markdown("---")
+    
+    st.subheader("🔗 Liens et Ressources")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("""
+        **Documentation:**
+        - [README.md](./README.md)
+        - [INDEX.md](./INDEX.md)
+        - [TECHNICAL_DOCUMENTATION.md](./TECHNICAL_DOCUMENTATION.md)
+        """)
+    
+    with col2:
+        st.markdown("""
+        **Rapports:**
+        - [VERIFICATION_REPORT.md](./VERIFICATION_REPORT.md)
+        - [EXECUTIVE_SUMMARY.md](./EXECUTIVE_SUMMARY.md)
+        - [STATUS.md](./STATUS.md)
+        """)
+    
+    with col3:
+        st.markdown("""
+        **Code:**
+        - [kweek-test-notebook.ipynb](./kweek-test-notebook.ipynb)
+        - [app.py](./app.py)
+        """)
+    
+    st.markdown("---")
+    
+    st.subheader("📞 Support et Questions")
+    
+    st.info("""
+    **Pour plus d'informations:**
+    - Consultez la documentation complète
+    - Exécutez le notebook pour régénérer les analyses
+    - Explorez les visualisations dans `outputs/plots/`
+    - Téléchargez les rapports depuis la page "📊 Rapports"
+    """)
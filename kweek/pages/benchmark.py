@@ -0,0 +1,71 @@
+"""
+Budget de démarrage de l'application.
+
+Chaque mesure est faite dans un processus neuf (caches Streamlit vides,
+aucun module importé), avec les données déjà converties sur disque:
+
+- démarrage à froid: imports + premier rendu du Dashboard;
+- réexécution: nouveau rendu du Dashboard (interaction), caches chauds;
+- bibliothèques lourdes chargées après le premier rendu (aucune attendue).
+
+    python -m kweek.pages.benchmark [--app app.py] [--runs 3]
+
+Code de sortie 1 si un budget est dépassé.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+COLD_START_BUDGET_S = 2.5
+RERUN_BUDGET_MS = 250
+HEAVY_MODULES = ["matplotlib.pyplot", "seaborn", "scipy.stats", "sklearn", "statsmodels"]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=300).run()
+cold = time.perf_counter() - started
+assert not at.exception, at.exception
+started = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - started
+print(json.dumps({{'cold_s': cold, 'rerun_ms': rerun * 1000,
+                  'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(app, data_dir=Path(".")):
+    """Une mesure dans un processus neuf: {cold_s, rerun_ms, heavy}."""
+    probe = _PROBE.format(app=str(Path(app).resolve()), heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", probe], cwd=data_dir, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m kweek.pages.benchmark",
+                                     description="Mesurer le démarrage de l'application.")
+    parser.add_argument("--app", type=Path, default=Path("app.py"), help="script Streamlit (défaut: app.py)")
+    parser.add_argument("--runs", type=int, default=3, help="processus mesurés (médiane retenue)")
+    args = parser.parse_args()
+
+    runs = [measure(args.app) for _ in range(args.runs)]
+    cold = statistics.median(r['cold_s'] for r in runs)
+    rerun = statistics.median(r['rerun_ms'] for r in runs)
+    heavy = sorted({m for r in runs for m in r['heavy']})
+
+    ok = cold <= COLD_START_BUDGET_S and rerun <= RERUN_BUDGET_MS and not heavy
+    print(f"{'✓' if ok else '✗'} Démarrage ({args.runs} processus, médiane):")
+    print(f"  premier rendu du Dashboard : {cold:.2f} s (budget {COLD_START_BUDGET_S:.1f} s)")
+    print(f"  réexécution du Dashboard   : {rerun:.0f} ms (budget {RERUN_BUDGET_MS} ms)")
+    print(f"  bibliothèques lourdes      : {', '.join(heavy) if heavy else 'aucune'}")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Page 🛒 Bundles: paires et triplets co-achetés.
+"""
+
+import plotly.express as px
+import streamlit as st
+
+from kweek import basket
+from kweek.pages.common import load_basket
+
+
+def render(data, data_fingerprint):
+    st.header("🛒 Suggestions de Bundles (Market Basket)")
+    
+    rules = load_basket(data_fingerprint, tuple(data['sales']['by_product']['product_name'].astype(str)))
+    pairs, triples = rules['pairs'], rules['triples']
+    summary = rules['summary'].iloc[0]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Paniers analysés", f"{int(summary['n_baskets']):,}")
+    with col2:
+        st.metric("Articles / panier", f"{summary['avg_basket_size']:.2f}")
+    with col3:
+        st.metric("Paires", f"{len(pairs):,}")
+    with col4:
+        st.metric("Triplets", f"{len(triples):,}")
+    
+    st.markdown("---")
+    
+    if pairs.empty:
+        st.info("Aucun produit n'est acheté avec un autre dans un même panier: pas de bundle à proposer.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        metric = st.selectbox("Classer par:", basket.RULE_METRICS)
+    with col2:
+        top_k = st.slider("Nombre de bundles:", 5, 50, 15)
+    with col3:
+        min_support = st.slider("Support minimal:", 0.0, float(pairs['support'].max()), 0.0, format="%.4f")
+    
+    product_filter = st.multiselect("Contenant le produit:", sorted(data['sales']['by_product']['product_name'].astype(str)))
+    
+    def _with_products(frame, cols):
+        if not product_filter:
+            return frame
+        return frame[frame[cols].isin(product_filter).any(axis=1)]
+    
+    tab1, tab2 = st.tabs(["👥 Paires", "🧺 Triplets"])
+    
+    with tab1:
+        top_pairs = basket.top_rules(_with_products(pairs, ['product_a', 'product_b']), top_k, metric, min_support)
+        if top_pairs.empty:
+            st.info("Aucune paire ne satisfait ces critères.")
+        else:
+            top_pairs = top_pairs.assign(bundle=top_pairs['product_a'] + " + " + top_pairs['product_b'])
+            fig = px.bar(top_pairs.iloc[::-1], x=metric, y='bundle', orientation='h',
+                        template='plotly_white', color='lift', color_continuous_scale='Viridis')
+            fig.update_layout(height=max(400, 25 * len(top_pairs)), yaxis_title="")
+            st.plotly_chart(fig, width="stretch")
+            st.dataframe(
+                top_pairs[['bundle', 'co_count', 'support', 'confidence_ab', 'confidence_ba', 'lift']],
+                width="stretch", hide_index=True
+            )
+    
+    with tab2:
+        top_triples = basket.top_rules(
+            _with_products(triples, ['product_a', 'product_b', 'product_c']), top_k, metric, min_support
+        )
+        if top_triples.empty:
+            st.info("Aucun triplet ne satisfait ces critères.")
+        else:
+            top_triples = top_triples.assign(
+                bundle=top_triples['product_a'] + " + " + top_triples['product_b'] + " → " + top_triples['product_c']
+            )
+            st.dataframe(
+                top_triples[['bundle', 'co_count', 'support', 'confidence', 'lift']],
+                width="stretch", hide_index=True
+            )
+    
+    st.caption("Lift > 1: produits achetés ensemble plus souvent que par hasard. "
+               "Confiance A→B: part des paniers contenant A qui contiennent aussi B.")
@@ -0,0 +1,107 @@
+"""
+Page 👥 Clients RFM: segmentation RFM des clients.
+"""
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from kweek.pages.common import load_rfm
+
+
+def render(data, data_fingerprint):
+    st.header("👥 Segmentation RFM des Clients")
+    
+    segmentation = load_rfm(data_fingerprint)
+    rfm_clients, profile = segmentation['clients'], segmentation['profile']
+    summary = segmentation['summary'].iloc[0]
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Total Clients", f"{int(summary['n_clients']):,}")
+    
+    with col2:
+        st.metric("Clusters RFM", int(summary['k']))
+    
+    with col3:
+        st.metric("Silhouette Score", f"{summary['silhouette']:.3f}",
+                  help=f"Estimé sur un échantillon de {int(summary['silhouette_sample']):,} clients")
+    
+    st.markdown("---")
+    
+    segment_icons = {'VIP': '💎', 'Standard': '📢', 'Occasional': '🎁'}
+    tabs = st.tabs(["📊 Clusters"] + [
+        f"{segment_icons.get(name.split(' ')[0], '👤')} {name}" for name in profile['segment']
+    ])
+    
+    with tabs[0]:
+        st.subheader("Distribution des Clusters RFM")
+        
+        col1, col2 = st.columns([1, 1])
+        
+        with col1:
+            fig = px.pie(profile, values='clients', names='segment', template='plotly_white')
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, width="stretch")
+        
+        with col2:
+            # Échantillon borné: le nuage reste lisible quel que soit le nombre de clients
+            points = rfm_clients.sample(min(len(rfm_clients), 5000), random_state=42)
+            fig = px.scatter(points, x='recency', y='monetary', color='segment', size='frequency',
+                            template='plotly_white', labels={'recency': 'Récence (jours)', 'monetary': 'Montant (€)'})
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, width="stretch")
+    
+    strategies = {
+        'VIP': """
+        ✅ Programme de fidélité premium
+        ✅ Offres exclusives et early access
+        ✅ Service personnalisé
+        ✅ Invitations événements spéciaux
+        """,
+        'Standard': """
+        ✅ Promotions régulières
+        ✅ Bundles et offres combinées
+        ✅ Programme de points de fidélité
+        ✅ Communication marketing mensuelle
+        """,
+        'Occasional': """
+        ✅ Campagnes d'acquisition
+        ✅ Offres de bienvenue
+        ✅ Remises d'essai généreuses
+        ✅ Email marketing ciblé
+        ✅ Upgrade vers Standard
+        """,
+    }
+    
+    for tab, (_, seg) in zip(tabs[1:], profile.iterrows()):
+        with tab:
+            st.subheader(f"Segment {seg['segment']}")
+            st.markdown(f"""
+        **Caractéristiques:**
+        - {int(seg['clients']):,} clients ({seg['share']:.0%} du total)
+        - Panier moyen: €{seg['aov']:,.0f}
+        - Fréquence: {seg['frequency_per_month']:.1f} transactions/mois
+        - Dernier achat: il y a {seg['recency']:.0f} jours en moyenne
+        - Montant cumulé moyen: €{seg['monetary']:,.0f}
+        
+        **Stratégie:**
+        {strategies.get(seg['segment'].split(' ')[0], '')}
+        """)
+    
+    st.markdown("---")
+    
+    st.subheader("📋 Matrice RFM Détaillée")
+    
+    rfm_matrix = pd.DataFrame({
+        'Segment': profile['segment'],
+        'Clients': profile['clients'],
+        'Recency (jours)': profile['recency'].round(1),
+        'Frequency (tx/mois)': profile['frequency_per_month'].round(2),
+        'Monetary (€)': profile['monetary'].round(0),
+        'AOV (€)': profile['aov'].round(2),
+        'Action': profile['action'],
+    })
+    
+    st.dataframe(rfm_matrix, width="stretch", hide_index=True)
@@ -0,0 +1,263 @@
+"""
+Données et objets partagés par les pages, mis en cache par Streamlit.
+
+Les tables sont chargées à la demande: `PageData` ne lit une table qu'au
+premier accès d'une page (puis la garde pour le reste de l'exécution), si
+bien qu'un rendu ne paie que les tables qu'il affiche. Les modules de calcul
+lourds (scipy, scikit-learn, statsmodels, matplotlib) sont importés dans les
+fonctions qui les utilisent, jamais au chargement de l'application.
+
+Avec plusieurs restaurants (kweek.sites), l'empreinte des données identifie
+aussi le site: `open_site` enregistre le dossier de sa partition, retrouvé
+par `data_dir_for` dans les chargements mis en cache par empreinte.
+
+Quand un processus kweek.refresh publie les données, l'empreinte servie est
+celle de la version publiée (relue à chaque exécution) et les tables sont
+lues dans son instantané, jamais dans le stockage de travail: tables brutes,
+agrégats et cube appartiennent à la même version, sans conversion par
+l'application. Les sessions basculent à leur prochaine réexécution.
+L'instantané n'est jamais modifié: ce que l'application calcule elle-même
+(règles, RFM, backtest, exports, débordement SQL) est écrit dans le dossier
+de travail, indexé par empreinte.
+"""
+
+from pathlib import Path
+
+import streamlit as st
+
+from kweek import aggregates, ingest, refresh, sites, store
+
+DATA_DIR = Path(".")
+PLOTS_DIR = Path("outputs/plots")
+REPORTS_DIR = Path("outputs/reports")
+ROLLUP_SITE = "🌐 Tous les sites"
+
+# Libellés du sélecteur de modèle → modèles du service de prévision
+FORECAST_MODELS = {
+    "Random Forest ⭐ (Meilleur)": "rf",
+    "ETS Baseline": "ets",
+    "ETS + Regressors": "ets_regressors",
+}
+MODEL_LABELS = {model: label.split(' ⭐')[0] for label, model in FORECAST_MODELS.items()}
+
+
+# ============================================================================
+# SITES
+# ============================================================================
+
+# Empreinte → (dossier servi: instantané publié ou dossier de travail, dossier de travail)
+_DATA_DIRS = {}
+
+
+def site_names():
+    """Restaurants partitionnés (liste vide: dossier de données unique)"""
+    return sites.list_sites(DATA_DIR)
+
+
+def open_site(site=None):
+    """Empreinte servie pour le site (None: dossier unique); ses dossiers sont enregistrés pour les chargements"""
+    if site is None:
+        work_dir = DATA_DIR
+    else:
+        sites.site_fingerprint(site, DATA_DIR)  # site inscrit dans son stockage
+        work_dir = sites.site_dir(site, DATA_DIR)
+    fingerprint, data_dir = refresh.served(work_dir)
+    _DATA_DIRS[fingerprint] = (data_dir, work_dir)
+    return fingerprint
+
+
+def open_rollup(site_list):
+    """Empreinte de la vue consolidée des sites (empreintes de chacun)"""
+    return sites.rollup_fingerprint(site_list, DATA_DIR)
+
+
+def data_dir_for(fingerprint):
+    """Dossier des données de cette empreinte (instantané publié, ou dossier de travail)"""
+    return _DATA_DIRS.get(fingerprint, (DATA_DIR, DATA_DIR))[0]
+
+
+def work_dir_for(fingerprint):
+    """Dossier de travail du site (figures du pipeline, hors publication)"""
+    return _DATA_DIRS.get(fingerprint, (DATA_DIR, DATA_DIR))[1]
+
+
+def publication(fingerprint):
+    """Version publiée par kweek.refresh pour ces données (None: pas de rafraîchissement en place)"""
+    return refresh.read_publication(data_dir_for(fingerprint))
+
+
+# ============================================================================
+# TABLES
+# ============================================================================
+
+@st.cache_data
+def load_sales(fingerprint):
+    """Agrégats des transactions ingérés en flux (jamais chargées entièrement en mémoire)"""
+    return ingest.load_or_build_aggregates(fingerprint, data_dir=data_dir_for(fingerprint))
+
+@st.cache_data
+def load_table(fingerprint, name):
+    """Table du stockage colonnaire (CSV relu seulement si périmé)"""
+    return store.read_table(name, data_dir=data_dir_for(fingerprint))
+
+@st.cache_data
+def load_cube(fingerprint):
+    """Agrégats du Dashboard, calculés une fois par version des données"""
+    return aggregates.load_or_build_cube(load_sales(fingerprint), load_table(fingerprint, "daily"),
+                                         fingerprint, data_dir=data_dir_for(fingerprint))
+
+@st.cache_data
+def table_rows(fingerprint, name):
+    """Nombre de lignes d'une table, lu dans les métadonnées Parquet"""
+    return store.row_count(name, data_dir=data_dir_for(fingerprint))
+
+@st.cache_data
+def load_rollup(fingerprint, site_list):
+    """Vue consolidée des sites (agrégats fusionnés), construite une fois par version des sites"""
+    return sites.load_or_build_rollup(list(site_list), data_dir=DATA_DIR)[1]
+
+
+class PageData:
+    """Accès paresseux aux tables d'une version des données: data['daily'], data['cube'], ..."""
+
+    TABLES = ("daily", "products", "clients", "external", "inventory")
+
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self._loaded = {}
+
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            if name == "sales":
+                self._loaded[name] = load_sales(self.fingerprint)
+            elif name == "cube":
+                self._loaded[name] = load_cube(self.fingerprint)
+            elif name in self.TABLES:
+                self._loaded[name] = load_table(self.fingerprint, name)
+            else:
+                raise KeyError(name)
+        return self._loaded[name]
+
+
+class RollupData(PageData):
+    """Vue consolidée de plusieurs sites: seules les tables issues des agrégats fusionnés."""
+
+    TABLES = ("sales", "cube", "daily")
+
+    def __init__(self, fingerprint, site_list):
+        super().__init__(fingerprint)
+        self.sites = tuple(site_list)
+
+    def __getitem__(self, name):
+        if name not in self.TABLES:
+            raise KeyError(name)
+        return load_rollup(self.fingerprint, self.sites)[name]
+
+
+# ============================================================================
+# OBJETS PARTAGÉS
+# ============================================================================
+
+# Versions des données (sites, version publiée et précédente) gardées en mémoire par objet partagé
+MAX_VERSIONS = 8
+
+@st.cache_resource(max_entries=MAX_VERSIONS)
+def get_product_index(fingerprint, _daily_product):
+    """Index par produit construit une fois par version des données (objet partagé)"""
+    from kweek.product_index import ProductIndex
+    return ProductIndex(_daily_product)
+
+@st.cache_resource(max_entries=MAX_VERSIONS)
+def get_forecast_service(fingerprint, _daily_matrix, _daily):
+    """Service de prévision partagé entre sessions (cache LRU interne), registre de modèles propre au site"""
+    from kweek.forecast_service import ForecastService
+    from kweek.model_registry import MODELS_DIR, ModelRegistry
+    return ForecastService(_daily_matrix, _daily, registry=ModelRegistry(work_dir_for(fingerprint) / MODELS_DIR))
+
+@st.cache_resource(max_entries=MAX_VERSIONS)
+def get_fefo_simulation(fingerprint, _inventory, _daily_product):
+    """Rejeu FEFO des ventes sur les lots (stock réel par lot), une fois par version"""
+    from kweek.fefo import FEFOSimulation
+    return FEFOSimulation(_inventory, _daily_product)
+
+@st.cache_resource(max_entries=16)
+def get_expiry_index(fingerprint, as_of, _simulation):
+    """Index d'expiration des lots encore en stock à la date de référence"""
+    from kweek.expiry import ExpiryIndex
+    return ExpiryIndex(_simulation.batches_at(as_of))
+
+@st.cache_resource(max_entries=16)
+def get_risk_table(fingerprint, as_of, _expiry_index):
+    """Tableau des lots à risque, construit une fois par version et date de référence"""
+    from kweek.risk_table import RiskTable
+    return RiskTable(_expiry_index.lots(as_of))
+
+@st.cache_data
+def load_basket(fingerprint, products):
+    """Règles d'association (paires, triplets) calculées une fois par version des données"""
+    from kweek import basket
+    return basket.load_or_build_basket(list(products), fingerprint, data_dir=data_dir_for(fingerprint),
+                                       work_dir=work_dir_for(fingerprint))
+
+@st.cache_data
+def load_rfm(fingerprint):
+    """Segmentation RFM persistée, relue une fois par version des données"""
+    from kweek import rfm
+    return rfm.load_or_build_rfm(fingerprint, data_dir=data_dir_for(fingerprint), work_dir=work_dir_for(fingerprint))
+
+@st.cache_resource(max_entries=MAX_VERSIONS)
+def get_factor_model(fingerprint, _daily):
+    """Courbes des facteurs de demande et réservoir climatologique, une fois par version"""
+    from kweek.whatif import FactorModel
+    return FactorModel(_daily)
+
+@st.cache_data
+def get_planned_lots(fingerprint, start, horizon_days, _simulation, _inventory):
+    """Stock en main et livraisons habituelles sur l'horizon simulé"""
+    from kweek import whatif
+    return whatif.planned_lots(_simulation, _inventory, start, horizon_days)
+
+@st.cache_data
+def load_backtest(fingerprint):
+    """Scores du backtest glissant (None tant qu'il n'a pas été lancé pour cette version)"""
+    from kweek import backtest
+    return backtest.read_backtest(fingerprint, data_dir=work_dir_for(fingerprint))
+
+@st.cache_resource
+def get_backtest_runner():
+    """Backtests d'arrière-plan partagés entre sessions (un par version des données)"""
+    from kweek.backtest import BacktestRunner
+    return BacktestRunner()
+
+@st.cache_resource
+def get_export_engine(data_dir=DATA_DIR):
+    """Moteur d'export d'arrière-plan partagé entre sessions (fichiers mis en cache par version)"""
+    from kweek.export import EXPORT_DIR, ExportEngine
+    return ExportEngine(Path(data_dir) / EXPORT_DIR)
+
+@st.cache_data
+def load_plot_manifest(plots_dir, signature):
+    """Figures rendues par le pipeline (signature = manifestes et dates de modification)"""
+    from kweek import plots
+    return plots.read_manifests(plots_dir)
+
+@st.cache_resource(max_entries=1)
+def get_query_engine(fingerprint):
+    """Moteur SQL (DuckDB) sur les fichiers Parquet de cette version des données"""
+    from kweek.query import SPILL_DIRNAME, QueryEngine
+    return QueryEngine(data_dir_for(fingerprint), spill_dir=store.store_dir(work_dir_for(fingerprint)) / SPILL_DIRNAME)
+
+@st.cache_data(max_entries=64)
+def load_sales_slice(fingerprint, start, end, categories, conditions, by):
+    """Tranche de ventes filtrée et regroupée, calculée par DuckDB hors de pandas"""
+    return get_query_engine(fingerprint).sales_slice(start, end, categories, conditions, by)
+
+@st.cache_data(max_entries=64)
+def load_sales_totals(fingerprint, start, end, categories, conditions):
+    """Totaux de la tranche de ventes (transactions et clients distincts sur la période)"""
+    return get_query_engine(fingerprint).sales_totals(start, end, categories, conditions)
+
+@st.cache_data(max_entries=64)
+def run_query(fingerprint, sql):
+    """Requête libre en lecture seule → (résultat, tronqué?)"""
+    return get_query_engine(fingerprint).run(sql)
@@ -0,0 +1,143 @@
+"""
+Page 📈 Dashboard: indicateurs clés, tendances, top/flop produits, corrélations.
+"""
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from kweek import aggregates, downsample
+
+
+def render(data, data_fingerprint):
+    st.header("📈 Dashboard Principal")
+    
+    cube = data['cube']
+    kpis = cube['kpis'].iloc[0]
+    
+    # Metrics Row 1
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        total_sales = kpis['total_sales']
+        st.metric("💰 Chiffre d'Affaires Total", f"€{total_sales:,.0f}")
+    
+    with col2:
+        total_units = int(kpis['total_units'])
+        st.metric("📦 Unités Vendues", f"{total_units:,}")
+    
+    with col3:
+        avg_transaction = total_sales / kpis['n_lines']
+        st.metric("🛒 Panier Moyen", f"€{avg_transaction:.2f}")
+    
+    with col4:
+        products_count = int(kpis['n_products'])
+        st.metric("🍽️ Produits Distincts", f"{products_count}")
+    
+    st.markdown("---")
+    
+    # Vue consolidée: part de chaque site (cumuls par site, sans transactions)
+    if 'by_site' in cube:
+        st.subheader("🏬 Répartition par Site")
+        by_site = cube['by_site']
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            fig = px.bar(by_site, x='site', y='total_sales', template='plotly_white',
+                        labels={'site': 'Site', 'total_sales': 'Ventes (€)'})
+            fig.update_layout(height=350, showlegend=False)
+            st.plotly_chart(fig, width="stretch")
+        with col2:
+            st.dataframe(
+                by_site.rename(columns={'site': 'Site', 'total_sales': "Chiffre d'affaires (€)",
+                                        'total_units': 'Unités', 'n_lines': 'Lignes', 'n_products': 'Produits'}),
+                width="stretch", hide_index=True
+            )
+        st.markdown("---")
+    
+    # Row 2: Time Series
+    # Période et résolution choisies côté serveur: chaque courbe envoie au plus downsample.MAX_POINTS points
+    # Les trois résolutions sont lues dans le cube: mêmes totaux quelle que soit la résolution
+    by_day = cube['by_day'].rename(columns={'total_amount': 'total_revenue', 'quantity': 'total_units'})
+    trends = {
+        "Jour": by_day.assign(date=pd.to_datetime(by_day['date'])).set_index('date'),
+        "Semaine": cube['by_week'].set_index('date'),
+        "Mois": cube['by_month'].set_index('date'),
+    }
+    # Fréquence des seaux pré-calculés: la période commence au début de la semaine/du mois
+    freqs = {"Semaine": aggregates.TREND_RESOLUTIONS['by_week'], "Mois": aggregates.TREND_RESOLUTIONS['by_month']}
+    first_day, last_day = trends["Jour"].index.min().date(), trends["Jour"].index.max().date()
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        period = st.date_input("📅 Période:", value=(first_day, last_day),
+                               min_value=first_day, max_value=last_day)
+    with col2:
+        resolution = st.radio("Résolution:", list(trends), horizontal=True)
+    start, end = (period[0], period[-1]) if isinstance(period, (tuple, list)) and period else (first_day, last_day)
+    trend = trends[resolution]
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.subheader("📈 Tendance des Ventes Quotidiennes" if resolution == "Jour" else f"📈 Tendance des Ventes ({resolution})")
+        if 'total_revenue' in trend.columns:
+            full = downsample.window(trend['total_revenue'], start, end, freqs.get(resolution))
+            revenue = downsample.downsample(full, downsample.MAX_POINTS, "lttb")
+            fig = px.line(x=revenue.index, y=revenue.values,
+                         title="Évolution des Ventes",
+                         labels={'x': 'Date', 'y': 'Ventes (€)'},
+                         template='plotly_white')
+            fig.update_layout(hovermode='x unified', height=400)
+            st.plotly_chart(fig, width="stretch")
+            st.caption(f"{len(revenue):,} points affichés sur {len(full):,}")
+    
+    with col2:
+        st.subheader("📊 Volume Quotidien" if resolution == "Jour" else f"📊 Volume ({resolution})")
+        if 'total_units' in trend.columns:
+            full = downsample.window(trend['total_units'], start, end, freqs.get(resolution))
+            units = downsample.downsample(full, downsample.MAX_POINTS, "minmax")
+            fig = px.bar(x=units.index, y=units.values,
+                        title="Unités Vendues par Jour" if resolution == "Jour" else f"Unités Vendues par {resolution}",
+                        labels={'x': 'Date', 'y': 'Quantité'},
+                        template='plotly_white')
+            fig.update_layout(hovermode='x unified', height=400, showlegend=False)
+            st.plotly_chart(fig, width="stretch")
+            st.caption(f"{len(units):,} barres affichées sur {len(full):,}")
+    
+    st.markdown("---")
+    
+    # Row 3: Top Products
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.subheader("🏆 Top 5 Produits par Chiffre d'Affaires")
+        top_products = cube['by_product'].set_index('product_name')['total_amount'].nlargest(5)
+        fig = px.bar(x=top_products.values, y=top_products.index,
+                    orientation='h', template='plotly_white',
+                    labels={'x': 'Ventes (€)', 'y': 'Produit'})
+        fig.update_layout(height=350, showlegend=False)
+        st.plotly_chart(fig, width="stretch")
+    
+    with col2:
+        st.subheader("📉 Bottom 5 Produits")
+        bottom_products = cube['by_product'].set_index('product_name')['total_amount'].nsmallest(5)
+        fig = px.bar(x=bottom_products.values, y=bottom_products.index,
+                    orientation='h', template='plotly_white',
+                    labels={'x': 'Ventes (€)', 'y': 'Produit'},
+                    color_discrete_sequence=['#ff6b6b'])
+        fig.update_layout(height=350, showlegend=False)
+        st.plotly_chart(fig, width="stretch")
+    
+    st.markdown("---")
+    
+    # Correlation Matrix
+    st.subheader("🔗 Corrélation entre Facteurs Externes et Ventes")
+    if 'temperature' in data['daily'].columns and 'total_revenue' in data['daily'].columns:
+        corr_data = cube['corr']
+        fig = go.Figure(data=go.Heatmap(z=corr_data.values,
+                                        x=corr_data.columns,
+                                        y=corr_data.columns,
+                                        colorscale='RdBu',
+                                        zmid=0))
+        fig.update_layout(height=400)
+        st.plotly_chart(fig, width="stretch")
@@ -0,0 +1,197 @@
+"""
+Page 🔮 Prévisions: prévision par produit et par modèle, scores du backtest.
+"""
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from kweek import backtest, downsample
+from kweek.pages.common import (
+    FORECAST_MODELS, MODEL_LABELS, get_backtest_runner, get_forecast_service, get_product_index, load_backtest,
+    work_dir_for,
+)
+
+# Historique affiché sur le graphique de prévision (jours, None = tout)
+HISTORY_WINDOWS = {"90 jours": 90, "1 an": 365, "2 ans": 730, "Tout": None}
+
+
+def render(data, data_fingerprint):
+    st.header("🔮 Système de Prévision de Demande")
+    
+    product_index = get_product_index(data_fingerprint, data['sales']['daily_product'])
+    forecast_service = get_forecast_service(data_fingerprint, product_index.daily_matrix, data['daily'])
+    backtest_metrics = load_backtest(data_fingerprint)
+    
+    # Scores moyens du backtest glissant (tous produits et plis)
+    if backtest_metrics is not None and not backtest_metrics.empty:
+        model_help = " | ".join(
+            f"{MODEL_LABELS[row.model]}: R²={row.r2:.3f}, RMSE={row.rmse:.2f}"
+            for row in backtest.summarize(backtest_metrics).itertuples()
+        )
+    else:
+        model_help = "Scores non calculés: lancez le backtest (section en bas de page ou python -m kweek.backtest)"
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.subheader("⚙️ Paramètres de Prévision")
+        selected_product = st.selectbox(
+            "Sélectionnez un produit:",
+            options=product_index.products
+        )
+        
+        forecast_days = st.slider(
+            "Horizon de prévision (jours):",
+            min_value=7, max_value=90, value=30, step=7
+        )
+        
+        history_days = st.select_slider(
+            "Historique affiché:",
+            options=list(HISTORY_WINDOWS), value="90 jours"
+        )
+        
+        model_choice = st.radio(
+            "Modèle de prévision:",
+            list(FORECAST_MODELS),
+            help=model_help
+        )
+    
+    with col2:
+        st.subheader("📈 Prévision du Produit")
+        product_stats = product_index.stats(selected_product)
+        
+        st.metric("Ventes Totales", f"€{product_stats['total_amount']:,.0f}")
+        st.metric("Quantité Vendue", f"{int(product_stats['quantity']):,} unités")
+        st.metric("Transactions", int(product_stats['n_lines']))
+        st.metric("Prix Moyen", f"€{(product_stats['total_amount'] / product_stats['quantity']):.2f}")
+    
+    st.markdown("---")
+    
+    st.subheader(f"📊 Prévisions: {selected_product}")
+    
+    try:
+        with st.spinner("Calcul de la prévision..."):
+            result = forecast_service.forecast_within_budget(
+                selected_product, FORECAST_MODELS[model_choice], forecast_days, data_fingerprint
+            )
+        product_forecast = result.frame
+        if result.fallback:
+            st.info(f"⏳ {MODEL_LABELS[FORECAST_MODELS[model_choice]]} en cours d'entraînement: "
+                    f"prévision {MODEL_LABELS[result.model]} affichée en attendant "
+                    "(disponible à la prochaine interaction).")
+        
+        fig = go.Figure()
+        
+        # Historique: période choisie, réduite à au plus MAX_POINTS points (pics conservés)
+        history = product_index.daily_series(selected_product)
+        if HISTORY_WINDOWS[history_days] is not None and not history.empty:
+            history = downsample.window(history, history.index[-1] - pd.Timedelta(days=HISTORY_WINDOWS[history_days] - 1))
+        daily_product = downsample.downsample(history, downsample.MAX_POINTS, "lttb")
+        if not daily_product.empty:
+            fig.add_trace(go.Scatter(
+                x=daily_product.index,
+                y=daily_product.values,
+                mode='lines',
+                name='Historique',
+                line=dict(color='blue')
+            ))
+        
+        # Prévision
+        fig.add_trace(go.Scatter(
+            x=product_forecast['ds'],
+            y=product_forecast['yhat'],
+            mode='lines+markers',
+            name='Prévision',
+            line=dict(color='red', dash='dash')
+        ))
+        
+        # Intervalle de confiance
+        fig.add_trace(go.Scatter(
+            x=list(product_forecast['ds']) + list(product_forecast['ds'])[::-1],
+            y=list(product_forecast['yhat_upper']) + list(product_forecast['yhat_lower'])[::-1],
+            fill='toself',
+            name='Intervalle de Confiance (95%)',
+            fillcolor='rgba(255,0,0,0.2)',
+            line=dict(color='rgba(255,255,255,0)')
+        ))
+        
+        fig.update_layout(
+            title=f"Prévision {forecast_days} jours - {selected_product}",
+            xaxis_title="Date",
+            yaxis_title="Quantité",
+            hovermode='x unified',
+            template='plotly_white',
+            height=450
+        )
+        st.plotly_chart(fig, width="stretch")
+        
+        # Afficher les données
+        st.subheader("📋 Détails de la Prévision")
+        st.dataframe(
+            product_forecast.rename(columns={
+                'ds': 'date', 'yhat': 'prévision',
+                'yhat_lower': 'intervalle_inf', 'yhat_upper': 'intervalle_sup'
+            }),
+            width="stretch"
+        )
+        st.caption(
+            f"Horizon affiché: {forecast_days} jours | Modèle: {MODEL_LABELS[result.model]} | "
+            f"Calcul: {result.latency_ms:.0f} ms"
+        )
+    except Exception as e:
+        st.warning(f"⚠️ Prévision indisponible pour ce produit: {str(e)}")
+    
+    st.subheader("🧪 Backtest (origine glissante)")
+    if backtest_metrics is None:
+        st.info(
+            f"Chaque modèle est réentraîné à {backtest.N_FOLDS} dates d'origine successives "
+            f"et évalué sur les {backtest.FORECAST_DAYS} jours suivants, pour tous les produits."
+        )
+        runner = get_backtest_runner()
+        job = runner.find(data_fingerprint)
+        if job is not None and job.done() and job.exception() is None:
+            # Terminé (dans cette session ou une autre): scores relus depuis le disque
+            load_backtest.clear()
+            st.rerun()
+        if job is not None and job.done():
+            st.error(f"❌ Backtest impossible: {job.exception()}")
+        if job is None or job.done():
+            if st.button("▶️ Lancer le backtest"):
+                job = runner.submit(product_index.daily_matrix, data['daily'], data_fingerprint,
+                                    data_dir=work_dir_for(data_fingerprint))
+        if job is not None and not job.done():
+            # Interface non bloquée: seul ce fragment interroge le backtest en cours
+            @st.fragment(run_every=1.0)
+            def backtest_progress():
+                if job.done():
+                    st.rerun()
+                st.info("⏳ Évaluation de tous les modèles et produits en cours…")
+            backtest_progress()
+    elif backtest_metrics.empty:
+        st.info("Historique trop court pour un backtest.")
+    else:
+        product_scores = backtest_metrics[backtest_metrics['product_name'] == selected_product]
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            st.caption("Tous produits (moyenne des plis)")
+            st.dataframe(
+                backtest.summarize(backtest_metrics).assign(model=lambda d: d['model'].map(MODEL_LABELS)),
+                width="stretch", hide_index=True
+            )
+        with col2:
+            st.caption(f"{selected_product} (moyenne des plis)")
+            st.dataframe(
+                backtest.summarize(product_scores).assign(model=lambda d: d['model'].map(MODEL_LABELS)),
+                width="stretch", hide_index=True
+            )
+        
+        fig = px.line(
+            product_scores.assign(model=product_scores['model'].map(MODEL_LABELS)),
+            x='origin', y='rmse', color='model', markers=True,
+            title=f"RMSE par pli - {selected_product}",
+            labels={'origin': "Date d'origine", 'rmse': 'RMSE (unités)', 'model': 'Modèle'}
+        )
+        fig.update_layout(height=350, template='plotly_white')
+        st.plotly_chart(fig, width="stretch")
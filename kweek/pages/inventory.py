@@ -0,0 +1,192 @@
+"""
+Page 📦 Inventaire: lots à risque, distribution, remises, pertes FEFO, réapprovisionnement.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from kweek.pages.common import (
+    get_expiry_index, get_fefo_simulation, get_forecast_service, get_product_index, get_risk_table,
+)
+from kweek.reorder import LEAD_TIME_DAYS, SERVICE_LEVELS, optimize_reorders
+from kweek.risk_table import PAGE_SIZE
+
+
+def render(data, data_fingerprint):
+    st.header("📦 Gestion d'Inventaire")
+    
+    simulation = get_fefo_simulation(data_fingerprint, data['inventory'], data['sales']['daily_product'])
+    
+    # État du stock à la date choisie (par défaut aujourd'hui, borné à la dernière réception)
+    last_arrival = pd.to_datetime(data['inventory']['arrival_date']).max().date()
+    as_of = st.date_input("📅 Date de référence:", value=min(datetime.now().date(), last_arrival),
+                          max_value=max(datetime.now().date(), last_arrival))
+    
+    # Quantités restantes par lot issues du rejeu FEFO des ventes
+    expiry_index = get_expiry_index(data_fingerprint, as_of, simulation)
+    in_stock = expiry_index.window(as_of)
+    at_risk = expiry_index.window(as_of, 7)
+    critical = expiry_index.window(as_of, 1)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Stock", f"{int(in_stock['quantity']):,} unités")
+    
+    with col2:
+        st.metric("Lots en Stock", f"{in_stock['lots']:,}")
+    
+    with col3:
+        st.metric("⚠️ À Risque", f"{at_risk['lots']:,} lots", help="Expiration ≤ 7 jours")
+    
+    with col4:
+        st.metric("🚨 Critique", f"{critical['lots']:,} lots", help="Expiration ≤ 1 jour")
+    
+    st.markdown("---")
+    
+    if in_stock['lots'] > 0:
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["⚠️ Articles à Risque", "📊 Distribution", "💰 Recommandations",
+                                                "♻️ Pertes FEFO", "🚚 Réapprovisionnement"])
+        
+        with tab1:
+            st.subheader("Articles en Danger d'Expiration")
+            
+            risk_table = get_risk_table(data_fingerprint, as_of, expiry_index)
+            
+            bands = risk_table.band_counts()
+            band_cols = st.columns(len(bands))
+            for col, (band, count) in zip(band_cols, bands.items()):
+                col.metric(band, f"{count:,} lots")
+            
+            sort_labels = {
+                'days_until_expiry': "Jours restants",
+                'quantity_available': "Quantité",
+                'product_name': "Produit",
+                'expiration_date': "Date d'expiration",
+            }
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                sort_by = st.selectbox("Trier par:", list(sort_labels), format_func=sort_labels.get)
+            with col2:
+                ascending = st.radio("Ordre:", ["Croissant", "Décroissant"], horizontal=True) == "Croissant"
+            with col3:
+                page_number = st.number_input(f"Page (sur {risk_table.n_pages(PAGE_SIZE)}):",
+                                              min_value=1, max_value=risk_table.n_pages(PAGE_SIZE), value=1)
+            
+            # Seule la page affichée est extraite et stylée
+            rows = risk_table.page(page_number, PAGE_SIZE, sort_by, ascending)
+            st.dataframe(risk_table.style(rows), width="stretch", hide_index=True)
+            st.caption(f"{len(risk_table):,} lots en stock au {as_of:%d/%m/%Y}")
+            
+            # Export button (CSV encodé seulement au clic)
+            st.download_button(
+                label="📥 Télécharger Liste Complète (CSV)",
+                data=risk_table.to_csv,
+                file_name=f"inventory_expiry_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+        
+        with tab2:
+            st.subheader("Distribution des Articles par Jours jusqu'à Expiration")
+            # Effectifs par jour restant (≤30 jours), calculés par l'index
+            distribution = expiry_index.histogram(as_of, 30)
+            fig = px.bar(distribution, x='days_until_expiry', y='lots',
+                         template='plotly_white',
+                         labels={'days_until_expiry': 'Jours jusqu\'à Expiration', 'lots': 'Nombre de Lots'},
+                         title="Distribution des Lots par Jours d'Expiration (≤30 jours)")
+            fig.update_layout(height=400, showlegend=False)
+            st.plotly_chart(fig, width="stretch")
+            
+            st.info(f"📊 Total lots à risque (≤30 jours): {int(distribution['lots'].sum()):,}")
+        
+        with tab3:
+            st.subheader("💰 Recommandations de Réduction")
+            st.info("🎯 Stratégie: Appliquer des réductions proportionnelles au risque d'expiration")
+            
+            risk_levels = [
+                ("🚨 Critique (≤1 jour)", 1, 80),
+                ("⚠️ Haute (2-3 jours)", 3, 60),
+                ("🟡 Moyenne (4-7 jours)", 7, 40),
+                ("🟢 Basse (8-14 jours)", 14, 20)
+            ]
+            
+            for label, days, discount in risk_levels:
+                window = expiry_index.window(as_of, days)
+                st.markdown(f"{label} → **{discount}% de réduction** | {window['lots']} lots | €{window['value']:,.2f}")
+        
+        with tab4:
+            st.subheader("♻️ Écoulement FEFO: Ventes, Pertes et Ruptures")
+            flows = simulation.daily()
+            flows = flows[flows['date'] <= pd.Timestamp(as_of)]
+            weekly = flows.groupby(pd.Grouper(key='date', freq='W'))[['sold', 'wasted', 'lost_sales']].sum()
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Unités Vendues", f"{int(weekly['sold'].sum()):,}")
+            with col2:
+                waste_rate = weekly['wasted'].sum() / max(weekly['sold'].sum() + weekly['wasted'].sum(), 1)
+                st.metric("Unités Perdues (expirées)", f"{int(weekly['wasted'].sum()):,}", f"{waste_rate:.1%} du flux",
+                          delta_color="inverse")
+            with col3:
+                st.metric("Ventes Manquées (rupture)", f"{int(weekly['lost_sales'].sum()):,}")
+            
+            fig = px.line(weekly.reset_index(), x='date', y=['sold', 'wasted', 'lost_sales'],
+                          template='plotly_white',
+                          labels={'date': 'Semaine', 'value': 'Unités', 'variable': ''})
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, width="stretch")
+            
+            by_product = flows.groupby('product_name')[['sold', 'wasted', 'lost_sales']].sum()
+            by_product['waste_rate'] = by_product['wasted'] / (by_product['sold'] + by_product['wasted']).replace(0, np.nan)
+            st.dataframe(by_product.sort_values('wasted', ascending=False), width="stretch")
+        
+        with tab5:
+            st.subheader("🚚 Points de Commande et Stocks de Sécurité")
+            
+            product_index = get_product_index(data_fingerprint, data['sales']['daily_product'])
+            forecast_service = get_forecast_service(data_fingerprint, product_index.daily_matrix, data['daily'])
+            
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                service_levels = st.multiselect("Niveaux de service (scénarios):",
+                                                [0.80, 0.85, 0.90, 0.95, 0.98, 0.99],
+                                                default=list(SERVICE_LEVELS), format_func="{:.0%}".format)
+            with col2:
+                review_days = st.slider("Période de revue (jours):", 1, 14, 7)
+            
+            if service_levels:
+                service_levels = sorted(service_levels)
+                # Tous les produits × tous les scénarios en un seul passage vectorisé
+                plan = optimize_reorders(
+                    forecast_service.catalogue(60, data_fingerprint),
+                    data['products'],
+                    simulation.stock_on_hand(),
+                    product_index.daily_matrix.std(),
+                    service_levels=service_levels,
+                    review_days=review_days,
+                )
+                
+                scenarios = plan.groupby('service_level')[['safety_stock', 'order_qty', 'expected_waste']].sum().reset_index()
+                fig = px.bar(scenarios.melt(id_vars='service_level'), x='service_level', y='value', color='variable',
+                             barmode='group', template='plotly_white',
+                             labels={'service_level': 'Niveau de service', 'value': 'Unités', 'variable': ''})
+                fig.update_xaxes(tickformat='.0%', type='category')
+                fig.update_layout(height=350)
+                st.plotly_chart(fig, width="stretch")
+                
+                level = st.select_slider("Détail pour le niveau de service:", options=service_levels,
+                                         value=0.95 if 0.95 in service_levels else service_levels[-1],
+                                         format_func="{:.0%}".format)
+                detail = plan[plan['service_level'] == level].drop(columns='service_level')
+                st.dataframe(
+                    detail.sort_values(['reorder_now', 'order_qty'], ascending=False).round(1),
+                    width="stretch", hide_index=True
+                )
+                st.caption(f"Stock au {simulation.dates[-1]:%d/%m/%Y} (rejeu FEFO), prévision ETS, "
+                           f"délai de livraison par défaut: {LEAD_TIME_DAYS} jours.")
+    else:
+        st.warning(f"⚠️ Aucun lot en stock au {as_of:%d/%m/%Y}.")
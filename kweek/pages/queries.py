@@ -0,0 +1,163 @@
+"""
+Page 🔎 Requêtes: explorateur des ventes filtrées et requêtes SQL libres.
+
+Les deux sections interrogent le moteur DuckDB (`kweek.query`) directement sur
+les fichiers Parquet du stockage: les filtres ne chargent aucune table dans
+pandas et les résultats sont mis en cache par version des données.
+"""
+
+import time
+
+import plotly.express as px
+import streamlit as st
+
+from kweek import downsample, query
+from kweek.pages.common import get_query_engine, load_sales_slice, load_sales_totals, run_query
+
+METRICS = {
+    "Chiffre d'affaires (€)": "revenue",
+    "Unités vendues": "units",
+    "Transactions": "transactions",
+    "Clients distincts": "clients",
+}
+
+EXAMPLE_QUERIES = {
+    "CA par catégorie et météo": """SELECT t.category, e.weather_condition,
+       SUM(t.total_amount) AS revenue, SUM(t.quantity) AS units
+FROM transactions t
+JOIN external e ON e.date = t.date
+GROUP BY ALL
+ORDER BY revenue DESC""",
+    "Panier moyen par segment client": """SELECT c.segment,
+       COUNT(DISTINCT t.transaction_id) AS transactions,
+       SUM(t.total_amount) / COUNT(DISTINCT t.transaction_id) AS avg_basket
+FROM transactions t
+JOIN clients c USING (client_id)
+GROUP BY ALL
+ORDER BY avg_basket DESC""",
+    "Stock disponible par produit": """SELECT product_name, status,
+       SUM(quantity_available) AS available, MIN(expiration_date) AS first_expiry
+FROM inventory
+GROUP BY ALL
+ORDER BY product_name, status""",
+    "Ventes des jours d'événement": """SELECT d.event_name, COUNT(*) AS days,
+       AVG(d.total_revenue) AS avg_revenue, AVG(d.total_units) AS avg_units
+FROM daily d
+WHERE d.event_name IS NOT NULL
+GROUP BY ALL
+ORDER BY avg_revenue DESC""",
+}
+
+
+def render(data, data_fingerprint):
+    st.header("🔎 Requêtes sur les Données")
+
+    engine = get_query_engine(data_fingerprint)
+    options = engine.filter_options()
+
+    tab1, tab2 = st.tabs(["🎛️ Explorateur", "🧮 SQL"])
+
+    with tab1:
+        _explorer(data_fingerprint, options)
+
+    with tab2:
+        _sql_panel(data_fingerprint, engine)
+
+
+# ============================================================================
+# EXPLORATEUR
+# ============================================================================
+
+def _explorer(data_fingerprint, options):
+    first_day, last_day = options['first'].date(), options['last'].date()
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        period = st.date_input("📅 Période:", value=(first_day, last_day),
+                               min_value=first_day, max_value=last_day, key="query_period")
+    with col2:
+        by = st.selectbox("Regrouper par:", list(query.SLICE_DIMENSIONS), index=2)
+    start, end = (period[0], period[-1]) if isinstance(period, (tuple, list)) and period else (first_day, last_day)
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        categories = st.multiselect("Catégories:", options['categories'], placeholder="Toutes")
+    with col2:
+        conditions = st.multiselect("Météo:", options['conditions'], placeholder="Toutes")
+    with col3:
+        metric_label = st.selectbox("Mesure:", list(METRICS))
+    metric = METRICS[metric_label]
+
+    started = time.perf_counter()
+    result = load_sales_slice(data_fingerprint, start, end, tuple(categories), tuple(conditions), by)
+    totals = load_sales_totals(data_fingerprint, start, end, tuple(categories), tuple(conditions))
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if result.empty:
+        st.info("Aucune vente ne correspond à ces filtres.")
+        return
+
+    # Totaux de la période: une transaction répartie sur plusieurs groupes ne compte qu'une fois
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("💰 Chiffre d'affaires", f"€{totals['revenue']:,.0f}")
+    with col2:
+        st.metric("📦 Unités", f"{int(totals['units']):,}")
+    with col3:
+        st.metric("🧾 Transactions", f"{int(totals['transactions']):,}")
+    with col4:
+        st.metric("👥 Clients", f"{int(totals['clients']):,}")
+
+    if by in query.TIME_DIMENSIONS:
+        series = downsample.downsample(result.set_index(by)[metric], method="lttb")
+        fig = px.line(series.reset_index(), x=by, y=metric, template='plotly_white', markers=len(series) < 60)
+    else:
+        fig = px.bar(result, x=by, y=metric, template='plotly_white', color=by)
+        fig.update_layout(showlegend=False)
+    fig.update_layout(height=420, yaxis_title=metric_label, xaxis_title="")
+    st.plotly_chart(fig, width="stretch")
+
+    st.dataframe(result, width="stretch", hide_index=True)
+    st.caption(f"{len(result):,} lignes — {elapsed:.0f} ms (DuckDB sur les fichiers Parquet, "
+               "résultat mis en cache par version des données)")
+
+
+# ============================================================================
+# SQL LIBRE
+# ============================================================================
+
+def _sql_panel(data_fingerprint, engine):
+    st.markdown("Requêtes en lecture seule (`SELECT` / `WITH`) sur les tables "
+                f"{', '.join(f'`{t}`' for t in engine.tables)}.")
+
+    with st.expander("📋 Schéma des tables"):
+        schema = engine.schema()
+        table = st.selectbox("Table:", engine.tables, key="query_schema_table")
+        st.dataframe(schema[schema['table'] == table][['column', 'type']],
+                     width="stretch", hide_index=True)
+
+    example = st.selectbox("Exemple:", list(EXAMPLE_QUERIES))
+    sql = st.text_area("Requête SQL:", value=EXAMPLE_QUERIES[example], height=200, key=f"query_sql_{example}")
+
+    if st.button("▶️ Exécuter", type="primary"):
+        st.session_state.query_submitted = sql
+
+    submitted = st.session_state.get('query_submitted')
+    if not submitted:
+        return
+
+    started = time.perf_counter()
+    try:
+        result, truncated = run_query(data_fingerprint, submitted)
+    except query.QueryError as exc:
+        st.error(f"❌ {exc}")
+        return
+    elapsed = (time.perf_counter() - started) * 1000
+
+    st.dataframe(result, width="stretch", hide_index=True)
+    shown = f"{len(result):,} lignes"
+    if truncated:
+        shown = f"{query.MAX_RESULT_ROWS:,} premières lignes"
+    st.caption(f"{shown} — {elapsed:.0f} ms")
+    st.download_button("📥 Télécharger (CSV)", data=result.to_csv(index=False).encode('utf-8'),
+                       file_name="kweek_requete.csv", mime="text/csv")
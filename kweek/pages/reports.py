@@ -0,0 +1,167 @@
+"""
+Page 📊 Rapports: fichiers produits, figures du pipeline, exports.
+"""
+
+import streamlit as st
+
+from kweek import aggregates, export, plots, rfm
+from kweek.pages.common import (
+    PLOTS_DIR, REPORTS_DIR, data_dir_for, get_export_engine, get_fefo_simulation, get_forecast_service, get_product_index,
+    load_plot_manifest, work_dir_for,
+)
+
+THUMBS_PER_PAGE = 12
+EXPORT_DATASETS = ["Prévisions", "Inventaire", "Clients RFM", "Résumé Commercial"]
+
+
+def render(data, data_fingerprint):
+    st.header("📊 Rapports et Téléchargements")
+    
+    # Rapports de la version servie (instantané publié ou dossier de travail), figures du pipeline du site
+    data_dir = data_dir_for(data_fingerprint)
+    reports_dir = data_dir / REPORTS_DIR
+    plots_dir = work_dir_for(data_fingerprint) / PLOTS_DIR
+    
+    st.subheader("📥 Fichiers Disponibles")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.markdown("### 📈 Données de Prévision")
+        
+        forecast_files = sorted(list(reports_dir.glob("demand_forecasts_*.csv")))
+        for file in forecast_files[-3:]:  # 3 derniers fichiers
+            size = file.stat().st_size / 1024  # KB
+            st.write(f"📄 {file.name} ({size:.1f} KB)")
+            
+            # Fichier lu seulement au clic
+            st.download_button(
+                label=f"⬇️ Télécharger {file.name}",
+                data=file.read_bytes,
+                file_name=file.name,
+                mime="text/csv",
+                key=file.name
+            )
+    
+    with col2:
+        st.markdown("### 📋 Résumés Commerciaux")
+        
+        summary_files = sorted(list(reports_dir.glob("monthly_commercial_*.csv")))
+        for file in summary_files[-3:]:
+            size = file.stat().st_size / 1024
+            st.write(f"📄 {file.name} ({size:.1f} KB)")
+            
+            # Fichier lu seulement au clic
+            st.download_button(
+                label=f"⬇️ Télécharger {file.name}",
+                data=file.read_bytes,
+                file_name=file.name,
+                mime="text/csv",
+                key=f"summary_{file.name}"
+            )
+    
+    st.markdown("---")
+    
+    st.subheader("📊 Visualisations Disponibles")
+    
+    # Miniatures du manifeste; l'image pleine taille n'est lue qu'à la demande
+    manifest_files = sorted((plots_dir / plots.MANIFEST_DIRNAME).glob("*.json"))
+    figures = load_plot_manifest(plots_dir, tuple((p.name, p.stat().st_mtime_ns) for p in manifest_files))
+    
+    if figures.empty:
+        st.info("ℹ️ Aucune miniature: lancez `python -m kweek.pipeline plots eda` pour rendre les figures.")
+        plot_files = sorted(plots_dir.glob("*.png"))
+        if plot_files:
+            selected_file = st.selectbox("Afficher une figure:", [None] + plot_files,
+                                         format_func=lambda f: "—" if f is None else f.name)
+            if selected_file is not None:
+                st.image(str(selected_file), width="stretch")
+    else:
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            group = st.selectbox("Groupe:", ["Tous"] + list(dict.fromkeys(figures['group'])))
+        shown = figures if group == "Tous" else figures[figures['group'] == group]
+        n_pages = max(1, -(-len(shown) // THUMBS_PER_PAGE))
+        with col2:
+            page_num = st.number_input(f"Page (sur {n_pages}):", min_value=1, max_value=n_pages, value=1)
+        
+        full = st.session_state.get('plot_full')
+        if full is not None and full in set(figures['name']):
+            entry = figures.set_index('name').loc[full]
+            st.image(str(plots_dir / entry['file']), caption=entry['title'], width="stretch")
+            if st.button("✖️ Fermer", key="plot_close"):
+                st.session_state.plot_full = None
+                st.rerun()
+        
+        col_count = 4
+        cols = st.columns(col_count)
+        page_rows = shown.iloc[(page_num - 1) * THUMBS_PER_PAGE:page_num * THUMBS_PER_PAGE]
+        for idx, entry in enumerate(page_rows.itertuples()):
+            with cols[idx % col_count]:
+                st.image(str(plots_dir / entry.thumb), width="stretch")
+                st.caption(f"{entry.group} · {entry.title}")
+                if st.button("🔍 Agrandir", key=f"plot_{entry.name}"):
+                    st.session_state.plot_full = entry.name
+                    st.rerun()
+        
+        st.caption(f"📁 {len(shown)} visualisation(s) · dossier {plots_dir}/")
+    
+    st.markdown("---")
+    
+    st.subheader("📥 Export Personnalisé")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        export_format = st.radio("Format d'export:", list(export.FORMATS))
+    
+    with col2:
+        export_type = st.multiselect(
+            "Données à exporter:",
+            list(EXPORT_DATASETS),
+            default=["Prévisions"]
+        )
+    # Ordre fixe des jeux: une même sélection donne toujours le même fichier
+    export_type = [d for d in EXPORT_DATASETS if d in export_type]
+    
+    engine = get_export_engine(work_dir_for(data_fingerprint))
+    if st.button("✅ Générer Export", disabled=not export_type):
+        # Jeux assemblés dans le thread de l'export, à partir des objets déjà en mémoire
+        from kweek.forecasting import FORECAST_DAYS
+        product_index = get_product_index(data_fingerprint, data['sales']['daily_product'])
+        service = get_forecast_service(data_fingerprint, product_index.daily_matrix, data['daily'])
+        simulation = get_fefo_simulation(data_fingerprint, data['inventory'], data['sales']['daily_product'])
+        sources = {
+            "Prévisions": lambda: (service.catalogue(FORECAST_DAYS, data_fingerprint)
+                                   .stack().rename_axis(['product_name', 'date']).rename('forecast').reset_index()),
+            "Inventaire": simulation.batch_summary,
+            "Clients RFM": lambda: rfm.load_or_build_rfm(
+                data_fingerprint, data_dir=data_dir, work_dir=work_dir_for(data_fingerprint))['clients'],
+            "Résumé Commercial": lambda: aggregates.monthly_top_products(data['sales']['monthly_product']),
+        }
+        engine.submit(sources, export_type, export_format, data_fingerprint)
+        st.session_state.export_request = (tuple(export_type), export_format)
+    
+    request = st.session_state.get('export_request')
+    job = engine.find(list(request[0]), request[1], data_fingerprint) if request else None
+    if job is not None:
+        label = f"{', '.join(request[0])} ({request[1]})"
+        if not job.done():
+            # Interface non bloquée: seul ce fragment interroge l'export en cours
+            @st.fragment(run_every=1.0)
+            def export_progress():
+                if job.done():
+                    st.rerun()
+                st.info(f"⏳ Export en cours: {label}…")
+            export_progress()
+        elif job.exception() is not None:
+            st.error(f"❌ Export impossible: {job.exception()}")
+        else:
+            path = job.result()
+            st.success(f"✅ Export prêt: {label} ({path.stat().st_size / 1024:.1f} KB)")
+            st.download_button(
+                label=f"⬇️ Télécharger {path.name}",
+                data=path.read_bytes,
+                file_name=path.name,
+                key="export_download"
+            )
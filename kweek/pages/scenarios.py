@@ -0,0 +1,125 @@
+"""
+Page 🎲 Scénarios: simulation Monte Carlo de la demande et du stock.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from kweek import whatif
+from kweek.pages.common import (
+    get_factor_model, get_fefo_simulation, get_forecast_service, get_planned_lots, get_product_index,
+)
+
+
+def render(data, data_fingerprint):
+    st.header("🎲 Simulateur de Scénarios (What-If)")
+    
+    product_index = get_product_index(data_fingerprint, data['sales']['daily_product'])
+    forecast_service = get_forecast_service(data_fingerprint, product_index.daily_matrix, data['daily'])
+    factor_model = get_factor_model(data_fingerprint, data['daily'])
+    simulation = get_fefo_simulation(data_fingerprint, data['inventory'], data['sales']['daily_product'])
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        horizon = st.slider("Horizon simulé (jours):", 7, 30, 14)
+    with col2:
+        n_scenarios = st.select_slider("Nombre de scénarios:", [500, 1000, 2000, 5000, 10000], value=whatif.N_SCENARIOS)
+    
+    baseline = forecast_service.catalogue(horizon, data_fingerprint)
+    dates = pd.DatetimeIndex(baseline.columns)
+    
+    st.subheader("🌦️ Conditions imposées")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        target_days = st.multiselect(
+            "Jours concernés:", list(dates), format_func=lambda d: d.strftime("%a %d/%m/%Y"),
+            default=[d for d in dates if d.dayofweek == 5][:1]
+        )
+        condition = st.selectbox("Météo:", ["Climatologie (aléatoire)"] + factor_model.conditions)
+    with col2:
+        event_options = {"Calendrier habituel": whatif.EVENT_CALENDAR, "Aucun": whatif.NO_EVENT}
+        event_options.update({kind: kind for kind in sorted(factor_model.events)})
+        event_choice = st.selectbox("Événement:", list(event_options))
+        fix_temperature = st.checkbox("Imposer la température")
+    with col3:
+        temperature = st.slider("Température (°C):", -5.0, 40.0, 20.0, 0.5, disabled=not fix_temperature)
+    
+    spec = {'event': event_options[event_choice]}
+    if condition in factor_model.conditions:
+        spec['condition'] = condition
+    if fix_temperature:
+        spec['temperature'] = temperature
+    overrides = {day: spec for day in target_days}
+    
+    state = forecast_service.registry.ets_states(product_index.daily_matrix)
+    sigma = whatif.ets_sigma(state, product_index.daily_matrix.columns)
+    lots = get_planned_lots(data_fingerprint, dates[0], horizon, simulation, data['inventory'])
+    
+    started = datetime.now()
+    result = whatif.simulate(baseline, sigma, factor_model, overrides, lots, n_scenarios)
+    elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+    summary = result.summary()
+    
+    st.markdown("---")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        delta = summary['demand_mean'].sum() / summary['baseline'].sum() - 1
+        st.metric("Demande simulée", f"{summary['demand_mean'].sum():,.0f} unités", f"{delta:+.1%} vs référence")
+    with col2:
+        st.metric("Produits à risque de rupture (>20%)", int((summary['stockout_prob'] > 0.2).sum()))
+    with col3:
+        st.metric("Ventes perdues attendues", f"{summary['lost_sales'].sum():,.0f} unités")
+    with col4:
+        st.metric("Pertes attendues", f"{summary['waste'].sum():,.0f} unités")
+    
+    tab1, tab2, tab3 = st.tabs(["📈 Distribution de la demande", "🚨 Rupture & pertes", "🗓️ Rupture par jour"])
+    
+    with tab1:
+        product_choice = st.selectbox("Produit:", ["Tous les produits"] + result.products)
+        quantiles = result.daily_quantiles(None if product_choice == "Tous les produits" else product_choice)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=list(quantiles['date']) + list(quantiles['date'])[::-1],
+            y=list(quantiles['p95']) + list(quantiles['p05'])[::-1],
+            fill='toself', fillcolor='rgba(31,119,180,0.2)', line=dict(color='rgba(255,255,255,0)'),
+            name='Intervalle 90%'
+        ))
+        fig.add_trace(go.Scatter(x=quantiles['date'], y=quantiles['p50'], mode='lines+markers',
+                                 name='Médiane simulée', line=dict(color='#1f77b4')))
+        fig.add_trace(go.Scatter(x=quantiles['date'], y=quantiles['baseline'], mode='lines',
+                                 name='Prévision de référence', line=dict(color='gray', dash='dash')))
+        for day in target_days:
+            fig.add_vline(x=day, line_dash='dot', line_color='red')
+        fig.update_layout(height=420, template='plotly_white', hovermode='x unified',
+                          xaxis_title="Date", yaxis_title="Quantité")
+        st.plotly_chart(fig, width="stretch")
+    
+    with tab2:
+        st.dataframe(
+            summary.sort_values('stockout_prob', ascending=False).rename(columns={
+                'product_name': 'Produit', 'baseline': 'Référence', 'demand_mean': 'Demande moyenne',
+                'demand_p05': 'P5', 'demand_p95': 'P95', 'stockout_prob': 'P(rupture)',
+                'lost_sales': 'Ventes perdues', 'waste': 'Pertes', 'waste_prob': 'P(pertes)'
+            }).style.format({
+                'Référence': '{:,.0f}', 'Demande moyenne': '{:,.0f}', 'P5': '{:,.0f}', 'P95': '{:,.0f}',
+                'P(rupture)': '{:.0%}', 'Ventes perdues': '{:,.1f}', 'Pertes': '{:,.1f}', 'P(pertes)': '{:.0%}'
+            }),
+            width="stretch", hide_index=True
+        )
+        st.caption("Stock de départ: lots restants après rejeu FEFO; réassort: livraisons moyennes "
+                   f"des {whatif.DELIVERY_WEEKS} dernières semaines par jour de semaine.")
+    
+    with tab3:
+        by_day = result.stockout_by_day()
+        fig = go.Figure(data=go.Heatmap(
+            z=by_day.to_numpy(), x=by_day.columns, y=by_day.index,
+            colorscale='Reds', zmin=0, zmax=1, colorbar=dict(title='P(rupture)')
+        ))
+        fig.update_layout(height=450, template='plotly_white')
+        st.plotly_chart(fig, width="stretch")
+    
+    st.caption(f"{n_scenarios:,} scénarios × {len(result.products)} produits × {horizon} jours "
+               f"simulés en {elapsed_ms:.0f} ms")
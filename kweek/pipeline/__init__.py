@@ -0,0 +1,12 @@
+"""
+Pipeline hors ligne: les calculs du notebook découpés en étapes (agrégation,
+EDA, ETS, Random Forest, backtest, expiration, bundles, RFM, réassort,
+rapport, figures), exécutables sans Jupyter:
+
+    python -m kweek.pipeline [étapes...] [--force] [--jobs N]
+
+Une étape n'est relancée que si le contenu de ses entrées a changé.
+"""
+
+from kweek.pipeline.runner import Stage, StageResult, read_state, run_pipeline
+from kweek.pipeline.stages import STAGES
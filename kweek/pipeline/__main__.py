@@ -0,0 +1,40 @@
+import argparse
+import time
+from pathlib import Path
+
+from kweek.pipeline.runner import FAILED, RAN, SKIPPED, run_pipeline
+from kweek.pipeline.stages import STAGES
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m kweek.pipeline",
+                                     description="Exécuter les étapes du pipeline KWEEK.")
+    parser.add_argument("stages", nargs="*", help="étapes à exécuter (avec leurs dépendances); toutes par défaut")
+    parser.add_argument("--force", action="store_true", help="ignorer les empreintes et tout réexécuter")
+    parser.add_argument("--jobs", type=int, default=None, help="étapes exécutées simultanément")
+    parser.add_argument("--data-dir", type=Path, default=Path("."), help="dossier des CSV (défaut: .)")
+    parser.add_argument("--list", action="store_true", help="lister les étapes et quitter")
+    args = parser.parse_args()
+
+    if args.list:
+        for stage in STAGES:
+            after = f" ← {', '.join(stage.after)}" if stage.after else ""
+            print(f"  {stage.name}{after}")
+        return
+
+    started = time.perf_counter()
+    try:
+        results = run_pipeline(STAGES, args.stages or None, data_dir=args.data_dir,
+                               force=args.force, max_workers=args.jobs)
+    except ValueError as e:
+        parser.error(str(e))
+    statuses = [r.status for r in results.values()]
+    print(f"✓ Pipeline: {statuses.count(RAN)} exécutée(s), {statuses.count(SKIPPED)} inchangée(s), "
+          f"{len(statuses) - statuses.count(RAN) - statuses.count(SKIPPED)} en échec ou bloquée(s) "
+          f"en {time.perf_counter() - started:.1f} s")
+    if FAILED in statuses:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Exécution du graphe d'étapes avec cache par empreinte de contenu.
+
+Chaque étape déclare ses tables sources, les étapes dont elle dépend et les
+fichiers qu'elle produit. Son empreinte d'entrée combine le contenu des
+tables (fichiers Parquet du stockage et lots ajoutés), celui des fichiers
+produits par les étapes amont et la version du code de l'étape. Une étape
+dont l'empreinte est inchangée et dont les sorties sont intactes est sautée.
+
+Les étapes prêtes (dépendances terminées) s'exécutent en parallèle dans un
+pool de threads; le calcul lourd de chaque étape a déjà son propre
+parallélisme (pools de processus, NumPy). L'état (empreintes d'entrée et
+des sorties) est enregistré dans `outputs/pipeline/state.json` après chaque
+étape, si bien qu'une exécution interrompue reprend là où elle s'est arrêtée.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from kweek import store
+
+PIPELINE_DIR = Path("outputs") / "pipeline"
+STATE_NAME = "state.json"
+HASH_BLOCK = 1 << 20
+
+RAN, SKIPPED, FAILED, BLOCKED = "exécutée", "inchangée", "échec", "bloquée"
+
+
+@dataclass
+class Stage:
+    """Étape du pipeline: `run(ctx)` écrit `outputs` (et retourne d'éventuels fichiers en plus)."""
+    name: str
+    run: object
+    tables: tuple = ()
+    after: tuple = ()
+    outputs: tuple = ()
+    version: int = 1
+
+
+@dataclass
+class Context:
+    """Contexte partagé par les étapes d'une exécution."""
+    data_dir: Path
+    fingerprint: str
+    workers: int = 1
+
+    def path(self, relative):
+        """Chemin d'un fichier produit (dossier parent créé)."""
+        path = self.data_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: str = None
+    files: list = field(default_factory=list)
+
+
+# ============================================================================
+# EMPREINTES
+# ============================================================================
+
+class _FileHashes:
+    """Empreintes SHA-1 de fichiers, mémorisées par (taille, date de modification)."""
+
+    def __init__(self, memo, lock):
+        self.memo = memo
+        self._lock = lock
+
+    def __call__(self, path):
+        path = Path(path)
+        stat = path.stat()
+        key = str(path)
+        sig = [stat.st_size, stat.st_mtime_ns]
+        with self._lock:
+            entry = self.memo.get(key)
+        if entry is not None and entry[:2] == sig:
+            return entry[2]
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b''):
+                digest.update(block)
+        with self._lock:
+            self.memo[key] = sig + [digest.hexdigest()]
+        return digest.hexdigest()
+
+
+def _combine(parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b';')
+    return digest.hexdigest()
+
+
+def read_state(data_dir=Path(".")):
+    try:
+        return json.loads((Path(data_dir) / PIPELINE_DIR / STATE_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_state(state, data_dir):
+    path = Path(data_dir) / PIPELINE_DIR / STATE_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ============================================================================
+# GRAPHE
+# ============================================================================
+
+def closure(stages, targets):
+    """Étapes demandées et toutes leurs dépendances, dans l'ordre de déclaration."""
+    by_name = {s.name: s for s in stages}
+    unknown = [t for t in targets if t not in by_name]
+    if unknown:
+        raise ValueError(f"Étape inconnue: {unknown[0]!r} (attendu: {', '.join(by_name)})")
+    needed, stack = set(), list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(by_name[name].after)
+    return [s for s in stages if s.name in needed]
+
+
+def run_pipeline(stages, targets=None, data_dir=Path("."), force=False, max_workers=None, log=print):
+    """
+    Exécuter `targets` (toutes les étapes par défaut) et leurs dépendances.
+    `force`: ignorer les empreintes et tout réexécuter. Retourne {étape: StageResult}.
+    """
+    data_dir = Path(data_dir).resolve()
+    selected = closure(stages, targets) if targets else list(stages)
+    max_workers = max(1, os.cpu_count() or 1) if max_workers is None else max_workers
+
+    state = read_state(data_dir)
+    # Un seul verrou pour l'état: il est sérialisé pendant que d'autres étapes hachent leurs sorties
+    lock = threading.RLock()
+    hashes = _FileHashes(state.setdefault('files', {}), lock)
+    stage_state = state.setdefault('stages', {})
+
+    # Tables sources: rafraîchies et hachées une fois, avant tout calcul concurrent
+    tables = sorted({t for s in selected for t in s.tables})
+    table_hash = {t: _combine(hashes(p) for p in store.table_files(t, data_dir)) for t in tables}
+    ctx = Context(data_dir=data_dir, fingerprint=store.fingerprint(data_dir=data_dir), workers=max_workers)
+
+    results = {}
+
+    def input_hash(stage):
+        parts = [f"stage:{stage.name}:v{stage.version}"]
+        parts += [f"table:{t}:{table_hash[t]}" for t in sorted(stage.tables)]
+        for upstream in sorted(stage.after):
+            files = stage_state.get(upstream, {}).get('outputs', {})
+            parts += [f"file:{name}:{digest}" for name, digest in sorted(files.items())]
+        return _combine(parts)
+
+    def outputs_intact(entry):
+        try:
+            return all(hashes(data_dir / name) == digest for name, digest in entry.get('outputs', {}).items())
+        except FileNotFoundError:
+            return False
+
+    def execute(stage):
+        key = input_hash(stage)
+        with lock:
+            entry = dict(stage_state.get(stage.name, {}))
+        if not force and entry.get('input') == key and outputs_intact(entry):
+            return StageResult(stage.name, SKIPPED, files=sorted(entry['outputs']))
+
+        started = time.perf_counter()
+        extra = stage.run(ctx) or []
+        written = sorted({Path(p).as_posix() for p in stage.outputs}
+                         | {Path(p).relative_to(data_dir).as_posix() for p in extra})
+        outputs = {name: hashes(data_dir / name) for name in written}
+        with lock:
+            stage_state[stage.name] = {'input': key, 'outputs': outputs, 'finished': time.time()}
+            _write_state(state, data_dir)
+        return StageResult(stage.name, RAN, time.perf_counter() - started, files=written)
+
+    pending = {s.name: s for s in selected}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while pending or running:
+            for name, stage in list(pending.items()):
+                upstream = [results.get(u) for u in stage.after]
+                if any(r is not None and r.status in (FAILED, BLOCKED) for r in upstream):
+                    results[name] = StageResult(name, BLOCKED)
+                    log(f"  ⏸ {name}: bloquée (dépendance en échec)")
+                    del pending[name]
+                elif all(r is not None for r in upstream):
+                    running[pool.submit(execute, stage)] = name
+                    del pending[name]
+            if not running:
+                if pending:
+                    raise ValueError(f"Dépendances circulaires: {', '.join(pending)}")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = StageResult(name, FAILED, error=f"{type(e).__name__}: {e}")
+                result = results[name]
+                if result.status == RAN:
+                    log(f"  ✓ {name}: {len(result.files)} fichier(s) en {result.seconds:.1f} s")
+                elif result.status == SKIPPED:
+                    log(f"  ↷ {name}: entrées inchangées")
+                else:
+                    log(f"  ✗ {name}: {result.error}")
+
+    with lock:
+        _write_state(state, data_dir)
+    return results
@@ -0,0 +1,296 @@
+"""
+Étapes du pipeline: ce que le notebook calculait de haut en bas, découpé en
+étapes indépendantes aux entrées et sorties déclarées.
+
+    daily ─┬─ eda
+           ├─ ets ──────────┬─ reorder ─┐
+           ├─ rf            │           │
+           ├─ backtest      │           ├─ plots
+           ├─ expiry ───────┴─ report ──┤
+           ├─ bundles ──────────────────┤
+           └─ rfm ──────────────────────┘
+
+Les fichiers produits portent des noms fixes (sans horodatage): une étape
+relancée remplace ses sorties au lieu d'en accumuler de nouvelles.
+"""
+
+import pandas as pd
+
+from kweek import aggregates, backtest, basket, ingest, plots, rfm, store
+from kweek.expiry import NEAR_EXPIRY_DAYS, near_expiry_risk
+from kweek.fefo import FEFOSimulation
+from kweek.forecast_service import ForecastService
+from kweek.forecasting import FORECAST_DAYS, SERVICE_LEVEL, forecast_catalogue, product_forecast
+from kweek.model_registry import MODELS_DIR, ModelRegistry
+from kweek.pipeline.runner import PIPELINE_DIR, Stage
+from kweek.plots import FigureSpec
+from kweek.product_index import daily_quantity_matrix
+from kweek.reorder import LEAD_TIME_DAYS, forecast_matrix, optimize_reorders
+
+PLOTS_DIR = "outputs/plots"
+REPORTS_DIR = "outputs/reports"
+FORECAST_DIR = "outputs/forecast"
+
+DAILY_TS = f"{PIPELINE_DIR.as_posix()}/daily_ts.parquet"
+DAILY_PRODUCT = f"{PIPELINE_DIR.as_posix()}/daily_product.parquet"
+MONTHLY_PRODUCT = f"{PIPELINE_DIR.as_posix()}/monthly_product.parquet"
+BY_PRODUCT = f"{PIPELINE_DIR.as_posix()}/by_product.parquet"
+ETS_FORECASTS = f"{FORECAST_DIR}/ets_forecasts.parquet"
+RF_FORECASTS = f"{FORECAST_DIR}/rf_forecasts.parquet"
+STOCK_SUMMARY = f"{FORECAST_DIR}/stock_summary.parquet"
+NEAR_EXPIRY = f"{FORECAST_DIR}/near_expiry_products.csv"
+DISCOUNTS = f"{REPORTS_DIR}/discount_recommendations.csv"
+BACKTEST_SUMMARY = f"{REPORTS_DIR}/backtest_summary.csv"
+BUNDLE_PAIRS = f"{REPORTS_DIR}/bundles_copurchase.csv"
+BUNDLE_SUGGESTIONS = f"{REPORTS_DIR}/bundle_suggestions.csv"
+BUNDLE_TRIPLES = f"{REPORTS_DIR}/bundle_triples.csv"
+RFM_CLIENTS = f"{REPORTS_DIR}/upsell_crosssell_rfm.csv"
+REORDERS = f"{REPORTS_DIR}/demand_forecasts_reorder.csv"
+MONTHLY_SUMMARY = f"{REPORTS_DIR}/monthly_commercial_summary.csv"
+
+EXTERNAL_COLUMNS = [
+    "date", "temperature", "humidity", "precipitation", "sunshine_hours", "wind_speed",
+    "weather_condition", "is_weekend", "event_name", "event_type", "event_impact_factor",
+]
+TOP_PRODUCTS = 10
+# Offre associée à chaque cluster RFM (0 = plus forte valeur)
+CLUSTER_OFFERS = {0: "VIP offer", 1: "bundle promo", 2: "discount"}
+
+
+def _read(ctx, relative):
+    path = ctx.data_dir / relative
+    return pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+
+
+def _daily_matrix(ctx):
+    return daily_quantity_matrix(_read(ctx, DAILY_PRODUCT))
+
+
+# ============================================================================
+# AGRÉGATION & EDA
+# ============================================================================
+
+def daily_stage(ctx):
+    """Agrégats des transactions (en flux) et série quotidienne jointe aux facteurs externes."""
+    sales = ingest.load_or_build_aggregates(ctx.fingerprint, data_dir=ctx.data_dir)
+    external = store.read_table("external", data_dir=ctx.data_dir)
+    daily_ts = (
+        sales['daily'][["date", "total_revenue", "total_units", "num_transactions"]]
+        .merge(external[[c for c in EXTERNAL_COLUMNS if c in external.columns]], on="date", how="left")
+        .sort_values("date").reset_index(drop=True)
+    )
+    daily_ts.to_parquet(ctx.path(DAILY_TS), index=False)
+    sales['daily_product'].to_parquet(ctx.path(DAILY_PRODUCT), index=False)
+    sales['monthly_product'].to_parquet(ctx.path(MONTHLY_PRODUCT), index=False)
+    sales['by_product'].to_parquet(ctx.path(BY_PRODUCT), index=False)
+
+
+def eda_stage(ctx):
+    """Tendances quotidiennes, corrélations, top/flop 5 produits de chaque mois."""
+    daily_ts = _read(ctx, DAILY_TS)
+    specs = [
+        FigureSpec("EDA_daily_trends", "daily_trends", dict(daily_ts=daily_ts), "EDA", "Tendances quotidiennes"),
+        FigureSpec("correlation_map", "correlation_map", dict(daily_ts=daily_ts), "EDA", "Corrélations"),
+    ]
+    monthly = _read(ctx, MONTHLY_PRODUCT)
+    for month, rows in monthly.groupby("month", sort=True):
+        ranked = rows.sort_values("total_revenue", ascending=False)
+        for kind, subset, color in [("top", ranked.head(5), "green"), ("bottom", ranked.tail(5)[::-1], "red")]:
+            specs.append(FigureSpec(f"{kind}_{month}", "bar", dict(
+                labels=subset["product_name"].astype(str), values=subset["total_revenue"].to_numpy(),
+                title=f"{kind.title()} 5 Products - {month}", ylabel="Revenue", color=color,
+            ), "EDA", f"{kind.title()} 5 – {month}"))
+    return plots.render_figures(specs, ctx.path(PLOTS_DIR), "eda", max_workers=ctx.workers)
+
+
+# ============================================================================
+# PRÉVISIONS
+# ============================================================================
+
+def ets_stage(ctx):
+    """Prévisions ETS de tout le catalogue (noyau vectorisé, états avancés des seuls jours nouveaux)."""
+    registry = ModelRegistry(ctx.data_dir / MODELS_DIR)
+    forecasts = forecast_catalogue(
+        _daily_matrix(ctx), horizon_days=FORECAST_DAYS, service_level=SERVICE_LEVEL,
+        backend="numpy", registry=registry,
+    )
+    forecasts.to_parquet(ctx.path(ETS_FORECASTS), index=False)
+
+
+def rf_stage(ctx):
+    """Prévisions Random Forest par produit (modèles du registre réutilisés si la plage est inchangée)."""
+    matrix = _daily_matrix(ctx)
+    service = ForecastService(matrix, store.read_table("daily", data_dir=ctx.data_dir),
+                              registry=ModelRegistry(ctx.data_dir / MODELS_DIR))
+    forecasts = pd.concat([
+        service.forecast(p, "rf", FORECAST_DAYS, ctx.fingerprint).assign(product_name=p)
+        for p in matrix.columns
+    ], ignore_index=True)
+    forecasts[['product_name', 'ds', 'yhat', 'yhat_lower', 'yhat_upper']].to_parquet(ctx.path(RF_FORECASTS), index=False)
+
+
+def backtest_stage(ctx):
+    """Évaluation glissante de tous les modèles (scores persistés pour l'application)."""
+    metrics = backtest.load_or_build_backtest(
+        _daily_matrix(ctx), store.read_table("daily", data_dir=ctx.data_dir), ctx.fingerprint,
+        data_dir=ctx.data_dir, max_workers=ctx.workers,
+    )
+    backtest.summarize(metrics).to_csv(ctx.path(BACKTEST_SUMMARY), index=False)
+
+
+# ============================================================================
+# STOCK & STRATÉGIE COMMERCIALE
+# ============================================================================
+
+def expiry_stage(ctx):
+    """Rejeu FEFO (stock par produit), lots à conservation courte, produits à risque et remises."""
+    inventory = store.read_table("inventory", data_dir=ctx.data_dir)
+    fefo = FEFOSimulation(inventory, _read(ctx, DAILY_PRODUCT))
+    summary = fefo.batch_summary().groupby("product_name")[
+        ["quantity_received", "quantity_sold", "quantity_wasted"]
+    ].sum().rename(columns={"quantity_received": "total_received", "quantity_sold": "total_sold",
+                            "quantity_wasted": "total_wasted"})
+    summary["current_stock_est"] = fefo.stock_on_hand()
+    summary.reset_index().to_parquet(ctx.path(STOCK_SUMMARY), index=False)
+
+    shelf = (pd.to_datetime(inventory["expiration_date"]) - pd.to_datetime(inventory["arrival_date"])).dt.days
+    inventory[shelf <= NEAR_EXPIRY_DAYS].assign(days_until_expiry_calc=shelf).to_csv(ctx.path(NEAR_EXPIRY), index=False)
+    near_expiry_risk(inventory).to_csv(ctx.path(DISCOUNTS), index=False)
+
+
+def bundles_stage(ctx):
+    """Règles d'association (paires, triplets) et suggestions de bundles par lift."""
+    names = _read(ctx, BY_PRODUCT)["product_name"].astype(str)
+    rules = basket.load_or_build_basket(names, ctx.fingerprint, data_dir=ctx.data_dir)
+    pairs = rules["pairs"]
+    pairs.head(50).to_csv(ctx.path(BUNDLE_PAIRS), index=False)
+    top = basket.top_rules(pairs, 15, by="lift")
+    pd.DataFrame({
+        "bundle": top["product_a"] + " + " + top["product_b"],
+        "lift": top["lift"],
+        "confidence": top["confidence"],
+        "co_count": top["co_count"],
+    }).to_csv(ctx.path(BUNDLE_SUGGESTIONS), index=False)
+    rules["triples"].head(50).to_csv(ctx.path(BUNDLE_TRIPLES), index=False)
+
+
+def rfm_stage(ctx):
+    """Segmentation RFM et offre associée à chaque client."""
+    clients = rfm.load_or_build_rfm(ctx.fingerprint, data_dir=ctx.data_dir)["clients"]
+    clients.assign(offer_type=clients["cluster"].map(CLUSTER_OFFERS).fillna("standard")).to_csv(
+        ctx.path(RFM_CLIENTS), index=False
+    )
+
+
+def reorder_stage(ctx):
+    """Points de commande, quantités à commander et demande prévue à 7 et 30 jours."""
+    forecasts = _read(ctx, ETS_FORECASTS)
+    stock = _read(ctx, STOCK_SUMMARY).set_index("product_name")
+    products = store.read_table("products", data_dir=ctx.data_dir)
+
+    plan = optimize_reorders(
+        forecast_matrix(forecasts), products, stock["current_stock_est"], _daily_matrix(ctx).std(),
+        service_levels=[SERVICE_LEVEL], default_lead_time=LEAD_TIME_DAYS,
+    )
+    results = plan.rename(columns={
+        "stock_on_hand": "current_stock_est", "lead_demand": "lead_mean", "order_qty": "reorder_qty",
+    }).set_index("product_name")
+    for horizon, days in [("week", 7), ("month", 30)]:
+        for suffix, col in [("mean", "yhat"), ("lower", "yhat_lower"), ("upper", "yhat_upper")]:
+            wide = forecasts.pivot(index="product_name", columns="ds", values=col)
+            results[f"{horizon}_{suffix}"] = wide.iloc[:, :days].sum(axis=1)
+    results.reset_index().sort_values("reorder_qty", ascending=False).to_csv(ctx.path(REORDERS), index=False)
+
+
+def report_stage(ctx):
+    """Top 5 produits de chaque mois, avec exposition à l'expiration et remise recommandée."""
+    top5 = aggregates.monthly_top_products(_read(ctx, MONTHLY_PRODUCT))
+    risk = _read(ctx, DISCOUNTS)
+    if not risk.empty:
+        top5 = top5.merge(
+            risk[["product_name", "near_expiry_qty", "near_expiry_ratio", "recommended_discount_pct"]],
+            on="product_name", how="left",
+        )
+    top5.to_csv(ctx.path(MONTHLY_SUMMARY), index=False)
+
+
+# ============================================================================
+# FIGURES DU RAPPORT
+# ============================================================================
+
+def plots_stage(ctx):
+    """Réel vs prévision (quotidien, hebdomadaire), risques, remises, bundles, RFM, réassort."""
+    specs = []
+    matrix = _daily_matrix(ctx)
+    forecasts = _read(ctx, ETS_FORECASTS)
+    top = _read(ctx, BY_PRODUCT).sort_values("quantity", ascending=False)["product_name"].astype(str).head(TOP_PRODUCTS)
+    for p in top:
+        data = dict(history=matrix[p], forecast=product_forecast(forecasts, p))
+        specs.append(FigureSpec(f"real_vs_forecast_daily_{p}", "real_vs_forecast",
+                                dict(data, title=f"Real vs Forecast Demand – {p}"), "Prévisions", f"{p} (jour)"))
+        specs.append(FigureSpec(f"real_vs_forecast_weekly_{p}", "real_vs_forecast",
+                                dict(data, title=f"Weekly Aggregated Real vs Forecast – {p}", weekly=True),
+                                "Prévisions", f"{p} (semaine)"))
+
+    risk = _read(ctx, DISCOUNTS)
+    if not risk.empty:
+        top_risk = risk.sort_values("expiry_risk_score", ascending=False).head(15)
+        specs.append(FigureSpec("top_expiry_risk", "bar", dict(
+            labels=top_risk["product_name"], values=top_risk["expiry_risk_score"].to_numpy(),
+            title="Top Near-Expiry Products (Risk Score)", xlabel="Product", ylabel="Expiry Risk Score",
+            color="indianred",
+        ), "Stock", "Risque d'expiration"))
+        discounts = risk.sort_values("recommended_discount_pct", ascending=False).head(15)
+        specs.append(FigureSpec("report_discount_recommendations", "bar", dict(
+            labels=discounts["product_name"], values=discounts["recommended_discount_pct"].to_numpy(),
+            title="Recommended Discounts per Product", xlabel="Discount (%)", color="steelblue",
+            horizontal=True, figsize=(12, 6), dpi=150,
+        ), "Stock", "Remises recommandées"))
+
+    pairs = _read(ctx, BUNDLE_PAIRS).head(10)
+    if not pairs.empty:
+        specs.append(FigureSpec("top_copurchase_pairs", "bar", dict(
+            labels=pairs["product_a"] + " + " + pairs["product_b"], values=pairs["co_count"].to_numpy(),
+            title="Top Co-purchased Product Pairs", xlabel="Product Pair", ylabel="Co-purchase Count",
+            color="seagreen",
+        ), "Bundles", "Paires co-achetées"))
+
+    clients = _read(ctx, RFM_CLIENTS)
+    if not clients.empty:
+        counts = clients["cluster"].value_counts().sort_index()
+        specs.append(FigureSpec("rfm_cluster_distribution", "bar", dict(
+            labels=counts.index.astype(str), values=counts.to_numpy(), title="RFM Cluster Distribution",
+            xlabel="Cluster", ylabel="Number of Customers", figsize=(6, 4),
+        ), "Clients", "Clusters RFM"))
+        specs.append(FigureSpec("report_rfm_scatter", "rfm_scatter",
+                                dict(clients=clients[["frequency", "monetary", "cluster"]]), "Clients", "Fréquence × montant"))
+
+    specs.append(FigureSpec("monthly_top5_products", "monthly_top", dict(monthly_top5=_read(ctx, MONTHLY_SUMMARY)),
+                            "Rapport", "Top 5 mensuel"))
+
+    reorders = _read(ctx, REORDERS)
+    reorders = reorders[reorders["reorder_qty"] > 0].head(20)
+    if not reorders.empty:
+        specs.append(FigureSpec("top_reorders", "bar", dict(
+            labels=reorders["product_name"], values=reorders["reorder_qty"].to_numpy(),
+            title="Top Reorder Recommendations (qty)", ylabel="Quantity to Reorder", color="steelblue",
+        ), "Rapport", "Réassort"))
+    return plots.render_figures(specs, ctx.path(PLOTS_DIR), "reports", max_workers=ctx.workers)
+
+
+STAGES = [
+    Stage("daily", daily_stage, tables=("transactions", "external"),
+          outputs=(DAILY_TS, DAILY_PRODUCT, MONTHLY_PRODUCT, BY_PRODUCT)),
+    Stage("eda", eda_stage, after=("daily",), version=2),
+    Stage("ets", ets_stage, after=("daily",), outputs=(ETS_FORECASTS,)),
+    Stage("rf", rf_stage, tables=("daily",), after=("daily",), outputs=(RF_FORECASTS,)),
+    Stage("backtest", backtest_stage, tables=("daily",), after=("daily",), outputs=(BACKTEST_SUMMARY,)),
+    Stage("expiry", expiry_stage, tables=("inventory",), after=("daily",),
+          outputs=(STOCK_SUMMARY, NEAR_EXPIRY, DISCOUNTS)),
+    Stage("bundles", bundles_stage, tables=("transactions",), after=("daily",),
+          outputs=(BUNDLE_PAIRS, BUNDLE_SUGGESTIONS, BUNDLE_TRIPLES)),
+    Stage("rfm", rfm_stage, tables=("transactions",), outputs=(RFM_CLIENTS,)),
+    Stage("reorder", reorder_stage, tables=("products",), after=("ets", "expiry", "daily"), outputs=(REORDERS,)),
+    Stage("report", report_stage, after=("daily", "expiry"), outputs=(MONTHLY_SUMMARY,)),
+    Stage("plots", plots_stage, after=("daily", "ets", "expiry", "bundles", "rfm", "reorder", "report"), version=2),
+]
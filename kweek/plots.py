@@ -0,0 +1,261 @@
+"""
+Figures PNG des rapports (EDA, prévisions, risques, bundles, RFM).
+
+Chaque fonction dessine une figure à partir de tableaux déjà calculés et
+l'écrit dans `path`. Les figures sont créées avec l'API objet de matplotlib
+(Figure + backend Agg, sans pyplot ni état global), si bien que plusieurs
+figures peuvent être rendues en parallèle.
+
+`render_figures` rend un lot de figures dans un pool de processus. Chaque
+figure a une empreinte (type de figure + contenu de ses données): celles
+dont l'empreinte est inchangée ne sont pas redessinées. Une miniature est
+écrite à côté de chaque figure, et un manifeste JSON par lot (fichier,
+miniature, groupe, titre, empreinte) permet à l'application d'afficher les
+miniatures sans ouvrir les images en pleine taille.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+from matplotlib.image import imread, thumbnail
+
+from kweek import store
+
+CORRELATION_COLUMNS = [
+    "total_revenue", "total_units", "num_transactions", "temperature", "humidity",
+    "precipitation", "sunshine_hours", "is_weekend", "event_impact_factor",
+]
+
+
+def _save(fig, path, dpi=100):
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    return path
+
+
+def daily_trends(daily_ts, path):
+    """Chiffre d'affaires, unités et température quotidiens."""
+    fig = Figure(figsize=(16, 12))
+    axes = fig.subplots(3, 1, sharex=True)
+    axes[0].plot(daily_ts["date"], daily_ts["total_revenue"])
+    axes[0].set_title("Daily Revenue")
+    axes[1].plot(daily_ts["date"], daily_ts["total_units"], color="tab:orange")
+    axes[1].set_title("Daily Units Sold")
+    axes[2].plot(daily_ts["date"], daily_ts["temperature"], color="tab:red")
+    axes[2].set_title("Daily Temperature (°C)")
+    return _save(fig, path)
+
+
+def correlation_map(daily_ts, path):
+    """Corrélations ventes × facteurs externes."""
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+    cols = [c for c in CORRELATION_COLUMNS if c in daily_ts.columns]
+    sns.heatmap(daily_ts[cols].astype(float).corr(), annot=True, cmap="coolwarm", fmt=".2f", ax=ax)
+    ax.set_title("Correlation Matrix – Sales vs External Factors")
+    return _save(fig, path)
+
+
+def bar(labels, values, title, path, xlabel=None, ylabel=None, color=None, horizontal=False,
+        figsize=(10, 5), dpi=100):
+    """Barres simples (verticales, ou horizontales de haut en bas)."""
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    labels, values = list(labels), np.asarray(values, dtype=float)
+    if horizontal:
+        ax.barh(labels[::-1], values[::-1], color=color)
+    else:
+        ax.bar(labels, values, color=color)
+        ax.tick_params(axis="x", labelrotation=45)
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment("right")
+    ax.set_title(title, fontsize=12, fontweight="bold")
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    return _save(fig, path, dpi)
+
+
+def real_vs_forecast(history, forecast, title, path, weekly=False):
+    """
+    Historique et prévision d'un produit. `history`: Series indexée par date;
+    `forecast`: colonnes ds, yhat, yhat_lower, yhat_upper.
+    """
+    if weekly:
+        history = history.resample("W").sum()
+        forecast = forecast.resample("W", on="ds")[["yhat", "yhat_lower", "yhat_upper"]].sum().reset_index()
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+    ax.plot(history.index, history.to_numpy(), marker="o", label="Real Data", color="blue", alpha=0.7)
+    ax.plot(forecast["ds"], forecast["yhat"], label="Forecast", color="red", linewidth=2)
+    ax.fill_between(forecast["ds"], forecast["yhat_lower"], forecast["yhat_upper"],
+                    color="red", alpha=0.2, label="Confidence Interval")
+    ax.set_title(title)
+    ax.set_xlabel("Week" if weekly else "Date")
+    ax.set_ylabel("Quantity")
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return _save(fig, path)
+
+
+def monthly_top(monthly_top5, path):
+    """Top 5 produits par mois (chiffre d'affaires)."""
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    sns.barplot(x="product_name", y="revenue", hue="month", data=monthly_top5, dodge=True, ax=ax)
+    ax.set_title("Top 5 Products per Month (Revenue)")
+    ax.set_xlabel("Product")
+    ax.set_ylabel("Revenue")
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.legend(title="Month")
+    return _save(fig, path)
+
+
+def rfm_scatter(clients, path):
+    """Fréquence × montant par client, coloré par cluster."""
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    sns.scatterplot(data=clients, x="frequency", y="monetary", hue="cluster", palette="tab10",
+                    s=100, alpha=0.7, ax=ax)
+    ax.set_title("Customer Behavior: Frequency vs Monetary", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Frequency")
+    ax.set_ylabel("Monetary Value")
+    return _save(fig, path, dpi=150)
+
+
+
+FIGURES = {
+    "daily_trends": daily_trends,
+    "correlation_map": correlation_map,
+    "bar": bar,
+    "real_vs_forecast": real_vs_forecast,
+    "monthly_top": monthly_top,
+    "rfm_scatter": rfm_scatter,
+}
+
+
+# ============================================================================
+# RENDU PARALLÈLE ET CACHE
+# ============================================================================
+
+MANIFEST_DIRNAME = "manifests"
+THUMBS_DIRNAME = "thumbs"
+THUMB_WIDTH = 360
+# À incrémenter quand le dessin d'une figure change (toutes redessinées)
+RENDER_VERSION = 1
+MIN_FIGURES_FOR_POOL = 4
+
+
+@dataclass
+class FigureSpec:
+    """Figure à rendre: `FIGURES[kind](**kwargs, path=...)` → `<name>.png`."""
+    name: str
+    kind: str
+    kwargs: dict = field(default_factory=dict)
+    group: str = ""
+    title: str = ""
+
+
+def figure_hash(kind, kwargs):
+    """Empreinte d'une figure: type, version du rendu et contenu des arguments."""
+    digest = hashlib.sha1(f"{kind}:v{RENDER_VERSION}".encode())
+    for key in sorted(kwargs):
+        value = kwargs[key]
+        digest.update(f";{key}=".encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(value.columns)).encode())
+        if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+            digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+        elif isinstance(value, np.ndarray):
+            digest.update(f"{value.dtype}{value.shape}".encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _render(kind, kwargs, path, thumb_path):
+    """Tâche d'un processus: figure pleine taille puis miniature. Retourne (largeur, hauteur)."""
+    FIGURES[kind](**kwargs, path=path)
+    height, width = imread(path).shape[:2]
+    thumbnail(path, thumb_path, scale=min(1.0, THUMB_WIDTH / width))
+    return width, height
+
+
+def manifest_path(plots_dir, name):
+    return Path(plots_dir) / MANIFEST_DIRNAME / f"{name}.json"
+
+
+def read_manifest(path):
+    """Entrées d'un manifeste (liste vide s'il est absent ou illisible)."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))['figures']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return []
+
+
+def read_manifests(plots_dir):
+    """Toutes les figures des manifestes de `plots_dir`, dans l'ordre de rendu."""
+    directory = Path(plots_dir) / MANIFEST_DIRNAME
+    entries = [e for path in sorted(directory.glob("*.json")) for e in read_manifest(path)]
+    return pd.DataFrame(entries, columns=['name', 'file', 'thumb', 'group', 'title', 'width', 'height', 'hash', 'rendered'])
+
+
+def render_figures(specs, plots_dir, manifest, max_workers=None):
+    """
+    Rendre les figures `specs` dans `plots_dir` (miniatures dans `thumbs/`)
+    et écrire le manifeste `manifests/<manifest>.json`. Les figures dont
+    l'empreinte est inchangée et les fichiers présents sont conservées; celles
+    de l'ancien manifeste qui ne sont plus demandées sont supprimées.
+    Retourne les chemins de tous les fichiers du lot (manifeste compris).
+    """
+    plots_dir = Path(plots_dir)
+    (plots_dir / THUMBS_DIRNAME).mkdir(parents=True, exist_ok=True)
+    path = manifest_path(plots_dir, manifest)
+    previous = {e['name']: e for e in read_manifest(path)}
+
+    entries, todo = [], []
+    for spec in specs:
+        entry = {
+            'name': spec.name, 'file': f"{spec.name}.png", 'thumb': f"{THUMBS_DIRNAME}/{spec.name}.png",
+            'group': spec.group, 'title': spec.title or spec.name,
+            'hash': figure_hash(spec.kind, spec.kwargs),
+        }
+        old = previous.get(spec.name)
+        if (old is not None and old['hash'] == entry['hash']
+                and (plots_dir / entry['file']).exists() and (plots_dir / entry['thumb']).exists()):
+            entry.update(width=old['width'], height=old['height'], rendered=old['rendered'])
+        else:
+            todo.append((spec, entry))
+        entries.append(entry)
+
+    jobs = [(spec.kind, spec.kwargs, plots_dir / entry['file'], plots_dir / entry['thumb']) for spec, entry in todo]
+    max_workers = store.default_workers() if max_workers is None else max_workers
+    if max_workers <= 1 or len(jobs) < MIN_FIGURES_FOR_POOL:
+        sizes = [_render(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            sizes = list(pool.map(_render, *zip(*jobs)))
+    for (_, entry), (width, height) in zip(todo, sizes):
+        entry.update(width=int(width), height=int(height), rendered=time.time())
+
+    for name in previous.keys() - {e['name'] for e in entries}:
+        (plots_dir / previous[name]['file']).unlink(missing_ok=True)
+        (plots_dir / previous[name]['thumb']).unlink(missing_ok=True)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({'version': RENDER_VERSION, 'figures': entries}, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+    return [plots_dir / e[col] for e in entries for col in ('file', 'thumb')] + [path]
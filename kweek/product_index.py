@@ -0,0 +1,74 @@
+"""
+Index des ventes partitionné par produit.
+
+Les lignes (transactions, ou agrégats jour × produit de kweek.ingest) sont
+triées une fois par (produit, date) ; chaque produit correspond alors à une
+plage contiguë de lignes. Les séries quotidiennes de
+quantités sont pré-calculées sous forme d'une matrice jours × produits (jours
+manquants à 0), si bien qu'un changement de produit sur la page Prévisions
+est une simple recherche, sans balayage ni ré-agrégation.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def daily_quantity_matrix(transactions):
+    """Matrice jours × produits des quantités vendues, jours manquants à 0."""
+    dates = pd.to_datetime(transactions['date']).dt.normalize()
+    daily = transactions.groupby([dates, 'product_name'], observed=True)['quantity'].sum()
+    full_range = pd.date_range(dates.min(), dates.max(), freq='D', name='date')
+    matrix = (
+        daily.unstack('product_name', fill_value=0)
+        .reindex(full_range, fill_value=0)
+        .astype('float64')
+    )
+    matrix.columns = matrix.columns.astype(str)
+    matrix.columns.name = 'product_name'
+    return matrix
+
+
+class ProductIndex:
+    """Plages de lignes, résumés et séries quotidiennes par produit."""
+
+    def __init__(self, transactions):
+        tx = transactions if 'n_lines' in transactions.columns else transactions.assign(n_lines=1)
+        names = tx['product_name'].astype('category')
+        codes = names.cat.codes.to_numpy()
+        order = np.lexsort((tx['date'].to_numpy(), codes))
+
+        self.sorted = tx.iloc[order].reset_index(drop=True)
+        sorted_codes = codes[order]
+        categories = names.cat.categories
+
+        # Bornes [start, stop) de chaque produit dans la table triée
+        present = np.unique(sorted_codes[sorted_codes >= 0])
+        starts = np.searchsorted(sorted_codes, present, side='left')
+        stops = np.searchsorted(sorted_codes, present, side='right')
+        self.bounds = {
+            categories[c]: (int(a), int(b)) for c, a, b in zip(present, starts, stops)
+        }
+        self.products = sorted(self.bounds)
+
+        self.summary = (
+            tx.groupby('product_name', observed=True)[['total_amount', 'quantity', 'n_lines']].sum()
+        )
+
+        self.daily_matrix = daily_quantity_matrix(tx)
+
+    def rows(self, product):
+        """Lignes du produit (vue contiguë de la table triée)."""
+        start, stop = self.bounds.get(product, (0, 0))
+        return self.sorted.iloc[start:stop]
+
+    def stats(self, product):
+        """Ventes, quantités et nombre de lignes du produit."""
+        if product not in self.summary.index:
+            return pd.Series({'total_amount': 0.0, 'quantity': 0, 'n_lines': 0})
+        return self.summary.loc[product]
+
+    def daily_series(self, product):
+        """Série quotidienne continue des quantités vendues du produit."""
+        if product not in self.daily_matrix.columns:
+            return pd.Series(0.0, index=self.daily_matrix.index, name=product)
+        return self.daily_matrix[product]
@@ -0,0 +1,189 @@
+"""
+Couche de requêtes SQL (DuckDB) sur le stockage colonnaire.
+
+Chaque table du stockage (transactions, daily, external, inventory, products,
+clients) est déclarée comme une vue DuckDB sur ses fichiers Parquet (fichier
+converti + lots ajoutés). Une requête ne lit que les colonnes et groupes de
+lignes utiles, en parallèle sur `threads` cœurs, et déborde sur disque au-delà
+de `memory_limit`: aucune table n'est chargée dans pandas, seul le résultat
+(agrégé) est converti en DataFrame.
+
+Une fois les vues créées, la connexion est verrouillée: accès aux fichiers
+limité aux dossiers du stockage (read_text, read_csv, ... ailleurs échouent),
+aucun chargement d'extension, configuration figée.
+
+    from kweek.query import QueryEngine
+    engine = QueryEngine()
+    engine.sales_slice("2024-01-01", "2024-03-31", categories=["Desserts"],
+                       conditions=["Rainy"], by="Semaine")
+    engine.run("SELECT category, SUM(total_amount) FROM transactions GROUP BY 1")
+"""
+
+import os
+from pathlib import Path
+
+import duckdb
+
+from kweek import store
+
+MEMORY_LIMIT = "1GB"
+SPILL_DIRNAME = "duckdb_tmp"
+# Lignes renvoyées au plus par une requête libre
+MAX_RESULT_ROWS = 10_000
+
+# Regroupement de la tranche de ventes → expression SQL (t: transactions, e: external)
+SLICE_DIMENSIONS = {
+    "Jour": "t.date",
+    "Semaine": "date_trunc('week', t.date)",
+    "Mois": "date_trunc('month', t.date)",
+    "Produit": "t.product_name",
+    "Catégorie": "t.category",
+    "Météo": "e.weather_condition",
+    "Événement": "coalesce(e.event_type, 'aucun')",
+}
+TIME_DIMENSIONS = ("Jour", "Semaine", "Mois")
+_SLICE_MEASURES = ("SUM(t.total_amount) AS revenue, SUM(t.quantity) AS units, "
+                   "COUNT(DISTINCT t.transaction_id) AS transactions, COUNT(DISTINCT t.client_id) AS clients")
+
+
+class QueryError(ValueError):
+    """Requête refusée (pas une lecture unique) ou invalide."""
+
+
+def _sql_string(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class QueryEngine:
+    """Connexion DuckDB en mémoire exposant une vue par table du stockage."""
+
+    def __init__(self, data_dir=Path("."), threads=None, memory_limit=MEMORY_LIMIT, spill_dir=None):
+        self.data_dir = Path(data_dir)
+        # Débordement sur disque: hors des données servies si `spill_dir` est donné
+        spill = Path(spill_dir) if spill_dir is not None else store.store_dir(self.data_dir) / SPILL_DIRNAME
+        self.con = duckdb.connect(config={
+            'threads': threads or os.cpu_count() or 1,
+            'memory_limit': memory_limit,
+            'temp_directory': str(spill),
+        })
+        self.tables = []
+        allowed = {spill}
+        for name, spec in store.TABLES.items():
+            if not ((self.data_dir / spec.csv).exists() or store.parquet_path(name, self.data_dir).exists()):
+                continue
+            paths = store.table_files(name, self.data_dir)
+            files = ", ".join(_sql_string(p) for p in paths)
+            self.con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet([{files}], union_by_name = true)")
+            self.tables.append(name)
+            allowed.update(Path(p).parent for p in paths)
+        self._lock_down(allowed)
+
+    def _lock_down(self, directories):
+        """Limiter les fichiers lisibles à `directories` et figer la configuration."""
+        allowed = ", ".join(_sql_string(str(Path(d).resolve()) + os.sep) for d in sorted(directories))
+        self.con.execute(f"SET allowed_directories = [{allowed}]")
+        self.con.execute("SET enable_external_access = false")
+        self.con.execute("SET autoload_known_extensions = false")
+        self.con.execute("SET autoinstall_known_extensions = false")
+        self.con.execute("SET lock_configuration = true")
+
+    def sql(self, query, params=None):
+        """Exécuter `query` (paramètres `?`) → DataFrame. Un curseur par appel: sûr entre threads."""
+        with self.con.cursor() as cursor:
+            return cursor.execute(query, params).df()
+
+    def close(self):
+        self.con.close()
+
+    # ========================================================================
+    # REQUÊTES LIBRES
+    # ========================================================================
+
+    def run(self, query, limit=MAX_RESULT_ROWS):
+        """
+        Requête libre en lecture seule (une seule instruction SELECT/WITH).
+        Retourne (DataFrame d'au plus `limit` lignes, tronqué?).
+        """
+        try:
+            statements = duckdb.extract_statements(query)
+        except duckdb.Error as exc:
+            raise QueryError(str(exc)) from exc
+        if len(statements) != 1:
+            raise QueryError("Une seule instruction par requête")
+        if statements[0].type != duckdb.StatementType.SELECT:
+            raise QueryError("Seules les requêtes de lecture (SELECT, WITH) sont autorisées")
+        body = statements[0].query.strip().rstrip(";")
+        try:
+            result = self.sql(f"SELECT * FROM ({body}) AS q LIMIT {int(limit) + 1}")
+        except duckdb.Error as exc:
+            raise QueryError(str(exc)) from exc
+        return result.head(limit), len(result) > limit
+
+    def schema(self):
+        """Colonnes des vues: table, column, type."""
+        return self.sql(
+            "SELECT table_name AS \"table\", column_name AS \"column\", data_type AS \"type\" "
+            "FROM information_schema.columns WHERE table_schema = 'main' "
+            "ORDER BY table_name, ordinal_position"
+        )
+
+    # ========================================================================
+    # TRANCHES DE VENTES
+    # ========================================================================
+
+    def filter_options(self):
+        """Bornes de dates, catégories et conditions météo proposées par les filtres."""
+        bounds = self.sql("SELECT MIN(date) AS first, MAX(date) AS last FROM transactions").iloc[0]
+        categories = self.sql("SELECT DISTINCT category FROM transactions WHERE category IS NOT NULL ORDER BY 1")
+        conditions = self.sql(
+            "SELECT DISTINCT weather_condition FROM external WHERE weather_condition IS NOT NULL ORDER BY 1")
+        return {
+            'first': bounds['first'], 'last': bounds['last'],
+            'categories': categories['category'].tolist(),
+            'conditions': conditions['weather_condition'].tolist(),
+        }
+
+    @staticmethod
+    def _slice_filter(start, end, categories, conditions):
+        """Clause WHERE (et paramètres) d'une tranche de ventes."""
+        where = ["t.date BETWEEN CAST(? AS TIMESTAMP) AND CAST(? AS TIMESTAMP)"]
+        params = [str(start), str(end)]
+        if categories:
+            where.append("list_contains(CAST(? AS VARCHAR[]), CAST(t.category AS VARCHAR))")
+            params.append(list(categories))
+        if conditions:
+            where.append("list_contains(CAST(? AS VARCHAR[]), CAST(e.weather_condition AS VARCHAR))")
+            params.append(list(conditions))
+        return " AND ".join(where), params
+
+    def sales_slice(self, start, end, categories=None, conditions=None, by="Mois"):
+        """
+        Ventes entre `start` et `end` (inclus), filtrées par catégories et
+        conditions météo (None: toutes), regroupées selon `by`
+        (clé de SLICE_DIMENSIONS). Colonnes: <by>, revenue, units,
+        transactions, clients; ordre chronologique pour les regroupements
+        temporels, chiffre d'affaires décroissant sinon.
+
+        Transactions et clients sont distincts par groupe: une transaction
+        répartie sur plusieurs produits compte dans chacun (totaux: sales_totals).
+        """
+        if by not in SLICE_DIMENSIONS:
+            raise ValueError(f"Regroupement inconnu: {by!r} (attendu: {', '.join(SLICE_DIMENSIONS)})")
+        where, params = self._slice_filter(start, end, categories, conditions)
+        order = "1" if by in TIME_DIMENSIONS else "revenue DESC"
+        return self.sql(
+            f"SELECT {SLICE_DIMENSIONS[by]} AS \"{by}\", "
+            f"{_SLICE_MEASURES} "
+            "FROM transactions t LEFT JOIN external e ON e.date = t.date "
+            f"WHERE {where} GROUP BY 1 ORDER BY {order}",
+            params,
+        )
+
+    def sales_totals(self, start, end, categories=None, conditions=None):
+        """Totaux de la tranche (mêmes filtres), transactions et clients distincts sur toute la période."""
+        where, params = self._slice_filter(start, end, categories, conditions)
+        return self.sql(
+            f"SELECT {_SLICE_MEASURES} "
+            f"FROM transactions t LEFT JOIN external e ON e.date = t.date WHERE {where}",
+            params,
+        ).iloc[0]
@@ -0,0 +1,342 @@
+"""
+Rafraîchissement en arrière-plan des agrégats, prévisions et listes d'expiration.
+
+Un processus dédié relève toutes les `interval` secondes l'empreinte des
+sources (signatures des CSV, version des données) du dossier de données, ou
+de chaque site (kweek.sites). Dès qu'une modification est stable (même
+empreinte à deux relevés successifs), seul ce qui en dépend est recalculé:
+
+- agrégats des transactions et cube du Dashboard: reconstruits si leurs
+  tables sources ont changé, sinon repris de la version publiée;
+- prévisions, réapprovisionnement, expiration et résumé commercial: étapes du
+  pipeline, sautées quand leurs entrées sont inchangées.
+
+La publication est atomique: les fichiers produits sont copiés dans
+`outputs/published/v<N>/`, avec un instantané du stockage (fichiers Parquet
+des tables, agrégats et cube de l'empreinte publiée, liés en dur), puis le
+pointeur `current.json` (version, empreinte) est remplacé en une seule
+opération. Une version publiée est un dossier de données autonome, sans CSV:
+l'application lit le pointeur à chaque exécution puis ne lit que cet
+instantané (jamais le stockage de travail, jamais de conversion), si bien que
+tables brutes et agrégats d'une session appartiennent toujours à la même
+version. Une session passe à la nouvelle version à sa prochaine réexécution,
+sans redémarrage. La version précédente reste disponible le temps que les
+sessions en cours basculent.
+
+    python -m kweek.refresh                # surveiller (Ctrl+C pour arrêter)
+    python -m kweek.refresh --once         # publier une fois et quitter
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+from kweek import aggregates, ingest, store
+
+PUBLISH_DIR = Path("outputs") / "published"
+CURRENT_NAME = "current.json"
+# Pointeur recopié dans chaque version publiée
+PUBLICATION_NAME = "publication.json"
+POLL_INTERVAL_S = 30
+# Versions publiées conservées (la courante et la précédente, encore lue par les sessions en cours)
+KEEP_VERSIONS = 2
+# Étapes du pipeline publiées (avec leurs dépendances: daily, ets)
+REFRESH_TARGETS = ("expiry", "reorder", "report")
+# Agrégats persistés par empreinte → tables dont ils dépendent
+AGGREGATE_TABLES = {'aggregates': ('transactions',), 'cube': ('transactions', 'daily')}
+
+
+def publish_dir(data_dir=Path(".")):
+    return Path(data_dir) / PUBLISH_DIR
+
+
+def version_dir(version, data_dir=Path(".")):
+    return publish_dir(data_dir) / f"v{version:06d}"
+
+
+def read_current(data_dir=Path(".")):
+    """Pointeur de la version publiée (version, fingerprint, published_at, ...), None si rien n'est publié."""
+    try:
+        return json.loads((publish_dir(data_dir) / CURRENT_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def current_fingerprint(data_dir=Path(".")):
+    """Empreinte publiée; sans rafraîchissement en place, empreinte des sources."""
+    return served(data_dir)[0]
+
+
+def served(data_dir=Path(".")):
+    """
+    (empreinte, dossier de données) à servir: la version publiée et son
+    instantané, sinon l'empreinte des sources et le dossier de travail.
+    """
+    current = read_current(data_dir)
+    if current is not None:
+        directory = version_dir(current['version'], data_dir)
+        # Version publiée sans instantané (antérieure): servie depuis le dossier de travail
+        if (directory / PUBLICATION_NAME).exists():
+            return current['fingerprint'], directory
+    return store.fingerprint(data_dir=data_dir), Path(data_dir)
+
+
+def read_publication(directory):
+    """Pointeur d'une version publiée (dossier servi par `served`), None pour un dossier de travail."""
+    try:
+        return json.loads((Path(directory) / PUBLICATION_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def table_signatures(data_dir=Path(".")):
+    """Fichiers (nom, taille, date de modification) de chaque table du stockage."""
+    data_dir = Path(data_dir)
+    signatures = {}
+    for name, spec in store.TABLES.items():
+        if (data_dir / spec.csv).exists() or store.parquet_path(name, data_dir).exists():
+            signatures[name] = [[p.name, p.stat().st_size, p.stat().st_mtime_ns]
+                                for p in store.table_files(name, data_dir)]
+    return signatures
+
+
+# ============================================================================
+# PUBLICATION
+# ============================================================================
+
+def _copy_dir(source, target):
+    """Copier un dossier d'agrégats sous une nouvelle empreinte (remplacement atomique)."""
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    shutil.copytree(source, tmp)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+
+def _link(source, target):
+    """Lien dur (le stockage ne réécrit jamais un fichier en place), copie à défaut."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _snapshot_store(fingerprint, tables, data_dir, target):
+    """Instantané du stockage dans `target`: tables, manifeste, version, site, agrégats et cube."""
+    source = store.store_dir(data_dir)
+    files = [path for name in tables for path in store.table_files(name, data_dir)]
+    files += [source / name for name in (store.MANIFEST_NAME, store.VERSION_NAME, store.SITE_NAME)]
+    for directory in (ingest.aggregates_dir(fingerprint, data_dir), aggregates.cube_dir(fingerprint, data_dir)):
+        files += [path for path in directory.rglob("*") if path.is_file()]
+    for path in files:
+        if path.exists():
+            _link(path, store.store_dir(target) / path.relative_to(source))
+
+
+def _prune(data_dir, versions, fingerprints):
+    """Supprimer les versions publiées et les agrégats qui ne sont plus servis."""
+    keep = {version_dir(v, data_dir).name for v in versions}
+    for old in publish_dir(data_dir).glob("v*"):
+        if old.is_dir() and old.name not in keep:
+            shutil.rmtree(old, ignore_errors=True)
+    for kind in (ingest.AGGREGATES_DIRNAME, aggregates.CUBE_DIRNAME):
+        store.prune_frames(kind, fingerprints, data_dir)
+
+
+def publish(fingerprint, files, tables, data_dir=Path("."), rebuilt=()):
+    """
+    Copier `files` (chemins relatifs à `data_dir`) dans une nouvelle version,
+    avec l'instantané du stockage des `tables` (signatures), puis remplacer le
+    pointeur en une opération. Retourne le nouveau pointeur, ou None si les
+    sources ont changé depuis le calcul de `fingerprint` (rien n'est publié).
+    """
+    data_dir = Path(data_dir)
+    previous = read_current(data_dir)
+    version = (previous['version'] if previous else 0) + 1
+
+    target = version_dir(version, data_dir)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    # Copies, pas de liens: le pipeline réécrit ses fichiers en place
+    for name in files:
+        (tmp / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(data_dir / name, tmp / name)
+    _snapshot_store(fingerprint, tables, data_dir, tmp)
+    if store.fingerprint(data_dir=tmp) != fingerprint:
+        # Ajout ou CSV modifié pendant le calcul: l'instantané ne correspond plus aux agrégats
+        shutil.rmtree(tmp, ignore_errors=True)
+        return None
+
+    current = {
+        'version': version,
+        'fingerprint': fingerprint,
+        'published_at': datetime.now().isoformat(timespec='seconds'),
+        'rebuilt': list(rebuilt),
+        'files': list(files),
+        'tables': tables,
+    }
+    (tmp / PUBLICATION_NAME).write_text(json.dumps(current, indent=2), encoding="utf-8")
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+    path = publish_dir(data_dir) / CURRENT_NAME
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+    _prune(data_dir, range(version - KEEP_VERSIONS + 1, version + 1),
+           {fingerprint, *([previous['fingerprint']] if previous else [])})
+    return current
+
+
+def refresh(data_dir=Path("."), force=False, log=print):
+    """
+    Recalculer ce qui dépend des sources modifiées, puis publier une nouvelle
+    version. Retourne le pointeur publié, ou None si la version publiée est à
+    jour, si une étape a échoué ou si les sources ont changé pendant le calcul
+    (la version publiée reste alors servie).
+    """
+    from kweek.pipeline import STAGES, run_pipeline
+    from kweek.pipeline.runner import BLOCKED, FAILED, RAN
+
+    data_dir = Path(data_dir).resolve()
+    previous = read_current(data_dir)
+    store.convert_all(data_dir)
+    fp = store.fingerprint(data_dir=data_dir)
+    if previous and previous['fingerprint'] == fp and not force:
+        return None
+
+    tables = table_signatures(data_dir)
+
+    def reusable(kind, directory):
+        """Dossier de la version publiée, si les tables de `kind` n'ont pas changé depuis."""
+        if previous is None or any(previous['tables'].get(t) != tables.get(t) for t in AGGREGATE_TABLES[kind]):
+            return None
+        old = directory(previous['fingerprint'], data_dir)
+        return old if old.is_dir() else None
+
+    rebuilt = []
+    if ingest.read_aggregates(fp, data_dir) is None:
+        old = reusable('aggregates', ingest.aggregates_dir)
+        if old is not None:
+            _copy_dir(old, ingest.aggregates_dir(fp, data_dir))
+        else:
+            ingest.save_aggregates(ingest.ingest_transactions(data_dir), fp, data_dir, prune=False)
+            rebuilt.append('aggregates')
+    if aggregates.read_cube(fp, data_dir) is None:
+        old = reusable('cube', aggregates.cube_dir)
+        if old is not None:
+            _copy_dir(old, aggregates.cube_dir(fp, data_dir))
+        else:
+            cube = aggregates.build_cube(ingest.read_aggregates(fp, data_dir), store.read_table("daily", data_dir=data_dir))
+            aggregates.save_cube(cube, fp, data_dir, prune=False)
+            rebuilt.append('cube')
+
+    results = run_pipeline(STAGES, list(REFRESH_TARGETS), data_dir=data_dir, force=force, log=log)
+    if any(r.status in (FAILED, BLOCKED) for r in results.values()):
+        log("  ✗ publication annulée: la version publiée reste servie")
+        return None
+    rebuilt += [name for name, r in results.items() if r.status == RAN]
+    files = sorted({name for r in results.values() for name in r.files})
+    current = publish(fp, files, tables, data_dir, rebuilt)
+    if current is None:
+        log("  ✗ sources modifiées pendant le calcul: publication reportée au prochain relevé")
+    return current
+
+
+# ============================================================================
+# SURVEILLANCE
+# ============================================================================
+
+def _targets(data_dir):
+    """Dossiers surveillés: {site: dossier}, ou {None: data_dir} sans partition."""
+    from kweek import sites
+
+    names = sites.list_sites(data_dir)
+    for site in names:
+        sites.site_fingerprint(site, data_dir)  # site inscrit dans son stockage (empreinte distincte)
+    return {site: sites.site_dir(site, data_dir) for site in names} or {None: Path(data_dir)}
+
+
+def _refresh_target(site, path, force, log):
+    label = f"[{site}] " if site else ""
+    started = time.perf_counter()
+    try:
+        current = refresh(path, force=force, log=log)
+    except Exception as e:
+        log(f"✗ {label}rafraîchissement en échec: {type(e).__name__}: {e}")
+        return False
+    if current is not None:
+        log(f"✓ {label}version {current['version']} publiée en {time.perf_counter() - started:.1f} s "
+            f"(recalculé: {', '.join(current['rebuilt']) or 'rien'})")
+    return current is not None
+
+
+def _publish_rollup(targets, data_dir, log):
+    from kweek import sites
+
+    if None not in targets:
+        fp, _ = sites.load_or_build_rollup(list(targets), data_dir)
+        log(f"✓ vue consolidée des sites → {sites.rollup_dir(fp, data_dir)}")
+
+
+def refresh_all(data_dir=Path("."), force=False, log=print):
+    """Rafraîchir immédiatement le dossier de données ou chacun des sites, puis la vue consolidée."""
+    targets = _targets(data_dir)
+    published = [_refresh_target(site, path, force, log) for site, path in targets.items()]
+    if any(published):
+        _publish_rollup(targets, data_dir, log)
+    return any(published)
+
+
+def watch(data_dir=Path("."), interval=POLL_INTERVAL_S, log=print):
+    """Surveiller les sources et publier chaque modification stable (boucle sans fin)."""
+    pending = {}
+    while True:
+        targets = _targets(data_dir)
+        published = False
+        for site, path in targets.items():
+            fp = store.fingerprint(data_dir=path)
+            current = read_current(path)
+            if current is not None and current['fingerprint'] == fp:
+                pending.pop(path, None)
+            elif pending.get(path) != fp:
+                # Première relève de cette empreinte: un fichier est peut-être en cours d'écriture
+                pending[path] = fp
+            else:
+                published |= _refresh_target(site, path, False, log)
+                pending.pop(path, None)
+        if published:
+            _publish_rollup(targets, data_dir, log)
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m kweek.refresh",
+                                     description="Rafraîchir et publier les agrégats, prévisions et listes d'expiration.")
+    parser.add_argument("--data-dir", type=Path, default=Path("."), help="dossier des CSV ou de sites/ (défaut: .)")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL_S,
+                        help=f"secondes entre deux relevés (défaut: {POLL_INTERVAL_S})")
+    parser.add_argument("--once", action="store_true", help="rafraîchir une fois et quitter")
+    parser.add_argument("--force", action="store_true", help="avec --once: tout recalculer et republier")
+    args = parser.parse_args()
+
+    if args.once:
+        if not refresh_all(args.data_dir, force=args.force):
+            print("✓ Version publiée à jour")
+        return
+    print(f"⏱ Surveillance de {args.data_dir.resolve()} toutes les {args.interval:g} s (Ctrl+C pour arrêter)")
+    try:
+        watch(args.data_dir, args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Segmentation RFM des clients (récence, fréquence, montant).
+
+Les indicateurs sont calculés par `client_id` en une passe vectorisée sur les
+transactions, bloc par bloc (jours complets, une transaction n'étant jamais
+coupée; fichier non trié par date: toutes les lignes regroupées). Le clustering utilise un k-means par mini-lots (coût linéaire en
+nombre de clients) et le silhouette score est estimé sur un échantillon au
+lieu de l'ensemble (O(n²)). Les résultats sont persistés dans
+`outputs/store/rfm/<empreinte>/` et relus tels quels par l'application.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from kweek import store
+from kweek.basket import UnsortedBatches, complete_baskets
+
+RFM_DIRNAME = "rfm"
+RFM_COLUMNS = ['transaction_id', 'date', 'client_id', 'total_amount']
+RFM_FEATURES = ['recency', 'frequency', 'monetary']
+
+K_RANGE = range(2, 7)
+SILHOUETTE_SAMPLE = 10_000
+MINIBATCH_SIZE = 4096
+
+# Stratégie par segment (les segments sont ordonnés par valeur décroissante)
+SEGMENT_ACTIONS = {
+    'VIP': 'Fidélité Premium',
+    'Standard': 'Promotions & Bundles',
+    'Occasional': 'Acquisition',
+}
+
+
+def _partial_rfm(lines):
+    """Indicateurs partiels d'un bloc: dernier achat, transactions, montant."""
+    tickets = lines.groupby(['client_id', 'transaction_id'], observed=True).agg(
+        date=('date', 'max'), amount=('total_amount', 'sum')
+    )
+    return tickets.groupby(level='client_id', observed=True).agg(
+        last_date=('date', 'max'), frequency=('amount', 'size'), monetary=('amount', 'sum')
+    )
+
+
+def compute_rfm(batches, ordered=True):
+    """
+    Récence (jours), fréquence (transactions) et montant par client. Lève
+    UnsortedBatches si `ordered` et que les blocs ne sont pas triés par date.
+    """
+    acc = None
+    first_date = last_date = None
+    for lines in complete_baskets(batches, ordered):
+        lines = lines.assign(client_id=lines['client_id'].astype(str))
+        partial = _partial_rfm(lines)
+        if acc is not None:
+            partial = pd.concat([acc, partial]).groupby(level='client_id').agg(
+                last_date=('last_date', 'max'), frequency=('frequency', 'sum'), monetary=('monetary', 'sum')
+            )
+        acc = partial
+        lo, hi = lines['date'].min(), lines['date'].max()
+        first_date = lo if first_date is None else min(first_date, lo)
+        last_date = hi if last_date is None else max(last_date, hi)
+
+    if acc is None:
+        return pd.DataFrame(columns=['client_id'] + RFM_FEATURES), None, None
+    rfm = acc.reset_index()
+    rfm['recency'] = (last_date - rfm['last_date']).dt.days
+    return rfm[['client_id'] + RFM_FEATURES], first_date, last_date
+
+
+def cluster_rfm(rfm, k_range=K_RANGE, sample_size=SILHOUETTE_SAMPLE, random_state=42):
+    """
+    k-means par mini-lots sur les indicateurs standardisés; k retenu par
+    silhouette échantillonné. Retourne (labels, k, silhouette).
+    """
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.metrics import silhouette_score
+    from sklearn.preprocessing import StandardScaler
+
+    X = StandardScaler().fit_transform(rfm[RFM_FEATURES].to_numpy(dtype=float))
+    n = len(X)
+    best = (None, 0, -1.0)
+    for k in k_range:
+        if k >= n:
+            break
+        labels = MiniBatchKMeans(
+            n_clusters=k, batch_size=MINIBATCH_SIZE, n_init=3, random_state=random_state
+        ).fit_predict(X)
+        if len(np.unique(labels)) < 2:
+            continue
+        score = silhouette_score(X, labels, sample_size=min(n, sample_size), random_state=random_state)
+        if score > best[2]:
+            best = (labels, k, float(score))
+    if best[0] is None:
+        return np.zeros(n, dtype=int), 1, float('nan')
+    return best
+
+
+def _segment_names(k):
+    """Noms des segments du plus au moins rentable: VIP, Standard…, Occasional."""
+    if k == 1:
+        return ['Standard']
+    middle = ['Standard'] if k == 3 else [f'Standard {i}' for i in range(1, k - 1)]
+    return ['VIP'] + middle + ['Occasional']
+
+
+def build_rfm(data_dir=Path("."), batch_size=store.CHUNK_ROWS):
+    """Calculer, segmenter et résumer le RFM de tous les clients."""
+    def batches():
+        return store.iter_batches("transactions", columns=RFM_COLUMNS, batch_size=batch_size, data_dir=data_dir)
+
+    try:
+        rfm, first_date, last_date = compute_rfm(batches())
+    except UnsortedBatches:
+        rfm, first_date, last_date = compute_rfm(batches(), ordered=False)
+    labels, k, silhouette = cluster_rfm(rfm) if len(rfm) > 2 else (np.zeros(len(rfm), dtype=int), 1, float('nan'))
+
+    # Clusters renumérotés par montant moyen décroissant: cluster 0 = VIP
+    order = pd.Series(rfm['monetary'].to_numpy()).groupby(labels).mean().sort_values(ascending=False).index
+    rank = np.zeros(int(max(order, default=0)) + 1, dtype=np.int32)
+    rank[np.asarray(order, dtype=np.intp)] = np.arange(len(order), dtype=np.int32)
+    rfm['cluster'] = rank[np.asarray(labels, dtype=np.intp)] if len(rfm) else []
+    names = _segment_names(len(order))
+    rfm['segment'] = rfm['cluster'].map(dict(enumerate(names)))
+
+    months = max(((last_date - first_date).days + 1) / 30.44, 1.0) if len(rfm) else 1.0
+    profile = rfm.groupby(['cluster', 'segment'], sort=True).agg(
+        clients=('client_id', 'size'),
+        recency=('recency', 'mean'),
+        frequency=('frequency', 'mean'),
+        monetary=('monetary', 'mean'),
+    ).reset_index()
+    profile['share'] = profile['clients'] / max(len(rfm), 1)
+    profile['frequency_per_month'] = profile['frequency'] / months
+    profile['aov'] = profile['monetary'] / profile['frequency'].where(profile['frequency'] > 0)
+    profile['action'] = profile['segment'].str.split(' ').str[0].map(SEGMENT_ACTIONS)
+
+    summary = pd.DataFrame({'n_clients': [len(rfm)], 'k': [k], 'silhouette': [silhouette],
+                            'silhouette_sample': [min(len(rfm), SILHOUETTE_SAMPLE)]})
+    return {'clients': rfm, 'profile': profile, 'summary': summary}
+
+
+# ============================================================================
+# PERSISTANCE
+# ============================================================================
+
+def rfm_dir(fingerprint, data_dir=Path(".")):
+    return store.derived_dir(RFM_DIRNAME, fingerprint, data_dir)
+
+
+def load_or_build_rfm(fingerprint, data_dir=Path("."), work_dir=None):
+    """
+    Segmentation RFM de l'empreinte donnée, calculée au besoin à partir de
+    `data_dir` et persistée dans `work_dir` (par défaut `data_dir`).
+    """
+    return store.load_or_build_frames(RFM_DIRNAME, fingerprint, lambda: build_rfm(data_dir), work_dir or data_dir)
+
+
+def main():
+    fp = store.fingerprint()
+    frames = load_or_build_rfm(fp)
+    summary = frames['summary'].iloc[0]
+    print(f"✓ RFM: {int(summary['n_clients']):,} clients, k={int(summary['k'])}, "
+          f"silhouette≈{summary['silhouette']:.3f} → {rfm_dir(fp)}")
+
+
+if __name__ == "__main__":
+    main()
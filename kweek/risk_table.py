@@ -0,0 +1,86 @@
+"""
+Tableau des lots à risque d'expiration: bandes de risque précalculées, tri et
+pagination côté serveur, style vectorisé et export à la demande.
+
+Le tableau est construit une fois par (version des données, date de
+référence). Chaque ordre de tri est calculé une seule fois (argsort mémorisé)
+et une page n'est qu'une tranche de cet ordre: seules les lignes affichées
+sont matérialisées et stylées. L'export CSV n'est encodé qu'au premier
+téléchargement.
+"""
+
+import numpy as np
+import pandas as pd
+
+# (jours restants maximum, libellé, couleur) — du plus au moins urgent
+RISK_BANDS = [
+    (1, "🚨 Critique", "#ff6b6b"),
+    (3, "⚠️ Haute", "#ffa500"),
+    (7, "🟡 Moyenne", "#fff9e6"),
+    (np.inf, "🟢 Basse", "white"),
+]
+
+DISPLAY_COLUMNS = ['batch_id', 'product_name', 'quantity_available', 'days_until_expiry',
+                   'expiration_date', 'risk_band']
+PAGE_SIZE = 20
+
+
+def with_risk_bands(lots):
+    """Ajouter la bande de risque (catégorie ordonnée) et sa couleur, sans boucle par ligne."""
+    limits = np.array([limit for limit, _, _ in RISK_BANDS])
+    codes = np.searchsorted(limits, lots['days_until_expiry'].to_numpy(), side='left')
+    labels = [label for _, label, _ in RISK_BANDS]
+    colors = np.array([color for _, _, color in RISK_BANDS], dtype=object)
+    return lots.assign(
+        risk_band=pd.Categorical.from_codes(codes, categories=labels, ordered=True),
+        risk_color=colors[codes],
+    )
+
+
+class RiskTable:
+    """Lots à risque triables et paginés, avec export CSV paresseux."""
+
+    def __init__(self, lots, columns=DISPLAY_COLUMNS):
+        self.frame = with_risk_bands(lots).reset_index(drop=True)
+        self.columns = [c for c in columns if c in self.frame.columns]
+        self._orders = {}
+        self._csv = None
+
+    def __len__(self):
+        return len(self.frame)
+
+    def n_pages(self, page_size=PAGE_SIZE):
+        return max(1, -(-len(self.frame) // page_size))
+
+    def band_counts(self):
+        """Nombre de lots par bande de risque."""
+        return self.frame['risk_band'].value_counts(sort=False)
+
+    def _order(self, sort_by, ascending):
+        key = (sort_by, ascending)
+        if key not in self._orders:
+            column = self.frame[sort_by]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                column = column.cat.codes
+            self._orders[key] = np.asarray(
+                column.sort_values(ascending=ascending, kind='stable').index
+            )
+        return self._orders[key]
+
+    def page(self, number, page_size=PAGE_SIZE, sort_by='days_until_expiry', ascending=True):
+        """Lignes de la page `number` (à partir de 1) selon l'ordre demandé."""
+        number = min(max(1, number), self.n_pages(page_size))
+        rows = self._order(sort_by, ascending)[(number - 1) * page_size:number * page_size]
+        return self.frame.iloc[rows]
+
+    def style(self, rows):
+        """Styler d'une page: fond de ligne selon la bande, appliqué au tableau entier d'un coup."""
+        shown = rows[self.columns]
+        css = np.repeat(('background-color: ' + rows['risk_color']).to_numpy()[:, None], len(self.columns), axis=1)
+        return shown.style.apply(lambda _: pd.DataFrame(css, index=shown.index, columns=shown.columns), axis=None)
+
+    def to_csv(self):
+        """Export CSV complet (encodé une seule fois, au premier appel)."""
+        if self._csv is None:
+            self._csv = self.frame.drop(columns='risk_color').to_csv(index=False)
+        return self._csv
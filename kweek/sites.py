@@ -0,0 +1,312 @@
+"""
+Plusieurs restaurants: stockage partitionné par site et traitements par site.
+
+Chaque restaurant a sa partition `sites/<site>/`, organisée comme le dossier
+de données d'un site unique: les six CSV et un `outputs/` propre (stockage
+Parquet, agrégats, prévisions, listes d'expiration). Toutes les fonctions qui
+prennent un `data_dir` s'appliquent donc telles quelles à une partition, et
+l'application ne lit que celle du site choisi.
+
+- build_sites(): stockage, agrégats, cube et étapes du pipeline (prévisions,
+  expiration, réapprovisionnement) de chaque site, un site par processus.
+- Vue consolidée (rollup): fusion des agrégats additifs des sites (sommes par
+  jour, jour × produit et mois × produit, cumuls recalculés). Les transactions
+  brutes des sites ne sont jamais concaténées.
+
+    python -m kweek.sites list
+    python -m kweek.sites add paris chemin/vers/csv_paris
+    python -m kweek.sites build [paris lyon] [--force] [--jobs 4]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from kweek import aggregates, ingest, refresh, store
+
+SITES_DIR = Path("sites")
+ROLLUP_DIRNAME = "rollup"
+# Étapes du pipeline exécutées pour chaque site (avec leurs dépendances: daily, ets)
+SITE_TARGETS = ("expiry", "reorder")
+
+# Agrégats additifs (table → clés): la somme des sites donne la vue consolidée
+ADDITIVE_TABLES = {
+    'daily': ['date'],
+    'daily_product': ['date', 'product_name'],
+    'monthly_product': ['month', 'product_name'],
+}
+# Colonnes de la table quotidienne sommées entre sites (les facteurs sont moyennés)
+DAILY_SUM_COLUMNS = ['num_transactions', 'total_units', 'total_revenue', 'total_profit']
+
+_SITE_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+
+
+def sites_dir(data_dir=Path(".")):
+    return Path(data_dir) / SITES_DIR
+
+
+def site_dir(site, data_dir=Path(".")):
+    if not _SITE_ID.fullmatch(site):
+        raise ValueError(f"Identifiant de site invalide: {site!r} (lettres, chiffres, '-' et '_')")
+    return sites_dir(data_dir) / site
+
+
+def list_sites(data_dir=Path(".")):
+    """Sites partitionnés, triés: dossiers de `sites/` contenant des transactions (CSV ou stockage)."""
+    root = sites_dir(data_dir)
+    if not root.is_dir():
+        return []
+    csv = store.TABLES['transactions'].csv
+    return sorted(
+        path.name for path in root.iterdir()
+        if path.is_dir() and _SITE_ID.fullmatch(path.name)
+        and ((path / csv).exists() or store.parquet_path('transactions', path).exists())
+    )
+
+
+def site_fingerprint(site, data_dir=Path("."), published=False):
+    """
+    Empreinte des données du site (le site est inscrit dans son stockage au
+    premier appel). `published`: empreinte de la version publiée par
+    kweek.refresh, s'il y en a une.
+    """
+    path = site_dir(site, data_dir)
+    if store.read_site(path) != site:
+        store.write_site(site, path)
+    return refresh.current_fingerprint(path) if published else store.fingerprint(data_dir=path)
+
+
+def add_site(site, source_dir, data_dir=Path(".")):
+    """Créer (ou remplacer) la partition `site` à partir des six CSV de `source_dir`."""
+    source_dir = Path(source_dir)
+    missing = [spec.csv for spec in store.TABLES.values() if not (source_dir / spec.csv).exists()]
+    if missing:
+        raise FileNotFoundError(f"CSV manquant(s) dans {source_dir}: {', '.join(missing)}")
+    target = site_dir(site, data_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    for spec in store.TABLES.values():
+        shutil.copyfile(source_dir / spec.csv, target / spec.csv)
+    store.write_site(site, target)
+    return target
+
+
+# ============================================================================
+# TRAITEMENTS PAR SITE
+# ============================================================================
+
+@dataclass
+class SiteResult:
+    """Résultat des traitements d'un site: statut de chaque étape, ou erreur."""
+    site: str
+    fingerprint: str = ""
+    stages: dict = field(default_factory=dict)
+    seconds: float = 0.0
+    error: str = ""
+
+
+def build_site(site, data_dir=Path("."), targets=SITE_TARGETS, force=False):
+    """Stockage, agrégats, cube et étapes `targets` d'un site (tâche d'un processus du pool)."""
+    from kweek.pipeline import STAGES, run_pipeline
+    from kweek.pipeline.runner import BLOCKED, FAILED
+
+    started = time.perf_counter()
+    path = site_dir(site, data_dir)
+    fp = site_fingerprint(site, data_dir)
+    store.convert_all(path)
+    aggs = ingest.load_or_build_aggregates(fp, path)
+    aggregates.load_or_build_cube(aggs, store.read_table("daily", data_dir=path), fp, path)
+    # Un seul processus par site: le parallélisme est entre les sites
+    results = run_pipeline(STAGES, list(targets), data_dir=path, force=force, max_workers=1, log=lambda _: None)
+    errors = [f"{name}: {r.error or r.status}" for name, r in results.items() if r.status in (FAILED, BLOCKED)]
+    return SiteResult(site, fp, {name: r.status for name, r in results.items()},
+                      time.perf_counter() - started, "; ".join(errors))
+
+
+def build_sites(sites=None, data_dir=Path("."), targets=SITE_TARGETS, force=False, max_workers=None, log=print):
+    """
+    Traiter `sites` (tous par défaut), un site par processus.
+    Retourne {site: SiteResult}, dans l'ordre des sites.
+    """
+    from kweek.pipeline.runner import RAN
+
+    data_dir = Path(data_dir).resolve()
+    available = list_sites(data_dir)
+    sites = list(sites) if sites else available
+    unknown = [s for s in sites if s not in available]
+    if unknown:
+        raise ValueError(f"Site inconnu: {unknown[0]!r} (disponibles: {', '.join(available) or 'aucun'})")
+    max_workers = min(len(sites), store.default_workers() if max_workers is None else max_workers)
+
+    results = {}
+
+    def collect(site, run):
+        try:
+            results[site] = run()
+        except Exception as e:
+            results[site] = SiteResult(site, error=f"{type(e).__name__}: {e}")
+        result = results[site]
+        if result.error:
+            log(f"  ✗ {site}: {result.error}")
+        else:
+            ran = sum(status == RAN for status in result.stages.values())
+            log(f"  ✓ {site}: {ran}/{len(result.stages)} étape(s) exécutée(s) en {result.seconds:.1f} s")
+
+    if max_workers <= 1:
+        for site in sites:
+            collect(site, lambda: build_site(site, data_dir, targets, force))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(build_site, site, data_dir, targets, force): site for site in sites}
+            for future in as_completed(futures):
+                collect(futures[future], future.result)
+    return {site: results[site] for site in sites}
+
+
+# ============================================================================
+# VUE CONSOLIDÉE
+# ============================================================================
+
+def merge_aggregates(per_site):
+    """Agrégats consolidés ({site: agrégats de kweek.ingest}): tables additives sommées, cumuls recalculés."""
+    merged = {}
+    for name, keys in ADDITIVE_TABLES.items():
+        frame = pd.concat([aggs[name] for aggs in per_site.values()], ignore_index=True)
+        merged[name] = frame.groupby(keys, observed=True).sum().reset_index()
+    product_category = {}
+    for aggs in per_site.values():
+        by_product = aggs['by_product']
+        product_category.update(zip(by_product['product_name'].astype(str), by_product['category'].astype(str)))
+    merged['by_product'], merged['by_category'] = ingest.summarize(merged['daily_product'], product_category)
+    return merged
+
+
+def merge_daily(per_site):
+    """Table quotidienne consolidée: ventes sommées, facteurs moyennés, libellés du premier site."""
+    frame = pd.concat([daily.assign(date=pd.to_datetime(daily['date'])) for daily in per_site.values()],
+                      ignore_index=True)
+    sums = [c for c in DAILY_SUM_COLUMNS if c in frame.columns]
+    means = [c for c in frame.select_dtypes('float').columns if c not in sums]
+    firsts = [c for c in frame.columns if c not in ('date', *sums, *means)]
+    grouped = frame.groupby('date')
+    merged = pd.concat([grouped[sums].sum(), grouped[means].mean(), grouped[firsts].first()], axis=1)
+    return merged.reset_index()[list(frame.columns)]
+
+
+def site_summary(per_site):
+    """Chiffres clés de chaque site (colonnes site, total_sales, total_units, n_lines, n_products)."""
+    rows = [
+        {'site': site, 'total_sales': float(aggs['by_product']['total_amount'].sum()),
+         'total_units': int(aggs['by_product']['quantity'].sum()),
+         'n_lines': int(aggs['by_product']['n_lines'].sum()), 'n_products': len(aggs['by_product'])}
+        for site, aggs in per_site.items()
+    ]
+    return pd.DataFrame(rows).sort_values('total_sales', ascending=False, ignore_index=True)
+
+
+def rollup_fingerprint(sites=None, data_dir=Path(".")):
+    """Empreinte de la vue consolidée: empreintes (publiées) de chacun des sites."""
+    sites = sorted(sites or list_sites(data_dir))
+    signature = json.dumps({site: site_fingerprint(site, data_dir, published=True) for site in sites},
+                           sort_keys=True)
+    return hashlib.sha1(signature.encode()).hexdigest()[:16]
+
+
+def build_rollup(sites=None, data_dir=Path(".")):
+    """Vue consolidée {'sales', 'daily', 'cube'} construite à partir des agrégats de chaque site."""
+    sites = sorted(sites or list_sites(data_dir))
+    per_site, daily = {}, {}
+    for site in sites:
+        # Version publiée du site (instantané), ou son dossier de travail
+        site_fingerprint(site, data_dir)
+        fp, path = refresh.served(site_dir(site, data_dir))
+        per_site[site] = ingest.load_or_build_aggregates(fp, path)
+        daily[site] = store.read_table("daily", data_dir=path)
+    sales = merge_aggregates(per_site)
+    merged_daily = merge_daily(daily)
+    cube = aggregates.build_cube(sales, merged_daily)
+    cube['by_site'] = site_summary(per_site)
+    return {'sales': sales, 'daily': merged_daily, 'cube': cube}
+
+
+def rollup_dir(fingerprint, data_dir=Path(".")):
+    return store.derived_dir(ROLLUP_DIRNAME, fingerprint, data_dir)
+
+
+def save_rollup(rollup, fingerprint, data_dir=Path(".")):
+    """Écrire la vue consolidée de façon atomique; les versions précédentes sont supprimées."""
+    frames = {'daily': rollup['daily']}
+    for group in ('sales', 'cube'):
+        frames.update({f"{group}.{name}": frame for name, frame in rollup[group].items()})
+    store.save_frames(ROLLUP_DIRNAME, frames, fingerprint, data_dir, index=None)
+
+
+def read_rollup(fingerprint, data_dir=Path(".")):
+    """Relire une vue consolidée persistée, ou None si elle n'existe pas pour cette empreinte."""
+    frames = store.read_frames(ROLLUP_DIRNAME, fingerprint, data_dir)
+    if frames is None:
+        return None
+    rollup = {'daily': frames.pop('daily'), 'sales': {}, 'cube': {}}
+    for key, frame in frames.items():
+        group, name = key.split(".", 1)
+        rollup[group][name] = frame
+    return rollup
+
+
+def load_or_build_rollup(sites=None, data_dir=Path(".")):
+    """Vue consolidée des sites (tous par défaut), construite au besoin. Retourne (empreinte, vue)."""
+    fp = rollup_fingerprint(sites, data_dir)
+    rollup = read_rollup(fp, data_dir)
+    if rollup is None:
+        rollup = build_rollup(sites, data_dir)
+        save_rollup(rollup, fp, data_dir)
+    return fp, rollup
+
+
+# ============================================================================
+# LIGNE DE COMMANDE
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m kweek.sites",
+                                     description="Gérer les partitions par restaurant.")
+    parser.add_argument("--data-dir", type=Path, default=Path("."), help="dossier contenant sites/ (défaut: .)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="lister les sites")
+    add = commands.add_parser("add", help="créer une partition à partir d'un dossier de CSV")
+    add.add_argument("site")
+    add.add_argument("source", type=Path)
+    build = commands.add_parser("build", help="traiter les sites (un processus par site) et consolider")
+    build.add_argument("sites", nargs="*", help="sites à traiter; tous par défaut")
+    build.add_argument("--force", action="store_true", help="réexécuter les étapes inchangées")
+    build.add_argument("--jobs", type=int, default=None, help="sites traités simultanément")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "list":
+            for site in list_sites(args.data_dir):
+                print(f"  {site}  ({site_dir(site, args.data_dir)})")
+        elif args.command == "add":
+            print(f"✓ Site {args.site} → {add_site(args.site, args.source, args.data_dir)}")
+        else:
+            started = time.perf_counter()
+            results = build_sites(args.sites, args.data_dir, force=args.force, max_workers=args.jobs)
+            failed = [site for site, result in results.items() if result.error]
+            fp, _ = load_or_build_rollup(data_dir=args.data_dir)
+            print(f"✓ Sites: {len(results) - len(failed)} traité(s), {len(failed)} en échec "
+                  f"en {time.perf_counter() - started:.1f} s; vue consolidée → {rollup_dir(fp, args.data_dir)}")
+            if failed:
+                raise SystemExit(1)
+    except (ValueError, FileNotFoundError) as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,481 @@
+"""
+Stockage colonnaire (Parquet/Arrow) des tables du projet.
+
+Chaque CSV source est converti une fois en Parquet avec des types explicites
+(dates réelles, colonnes catégorielles, entiers/flottants fixés). Les lectures
+suivantes se font par projection de colonnes et en mémoire mappée ; le CSV
+n'est relu que lorsque le stockage est périmé (CSV modifié depuis la
+conversion ou fichier Parquet absent). Conversion et itération se font par
+blocs, si bien qu'une table plus grande que la mémoire reste exploitable.
+
+Des lots de lignes peuvent être ajoutés sans toucher au CSV (append_rows):
+ils sont stockés à part dans `appends/<table>/` et relus avec la table; une
+petite table peut aussi être remplacée en entier (replace_table, dans
+`replacements/<table>/`). Ces fichiers sont nommés par version des données
+et ne sont lus qu'une fois cette version publiée (write_version): un ajout
+interrompu reste invisible et sa reprise réécrit les mêmes fichiers. La
+version fait partie de l'empreinte: les caches indexés sur l'empreinte se
+rafraîchissent d'eux-mêmes.
+
+Conversion manuelle:
+    python -m kweek.store
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+STORE_DIR = Path("outputs") / "store"
+MANIFEST_NAME = "manifest.json"
+VERSION_NAME = "version.json"
+SITE_NAME = "site.json"
+APPENDS_DIRNAME = "appends"
+REPLACEMENTS_DIRNAME = "replacements"
+
+# Lignes lues par bloc (conversion et itération): borne la mémoire de pointe
+CHUNK_ROWS = 500_000
+
+
+def default_workers():
+    """Processus des calculs parallèles par défaut: un cœur laissé libre."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Schéma d'une table: fichier source, dates, catégories et types fixes."""
+    csv: str
+    dates: tuple = ()
+    categories: tuple = ()
+    dtypes: dict = field(default_factory=dict)
+
+
+# ============================================================================
+# SCHÉMAS
+# ============================================================================
+
+TABLES = {
+    'transactions': TableSpec(
+        csv="restaurant_sales_transactions.csv",
+        dates=('date', 'timestamp'),
+        categories=('product_name', 'category', 'product_id', 'segment'),
+        dtypes={
+            'transaction_id': 'string',
+            'client_id': 'string',
+            'quantity': 'int32',
+            'unit_price': 'float64',
+            'total_amount': 'float64',
+        },
+    ),
+    'daily': TableSpec(
+        csv="restaurant_daily_factors_sales.csv",
+        dates=('date',),
+        categories=('day_name', 'weather_condition', 'event_name', 'event_type', 'temp_bin', 'season'),
+        dtypes={
+            'num_transactions': 'int32',
+            'total_units': 'int32',
+            'total_revenue': 'float64',
+            'total_profit': 'float64',
+            'day_of_week': 'int8',
+            'is_weekend': 'int8',
+            'month': 'int8',
+            'quarter': 'int8',
+        },
+    ),
+    'products': TableSpec(
+        csv="restaurant_products.csv",
+        categories=('name', 'category'),
+        dtypes={
+            'product_id': 'string',
+            'unit_cost': 'float64',
+            'unit_price': 'float64',
+            'shelf_life': 'int16',
+            'base_demand': 'int32',
+        },
+    ),
+    'clients': TableSpec(
+        csv="restaurant_clients.csv",
+        dates=('first_visit',),
+        categories=('segment',),
+        dtypes={
+            'client_id': 'string',
+            'avg_spend': 'float64',
+            'loyalty_points': 'int32',
+        },
+    ),
+    'external': TableSpec(
+        csv="restaurant_external_factors.csv",
+        dates=('date',),
+        categories=('day_name', 'weather_condition', 'event_name', 'event_type'),
+        dtypes={
+            'day_of_week': 'int8',
+            'is_weekend': 'int8',
+            'month': 'int8',
+            'quarter': 'int8',
+        },
+    ),
+    'inventory': TableSpec(
+        csv="restaurant_stock_inventory.csv",
+        dates=('arrival_date', 'arrival_timestamp', 'expiration_date', 'expiration_time'),
+        categories=('product_id', 'product_name', 'category', 'status', 'storage_temp_required', 'supplier_id'),
+        dtypes={
+            'batch_id': 'string',
+            'quantity_received': 'int32',
+            'quantity_available': 'int32',
+            'unit_cost': 'float64',
+            'total_cost': 'float64',
+            'shelf_life_days': 'int16',
+            'days_until_expiry': 'int16',
+        },
+    ),
+}
+
+
+# ============================================================================
+# MANIFESTE & FRAÎCHEUR
+# ============================================================================
+
+def store_dir(data_dir=Path(".")):
+    return Path(data_dir) / STORE_DIR
+
+
+def parquet_path(name, data_dir=Path(".")):
+    return store_dir(data_dir) / f"{name}.parquet"
+
+
+def _source_signature(path):
+    """Signature légère d'un CSV source (taille + date de modification)."""
+    stat = path.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _tmp_path(path):
+    """Fichier temporaire propre à ce processus et à ce thread (écritures concurrentes du même fichier)."""
+    return path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+def read_manifest(data_dir=Path(".")):
+    path = store_dir(data_dir) / MANIFEST_NAME
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(manifest, data_dir=Path(".")):
+    path = store_dir(data_dir) / MANIFEST_NAME
+    tmp = _tmp_path(path)
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_version(data_dir=Path(".")):
+    """Version des données (incrémentée à chaque ajout de lignes)."""
+    try:
+        return json.loads((store_dir(data_dir) / VERSION_NAME).read_text(encoding="utf-8"))['version']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return 0
+
+
+def write_version(version, data_dir=Path(".")):
+    path = store_dir(data_dir) / VERSION_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(path)
+    tmp.write_text(json.dumps({'version': version}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_site(data_dir=Path(".")):
+    """Identifiant du restaurant de ce dossier de données (None: site unique, hors partition)."""
+    try:
+        return json.loads((store_dir(data_dir) / SITE_NAME).read_text(encoding="utf-8"))['site']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+
+def write_site(site, data_dir=Path(".")):
+    path = store_dir(data_dir) / SITE_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(path)
+    tmp.write_text(json.dumps({'site': site}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def is_stale(name, data_dir=Path(".")):
+    """Vrai si le Parquet de `name` est absent ou plus ancien que son CSV source."""
+    data_dir = Path(data_dir)
+    csv_path = data_dir / TABLES[name].csv
+    if not parquet_path(name, data_dir).exists():
+        return True
+    if not csv_path.exists():
+        # Plus de source: le stockage reste la seule version disponible
+        return False
+    return read_manifest(data_dir).get(name) != _source_signature(csv_path)
+
+
+def fingerprint(names=None, data_dir=Path("."), version=None):
+    """
+    Empreinte courte des sources et de la version des données, utilisée comme
+    clé des caches dérivés. `version` permet de calculer l'empreinte d'une
+    version à venir (publication atomique des agrégats). Le site d'une
+    partition (kweek.sites) en fait partie: deux sites ont des empreintes
+    distinctes même avec des fichiers identiques.
+    """
+    data_dir = Path(data_dir)
+    digest = hashlib.sha1()
+    digest.update(f"version:{read_version(data_dir) if version is None else version};".encode())
+    site = read_site(data_dir)
+    if site is not None:
+        digest.update(f"site:{site};".encode())
+    for name in sorted(names or TABLES):
+        csv_path = data_dir / TABLES[name].csv
+        sig = _source_signature(csv_path) if csv_path.exists() else read_manifest(data_dir).get(name)
+        digest.update(f"{name}:{json.dumps(sig, sort_keys=True)};".encode())
+    return digest.hexdigest()[:16]
+
+
+# ============================================================================
+# LECTURE / CONVERSION
+# ============================================================================
+
+def read_csv_typed(name, data_dir=Path("."), columns=None, chunksize=None):
+    """Lire le CSV source en appliquant le schéma (itérateur de blocs si `chunksize`)."""
+    spec = TABLES[name]
+    csv_path = Path(data_dir) / spec.csv
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [c for c in header if columns is None or c in columns]
+
+    dtypes = {c: t for c, t in spec.dtypes.items() if c in usecols}
+    dtypes.update({c: 'category' for c in spec.categories if c in usecols})
+    dates = [c for c in spec.dates if c in usecols]
+
+    return pd.read_csv(csv_path, usecols=usecols, dtype=dtypes, parse_dates=dates, chunksize=chunksize)
+
+
+def _fixed_schema(table):
+    """Schéma commun à tous les blocs: dictionnaires (catégories) indexés en int32."""
+    fields = [
+        pa.field(f.name, pa.dictionary(pa.int32(), pa.string())) if pa.types.is_dictionary(f.type) else f
+        for f in table.schema
+    ]
+    return pa.schema(fields).with_metadata(table.schema.metadata)
+
+
+def convert_table(name, data_dir=Path("."), chunksize=CHUNK_ROWS):
+    """
+    Convertir un CSV en Parquet typé, bloc par bloc (un row group par bloc),
+    puis mettre à jour le manifeste. La mémoire utilisée est bornée par
+    `chunksize`, quelle que soit la taille du fichier.
+    """
+    data_dir = Path(data_dir)
+    csv_path = data_dir / TABLES[name].csv
+
+    out = parquet_path(name, data_dir)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(out)
+    writer = None
+    try:
+        for chunk in read_csv_typed(name, data_dir, chunksize=chunksize):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = _fixed_schema(table)
+                writer = pq.ParquetWriter(tmp, schema, compression="zstd")
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp, out)
+    # Le CSV fait de nouveau foi: les lots ajoutés et remplacements depuis sont déjà inclus
+    shutil.rmtree(append_dir(name, data_dir), ignore_errors=True)
+    shutil.rmtree(replacement_dir(name, data_dir), ignore_errors=True)
+
+    manifest = read_manifest(data_dir)
+    manifest[name] = _source_signature(csv_path)
+    _write_manifest(manifest, data_dir)
+
+
+def convert_all(data_dir=Path(".")):
+    """Convertir toutes les tables dont le CSV est présent et plus récent."""
+    converted = []
+    for name, spec in TABLES.items():
+        if (Path(data_dir) / spec.csv).exists() and is_stale(name, data_dir):
+            convert_table(name, data_dir)
+            converted.append(name)
+    return converted
+
+
+def read_table(name, columns=None, data_dir=Path(".")):
+    """
+    Lire une table depuis le stockage colonnaire.
+
+    Seules les colonnes demandées sont décodées et le fichier est mappé en
+    mémoire. Si le stockage est périmé, le CSV est relu (typé) et le Parquet
+    régénéré pour les démarrages suivants.
+    """
+    path, *extras = table_files(name, data_dir)
+    if columns is not None:
+        available = pq.read_schema(path).names
+        columns = [c for c in columns if c in available]
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    frames = [table.to_pandas()]
+    for extra in extras:
+        frames.append(pd.read_parquet(extra, columns=columns))
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def iter_batches(name, columns=None, batch_size=CHUNK_ROWS, data_dir=Path(".")):
+    """
+    Parcourir une table par blocs de `batch_size` lignes (DataFrames typés),
+    sans jamais la charger entièrement. Le stockage est rafraîchi au besoin.
+    """
+    for path in table_files(name, data_dir):
+        parquet = pq.ParquetFile(path, memory_map=True)
+        cols = None if columns is None else [c for c in columns if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=cols):
+            yield batch.to_pandas()
+
+
+# ============================================================================
+# AJOUTS INCRÉMENTAUX
+# ============================================================================
+
+def append_dir(name, data_dir=Path(".")):
+    return store_dir(data_dir) / APPENDS_DIRNAME / name
+
+
+def replacement_dir(name, data_dir=Path(".")):
+    return store_dir(data_dir) / REPLACEMENTS_DIRNAME / name
+
+
+def _versioned_files(directory, after, upto):
+    """Fichiers `<version>.parquet` de `directory` avec after < version ≤ upto, par version."""
+    if not directory.is_dir():
+        return []
+    files = {int(path.stem): path for path in directory.glob("*.parquet")}
+    return [files[v] for v in sorted(files) if after < v <= upto]
+
+
+def table_files(name, data_dir=Path(".")):
+    """
+    Fichiers Parquet qui composent la table à la version publiée: stockage
+    rafraîchi (ou son dernier remplacement), puis lots ajoutés depuis.
+    """
+    if is_stale(name, data_dir):
+        convert_table(name, data_dir)
+    version = read_version(data_dir)
+    replaced = _versioned_files(replacement_dir(name, data_dir), -1, version)
+    base = int(replaced[-1].stem) if replaced else -1
+    appended = _versioned_files(append_dir(name, data_dir), base, version)
+    return [replaced[-1] if replaced else parquet_path(name, data_dir), *appended]
+
+
+def row_count(name, data_dir=Path(".")):
+    """Nombre de lignes de la table, lu dans les métadonnées Parquet (aucune donnée décodée)."""
+    return sum(pq.ParquetFile(path).metadata.num_rows for path in table_files(name, data_dir))
+
+
+def append_rows(name, df, version, data_dir=Path(".")):
+    """Ajouter un lot de lignes à la table `name`, visible une fois `version` publiée."""
+    directory = append_dir(name, data_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    out = directory / f"{version:08d}.parquet"
+    tmp = _tmp_path(out)
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, out)
+
+
+def replace_table(name, df, version, data_dir=Path(".")):
+    """
+    Remplacer une petite table (ex. jointure quotidienne mise à jour) à
+    partir de `version`, visible une fois celle-ci publiée. Les remplacements
+    antérieurs à la version publiée sont supprimés. Le manifeste n'est pas
+    modifié: le CSV source reste la référence s'il change ensuite.
+    """
+    directory = replacement_dir(name, data_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    out = directory / f"{version:08d}.parquet"
+    tmp = _tmp_path(out)
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="zstd")
+    os.replace(tmp, out)
+    for old in _versioned_files(directory, -1, read_version(data_dir) - 1):
+        old.unlink(missing_ok=True)
+
+
+# ============================================================================
+# TABLES DÉRIVÉES PAR EMPREINTE
+# ============================================================================
+
+def derived_dir(kind, fingerprint, data_dir=Path(".")):
+    """Dossier des tables dérivées `kind` (agrégats, cube, règles, ...) calculées pour une empreinte."""
+    return store_dir(data_dir) / kind / fingerprint
+
+
+def save_frames(kind, frames, fingerprint, data_dir=Path("."), prune=True, index=False):
+    """
+    Écrire {nom: DataFrame} sous `kind`/<empreinte> de façon atomique; les
+    autres empreintes sont supprimées (sauf `prune=False`). `index`: comme
+    DataFrame.to_parquet.
+    """
+    target = derived_dir(kind, fingerprint, data_dir)
+    tmp = _tmp_path(target)
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for name, frame in frames.items():
+        frame.to_parquet(tmp / f"{name}.parquet", index=index)
+    shutil.rmtree(target, ignore_errors=True)
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        # Même empreinte publiée entre-temps par un autre processus: contenu identique
+        shutil.rmtree(tmp, ignore_errors=True)
+    if prune:
+        prune_frames(kind, {fingerprint}, data_dir)
+
+
+def prune_frames(kind, keep, data_dir=Path(".")):
+    """Supprimer les tables dérivées `kind` des empreintes absentes de `keep` (écritures en cours épargnées)."""
+    parent = store_dir(data_dir) / kind
+    for old in parent.iterdir() if parent.is_dir() else []:
+        if old.name not in keep and old.suffix != ".tmp":
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def read_frames(kind, fingerprint, data_dir=Path(".")):
+    """Relire {nom: DataFrame} de l'empreinte, ou None s'il n'existe pas."""
+    directory = derived_dir(kind, fingerprint, data_dir)
+    if not directory.is_dir():
+        return None
+    return {path.stem: pd.read_parquet(path) for path in directory.glob("*.parquet")}
+
+
+def load_or_build_frames(kind, fingerprint, build, data_dir=Path("."), index=False, complete=None):
+    """
+    Tables dérivées de l'empreinte, calculées par `build()` et persistées au
+    besoin (ou si `complete(frames)` est faux: écrites par une version
+    précédente du code).
+    """
+    frames = read_frames(kind, fingerprint, data_dir)
+    if frames is None or (complete is not None and not complete(frames)):
+        frames = build()
+        save_frames(kind, frames, fingerprint, data_dir, index=index)
+    return frames
+
+
+def main():
+    converted = convert_all()
+    if converted:
+        print(f"✓ Tables converties: {', '.join(converted)} → {store_dir()}")
+    else:
+        print(f"✓ Stockage à jour: {store_dir()}")
+
+
+if __name__ == "__main__":
+    main()
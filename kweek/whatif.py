@@ -0,0 +1,260 @@
+"""
+Simulateur de scénarios de demande (« et si samedi prochain est pluvieux
+avec un événement ? »).
+
+Les facteurs de demande de `restaurant_daily_factors_sales.csv` sont appris
+de l'historique: température, pluie et ensoleillement sont des courbes
+facteur = f(variable météo) interpolées, les événements une distribution des
+impacts observés par type, et les événements récurrents (même jour du
+calendrier) sont repris par défaut. Les prévisions ETS de référence supposent
+une météo typique: chaque jour simulé est multiplié par
+
+    facteur météo tiré / facteur météo moyen du mois × impact événement
+
+La météo de chaque scénario est tirée parmi les jours historiques du même
+mois (climatologie, corrélations entre variables conservées), restreints à la
+condition imposée le cas échéant. Les tirages forment des tableaux NumPy
+scénarios × produits × jours; le stock (lots en main + livraisons
+habituelles) est écoulé en FEFO sur tous les scénarios à la fois, jour par
+jour, pour estimer probabilités de rupture et pertes.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+N_SCENARIOS = 2000
+DELIVERY_WEEKS = 8
+QUANTILES = (0.05, 0.5, 0.95)
+
+# Facteur → variable météo dont il dépend
+FACTOR_DRIVERS = {
+    'temperature_factor': 'temperature',
+    'rain_factor': 'precipitation',
+    'sunshine_factor': 'sunshine_hours',
+}
+# Valeurs de l'option « événement » autres qu'un type observé
+EVENT_CALENDAR = None
+NO_EVENT = "none"
+
+
+class FactorModel:
+    """Courbes des facteurs météo, impacts des événements et réservoir climatologique."""
+
+    def __init__(self, daily_factors):
+        daily = daily_factors.dropna(subset=list(FACTOR_DRIVERS.values())).reset_index(drop=True)
+        dates = pd.to_datetime(daily['date'])
+
+        self.curves = {}
+        for factor, driver in FACTOR_DRIVERS.items():
+            curve = daily.groupby(driver)[factor].mean().sort_index()
+            self.curves[factor] = (curve.index.to_numpy(dtype=float), curve.to_numpy(dtype=float))
+
+        events = daily.dropna(subset=['event_type'])
+        self.events = {
+            str(kind): group['event_impact_factor'].to_numpy(dtype=float)
+            for kind, group in events.groupby('event_type', observed=True)
+        }
+        event_dates = pd.to_datetime(events['date'])
+        self.calendar = events.groupby([event_dates.dt.month, event_dates.dt.day])['event_impact_factor'].mean().to_dict()
+
+        self.month = dates.dt.month.to_numpy()
+        self.weather = daily[list(FACTOR_DRIVERS.values())].to_numpy(dtype=float)
+        self.condition = daily['weather_condition'].astype(str).to_numpy()
+        self.conditions = sorted(set(self.condition))
+        self._multiplier = self.multiplier(self.weather)
+        self._pools = {}
+
+    def multiplier(self, weather):
+        """Produit des facteurs météo; `weather` (..., 3) = température, précipitations, ensoleillement."""
+        result = np.ones(weather.shape[:-1])
+        for j, factor in enumerate(FACTOR_DRIVERS):
+            x, y = self.curves[factor]
+            result = result * np.interp(weather[..., j], x, y)
+        return result
+
+    def pool(self, month, condition=None):
+        """Jours historiques du mois (et de la condition), à défaut de la condition seule."""
+        key = (month, condition)
+        if key not in self._pools:
+            rows = self.month == month
+            if condition is not None:
+                rows = rows & (self.condition == condition)
+                if not rows.any():
+                    rows = self.condition == condition
+            self._pools[key] = np.flatnonzero(rows) if rows.any() else np.arange(len(self.month))
+        return self._pools[key]
+
+    def typical_multiplier(self, dates):
+        """Facteur météo moyen de chaque jour (climatologie du mois): référence des prévisions."""
+        return np.array([self._multiplier[self.pool(d.month)].mean() for d in dates])
+
+    def calendar_event(self, date):
+        return self.calendar.get((date.month, date.day), 1.0)
+
+    def draw(self, dates, n, rng, overrides=None):
+        """
+        Multiplicateurs de demande (n × jours) relatifs aux prévisions de référence.
+
+        overrides: {date: {'condition': ..., 'temperature': ..., 'event': ...}};
+        'event' = type observé, NO_EVENT, ou absent (événement du calendrier).
+        """
+        overrides = overrides or {}
+        weather = np.empty((n, len(dates), len(FACTOR_DRIVERS)))
+        events = np.ones((n, len(dates)))
+        for k, date in enumerate(dates):
+            spec = overrides.get(date, {})
+            pool = self.pool(date.month, spec.get('condition'))
+            weather[:, k] = self.weather[pool[rng.integers(0, len(pool), n)]]
+            if spec.get('temperature') is not None:
+                weather[:, k, 0] = spec['temperature']
+
+            event = spec.get('event', EVENT_CALENDAR)
+            if event == EVENT_CALENDAR:
+                events[:, k] = self.calendar_event(date)
+            elif event != NO_EVENT:
+                impacts = self.events.get(event, np.ones(1))
+                events[:, k] = impacts[rng.integers(0, len(impacts), n)]
+        return self.multiplier(weather) / self.typical_multiplier(dates) * events
+
+
+def usual_deliveries(batches, start, horizon_days, weeks=DELIVERY_WEEKS):
+    """
+    Livraisons prévues en prolongeant le rythme des `weeks` dernières semaines:
+    quantité moyenne reçue par produit et jour de semaine, même durée de conservation.
+    """
+    start = pd.Timestamp(start).normalize()
+    arrival = pd.to_datetime(batches['arrival_date']).dt.normalize()
+    recent = batches[(arrival >= start - pd.Timedelta(weeks=weeks)) & (arrival < start)]
+    recent_arrival = arrival[recent.index]
+    shelf = (pd.to_datetime(recent['expiration_date']).dt.normalize() - recent_arrival).dt.days
+    names = recent['product_name'].astype(str)
+    per_weekday = recent.groupby([names, recent_arrival.dt.dayofweek])['quantity_received'].sum() / weeks
+    shelf_life = shelf.groupby(names).median()
+
+    dates = pd.date_range(start, periods=horizon_days, freq='D')
+    plan = per_weekday.rename_axis(['product_name', 'weekday']).reset_index(name='quantity')
+    plan = plan.merge(pd.DataFrame({'date': dates, 'weekday': dates.dayofweek}), on='weekday')
+    plan['expiration_date'] = plan['date'] + pd.to_timedelta(plan['product_name'].map(shelf_life), unit='D')
+    return plan[['product_name', 'date', 'quantity', 'expiration_date']].sort_values(['date', 'product_name'], ignore_index=True)
+
+
+def planned_lots(simulation, batches, start, horizon_days, weeks=DELIVERY_WEEKS):
+    """Lots restants en fin de rejeu FEFO et livraisons habituelles de l'horizon."""
+    on_hand = simulation.batch_summary()
+    on_hand = on_hand[on_hand['quantity_remaining'] > 0].rename(columns={'quantity_remaining': 'quantity'})
+    return pd.concat([
+        on_hand[['product_name', 'quantity', 'expiration_date']],
+        usual_deliveries(batches, start, horizon_days, weeks),
+    ], ignore_index=True)
+
+
+def stock_curves(lots, products, dates):
+    """
+    Cumuls arrivés A et expirés E (jours × produits) des lots: `product_name`,
+    `quantity`, `expiration_date` et `date` d'arrivée (absente = déjà en stock).
+    """
+    start = dates[0]
+    arrived = np.zeros((len(dates) + 1, len(products)))
+    expired = np.zeros((len(dates) + 1, len(products)))
+    col = pd.Categorical(lots['product_name'].astype(str), categories=products).codes
+    arrival = pd.to_datetime(lots['date']).fillna(start) if 'date' in lots.columns else pd.Series(start, index=lots.index)
+    arr = np.clip((arrival.dt.normalize() - start).dt.days.to_numpy(), 0, None)
+    exp = (pd.to_datetime(lots['expiration_date']).dt.normalize() - start).dt.days.to_numpy()
+    keep = (col >= 0) & (exp >= 0) & (arr < len(dates))
+    qty = lots['quantity'].to_numpy(dtype=float)[keep]
+    np.add.at(arrived, (arr[keep], col[keep]), qty)
+    np.add.at(expired, (np.minimum(exp[keep], len(dates)), col[keep]), qty)
+    return np.cumsum(arrived[:-1], axis=0), np.cumsum(expired[:-1], axis=0)
+
+
+@dataclass
+class ScenarioResult:
+    """Tirages de demande et issues de stock de tous les scénarios."""
+    products: list
+    dates: pd.DatetimeIndex
+    baseline: np.ndarray            # produits × jours
+    demand: np.ndarray              # scénarios × produits × jours
+    multipliers: np.ndarray         # scénarios × jours
+    lost: np.ndarray = None         # scénarios × produits × jours (ventes perdues)
+    wasted: np.ndarray = None       # scénarios × produits (pertes sur l'horizon)
+
+    def summary(self):
+        """Par produit: demande de référence et simulée, rupture et pertes."""
+        total = self.demand.sum(axis=2)
+        frame = pd.DataFrame({
+            'product_name': self.products,
+            'baseline': self.baseline.sum(axis=1),
+            'demand_mean': total.mean(axis=0),
+            'demand_p05': np.quantile(total, 0.05, axis=0),
+            'demand_p95': np.quantile(total, 0.95, axis=0),
+        })
+        if self.lost is not None:
+            lost = self.lost.sum(axis=2)
+            frame['stockout_prob'] = (lost > 0).mean(axis=0)
+            frame['lost_sales'] = lost.mean(axis=0)
+            frame['waste'] = self.wasted.mean(axis=0)
+            frame['waste_prob'] = (self.wasted > 0).mean(axis=0)
+        return frame
+
+    def daily_quantiles(self, product=None, quantiles=QUANTILES):
+        """Quantiles de la demande quotidienne d'un produit (ou du total)."""
+        if product is None:
+            draws, baseline = self.demand.sum(axis=1), self.baseline.sum(axis=0)
+        else:
+            j = self.products.index(product)
+            draws, baseline = self.demand[:, j], self.baseline[j]
+        frame = pd.DataFrame({'date': self.dates, 'baseline': baseline, 'mean': draws.mean(axis=0)})
+        for q, values in zip(quantiles, np.quantile(draws, quantiles, axis=0)):
+            frame[f'p{round(q * 100):02d}'] = values
+        return frame
+
+    def stockout_by_day(self):
+        """Probabilité de rupture par produit et par jour."""
+        if self.lost is None:
+            return None
+        return pd.DataFrame((self.lost > 0).mean(axis=0), index=self.products, columns=self.dates)
+
+
+def simulate(baseline, sigma, factors, overrides=None, lots=None, n_scenarios=N_SCENARIOS, seed=42):
+    """
+    Monte Carlo de la demande sous un scénario.
+
+    baseline: prévisions de référence (produits × jours, colonnes = dates).
+    sigma: écart-type des erreurs de prévision par produit (Series).
+    factors: FactorModel; overrides: conditions imposées par date (voir FactorModel.draw).
+    lots: lots disponibles (en stock et livraisons prévues, voir stock_curves);
+        sans lots, seules les distributions de demande sont calculées.
+    """
+    rng = np.random.default_rng(seed)
+    products = [str(p) for p in baseline.index]
+    dates = pd.DatetimeIndex(baseline.columns)
+    lam = np.clip(baseline.to_numpy(dtype=float), 0, None)
+    sd = sigma.reindex(baseline.index).fillna(0).to_numpy(dtype=float)
+
+    multipliers = factors.draw(dates, n_scenarios, rng, overrides)
+    noise = rng.standard_normal((n_scenarios, len(products), len(dates)), dtype=np.float32)
+    demand = np.maximum(multipliers[:, None, :] * (lam + sd[:, None] * noise), 0).astype(np.float32)
+    result = ScenarioResult(products, dates, lam, demand, multipliers)
+
+    if lots is not None:
+        # FEFO sur tous les scénarios: D_t = max(min(D + demande, A_t), E_t)
+        arrived, expired = stock_curves(lots, products, dates)
+        drawn = np.zeros((n_scenarios, len(products)))
+        lost = np.empty_like(demand)
+        wasted = np.zeros((n_scenarios, len(products)))
+        for k in range(len(dates)):
+            wanted = drawn + demand[:, :, k]
+            served = np.minimum(wanted, arrived[k])
+            lost[:, :, k] = wanted - served
+            drawn = np.maximum(served, expired[k])
+            wasted += drawn - served
+        result.lost, result.wasted = lost, wasted
+    return result
+
+
+def ets_sigma(state, products):
+    """Écart-type des erreurs à un pas des états Holt-Winters (hors initialisation)."""
+    dof = max(state.n_obs - 2 * state.m, 1)
+    return pd.Series(np.sqrt(state.sse / dof), index=products)
@@ -0,0 +1,126 @@
+"""
+Jeu de données synthétique minimal (mêmes fichiers et colonnes que les CSV
+du projet), écrit dans un dossier temporaire pour chaque test.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kweek import store
+
+PRODUCTS = pd.DataFrame({
+    'product_id': ['P001', 'P002', 'P003'],
+    'name': ['Fresh Salmon Fillet', 'Ribeye Steak', 'Chocolate Cake'],
+    'category': ['Seafood', 'Meat', 'Desserts'],
+    'unit_cost': [18.5, 22.0, 3.0],
+    'unit_price': [32.0, 45.0, 9.0],
+    'shelf_life': [3, 5, 4],
+    'base_demand': [25, 30, 20],
+})
+WEATHER = ['Sunny', 'Rainy', 'Overcast']
+
+
+def make_transactions(start, days, seed=0, first_id=0):
+    """Transactions de `days` jours à partir de `start` (1 à 3 lignes par transaction)."""
+    rng = np.random.default_rng(seed)
+    rows, txn = [], first_id
+    for date in pd.date_range(start, periods=days, freq="D"):
+        for _ in range(rng.integers(8, 15)):
+            txn += 1
+            client = f"CLI_{rng.integers(1, 40):04d}"
+            for i in rng.choice(len(PRODUCTS), size=rng.integers(1, 4), replace=False):
+                product = PRODUCTS.iloc[i]
+                quantity = int(rng.integers(1, 4))
+                rows.append({
+                    'transaction_id': f"TXN_{txn:07d}", 'date': date.strftime("%Y-%m-%d"),
+                    'timestamp': (date + pd.Timedelta(hours=12)).strftime("%Y-%m-%d %H:%M:%S"),
+                    'client_id': client, 'product_id': product['product_id'],
+                    'product_name': product['name'], 'category': product['category'],
+                    'quantity': quantity, 'unit_price': product['unit_price'],
+                    'total_amount': quantity * product['unit_price'],
+                })
+    return pd.DataFrame(rows)
+
+
+def make_external(dates):
+    dates = pd.DatetimeIndex(dates)
+    n = len(dates)
+    return pd.DataFrame({
+        'date': dates.strftime("%Y-%m-%d"),
+        'day_of_week': dates.dayofweek, 'day_name': dates.day_name(),
+        'is_weekend': (dates.dayofweek >= 5).astype(int),
+        'month': dates.month, 'quarter': dates.quarter,
+        'temperature': 12.0 + (np.arange(n) % 15), 'humidity': 60.0, 'precipitation': 0.0,
+        'sunshine_hours': 4.0, 'wind_speed': 10.0,
+        'weather_condition': [WEATHER[i % len(WEATHER)] for i in range(n)],
+        'event_name': None, 'event_type': None, 'event_impact_factor': 1.0,
+        'season_factor': 1.0, 'weekend_factor': 1.0, 'temperature_factor': 1.0,
+        'rain_factor': 1.0, 'sunshine_factor': 1.0, 'combined_demand_multiplier': 1.0,
+    })
+
+
+def make_daily(transactions, external):
+    """Jointure quotidienne cohérente avec les transactions."""
+    cost = transactions['product_name'].map(dict(zip(PRODUCTS['name'], PRODUCTS['unit_cost'])))
+    sales = transactions.assign(profit=transactions['total_amount'] - transactions['quantity'] * cost).groupby('date').agg(
+        num_transactions=('transaction_id', 'nunique'), total_units=('quantity', 'sum'),
+        total_revenue=('total_amount', 'sum'), total_profit=('profit', 'sum'),
+    ).reset_index()
+    daily = sales.merge(external, on='date')
+    daily['temp_bin'] = 'Cold (<15°C)'
+    daily['season'] = 'Winter'
+    return daily
+
+
+def make_inventory(start, days):
+    rows = []
+    for k, date in enumerate(pd.date_range(start, periods=max(days // 7, 1), freq="7D")):
+        for i, product in PRODUCTS.iterrows():
+            expiry = date + pd.Timedelta(days=int(product['shelf_life']))
+            rows.append({
+                'batch_id': f"BATCH_{k * len(PRODUCTS) + i + 1:05d}", 'product_id': product['product_id'],
+                'product_name': product['name'], 'category': product['category'],
+                'arrival_date': date.strftime("%Y-%m-%d"), 'arrival_timestamp': f"{date:%Y-%m-%d} 06:00:00",
+                'quantity_received': 50, 'quantity_available': 20, 'unit_cost': product['unit_cost'],
+                'total_cost': 50 * product['unit_cost'], 'expiration_date': expiry.strftime("%Y-%m-%d"),
+                'expiration_time': f"{expiry:%Y-%m-%d} 23:59:00", 'shelf_life_days': product['shelf_life'],
+                'days_until_expiry': product['shelf_life'], 'status': 'Normal',
+                'storage_temp_required': 'Refrigerated', 'supplier_id': 'SUP_001',
+            })
+    return pd.DataFrame(rows)
+
+
+def write_data_dir(path, start="2024-01-01", days=60, seed=0):
+    """Écrire les six CSV sources dans `path`; retourne `path`."""
+    path.mkdir(parents=True, exist_ok=True)
+    transactions = make_transactions(start, days, seed)
+    external = make_external(pd.date_range(start, periods=days + 30, freq="D"))
+    transactions.to_csv(path / "restaurant_sales_transactions.csv", index=False)
+    external.to_csv(path / "restaurant_external_factors.csv", index=False)
+    make_daily(transactions, external).to_csv(path / "restaurant_daily_factors_sales.csv", index=False)
+    PRODUCTS.to_csv(path / "restaurant_products.csv", index=False)
+    pd.DataFrame({
+        'client_id': [f"CLI_{i:04d}" for i in range(1, 40)], 'segment': 'Regular',
+        'avg_spend': 50.0, 'first_visit': start, 'loyalty_points': 0,
+    }).to_csv(path / "restaurant_clients.csv", index=False)
+    make_inventory(start, days).to_csv(path / "restaurant_stock_inventory.csv", index=False)
+    return path
+
+
+def shuffle_transactions(data_dir, seed=1):
+    """Mélanger les lignes du CSV des transactions (fichier non trié par date), puis reconvertir."""
+    path = data_dir / store.TABLES['transactions'].csv
+    pd.read_csv(path).sample(frac=1.0, random_state=seed).to_csv(path, index=False)
+    store.convert_all(data_dir)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return write_data_dir(tmp_path / "data")
+
+
+@pytest.fixture
+def make_data_dir(tmp_path):
+    """Fabrique de dossiers de données: make_data_dir("paris", days=90, seed=1)."""
+    return lambda name="data", **kwargs: write_data_dir(tmp_path / name, **kwargs)
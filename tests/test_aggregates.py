@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from kweek import aggregates, ingest, store
+
+
+@pytest.fixture
+def cube(make_data_dir):
+    data_dir = make_data_dir(start="2024-01-17", days=100)
+    fp = store.fingerprint(data_dir=data_dir)
+    aggs = ingest.load_or_build_aggregates(fp, data_dir)
+    cube = aggregates.load_or_build_cube(aggs, store.read_table("daily", data_dir=data_dir), fp, data_dir)
+    transactions = pd.read_csv(data_dir / store.TABLES['transactions'].csv, parse_dates=['date'])
+    return cube, transactions
+
+
+def _buckets(transactions, start_of):
+    """Sommes par seau (début de semaine ou de mois) calculées directement sur les transactions."""
+    return transactions.groupby(start_of(transactions['date'])).agg(
+        total_revenue=('total_amount', 'sum'), total_units=('quantity', 'sum'),
+    ).rename_axis('date')
+
+
+def _trend(cube, table):
+    return cube[table].assign(date=pd.to_datetime(cube[table]['date'])).set_index('date')[aggregates.TREND_COLUMNS]
+
+
+def test_by_day_matches_transactions(cube):
+    cube, transactions = cube
+    expected = _buckets(transactions, lambda d: d)
+    by_day = cube['by_day'].assign(date=pd.to_datetime(cube['by_day']['date'])).set_index('date')
+    pd.testing.assert_frame_equal(
+        by_day.rename(columns={'total_amount': 'total_revenue', 'quantity': 'total_units'})[aggregates.TREND_COLUMNS],
+        expected, check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("table, start_of", [
+    ('by_week', lambda d: d - pd.to_timedelta(d.dt.dayofweek, unit='D')),
+    ('by_month', lambda d: d.dt.to_period('M').dt.to_timestamp()),
+])
+def test_trend_buckets_match_daily_totals(cube, table, start_of):
+    cube, transactions = cube
+    by_day = cube['by_day'].assign(date=pd.to_datetime(cube['by_day']['date'])).set_index('date')
+    resampled = by_day.resample(aggregates.TREND_RESOLUTIONS[table], label='left', closed='left')[
+        ['total_amount', 'quantity']].sum().rename(columns={'total_amount': 'total_revenue', 'quantity': 'total_units'})
+
+    trend = _trend(cube, table)
+    pd.testing.assert_frame_equal(trend, resampled, check_dtype=False, check_freq=False)
+    pd.testing.assert_frame_equal(trend, _buckets(transactions, start_of), check_dtype=False, check_freq=False)
+    assert trend['total_revenue'].sum() == pytest.approx(cube['kpis']['total_sales'].iloc[0])
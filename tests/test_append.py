@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+
+from kweek import append, ingest, store
+from kweek.forecast_service import ForecastService
+from kweek.model_registry import ModelRegistry
+from kweek.product_index import ProductIndex
+
+from conftest import make_transactions
+
+
+def _batch(date, seed, data_dir):
+    first_id = store.row_count("transactions", data_dir) + 1
+    return make_transactions(date, 1, seed=seed, first_id=first_id)
+
+
+def _assert_consistent(data_dir):
+    """Agrégats publiés = ingestion complète; jointure quotidienne = transactions."""
+    fp = store.fingerprint(data_dir=data_dir)
+    published = ingest.read_aggregates(fp, data_dir)
+    rebuilt = ingest.ingest_transactions(data_dir)
+    for name in ('daily', 'daily_product', 'monthly_product'):
+        left = published[name].sort_values(append.MERGE_KEYS[name], ignore_index=True)
+        right = rebuilt[name].sort_values(append.MERGE_KEYS[name], ignore_index=True)
+        for key in append.MERGE_KEYS[name]:
+            left[key], right[key] = left[key].astype(str), right[key].astype(str)
+        pd.testing.assert_frame_equal(left, right[left.columns], check_dtype=False)
+
+    transactions = store.read_table("transactions", data_dir=data_dir)
+    daily = store.read_table("daily", data_dir=data_dir).set_index('date')
+    by_day = transactions.groupby('date').agg(total_revenue=('total_amount', 'sum'),
+                                              num_transactions=('transaction_id', 'nunique'))
+    pd.testing.assert_series_equal(daily['total_revenue'].reindex(by_day.index), by_day['total_revenue'],
+                                   check_dtype=False)
+    pd.testing.assert_series_equal(daily['num_transactions'].reindex(by_day.index), by_day['num_transactions'],
+                                   check_dtype=False)
+
+
+def test_append_new_day_keeps_aggregates_consistent(data_dir):
+    ingest.load_or_build_aggregates(store.fingerprint(data_dir=data_dir), data_dir)
+    last = store.read_table("daily", data_dir=data_dir)['date'].max()
+    for k in range(2):
+        batch = _batch(last + pd.Timedelta(days=k + 1), seed=20 + k, data_dir=data_dir)
+        assert append.append_transactions(batch, data_dir) == k + 1
+    _assert_consistent(data_dir)
+    assert len(list(ingest.aggregates_dir("", data_dir).iterdir())) == 1
+
+
+def test_interrupted_append_is_invisible_and_retry_counts_once(data_dir, monkeypatch):
+    fp = store.fingerprint(data_dir=data_dir)
+    ingest.load_or_build_aggregates(fp, data_dir)
+    daily = store.read_table("daily", data_dir=data_dir)
+    batch = _batch(daily['date'].max(), seed=30, data_dir=data_dir)  # ventes du dernier jour existant
+
+    def crash(*args, **kwargs):
+        raise OSError("disque plein")
+
+    with monkeypatch.context() as m:
+        m.setattr(store, "write_version", crash)
+        with pytest.raises(OSError):
+            append.append_transactions(batch, data_dir)
+
+    # Rien n'est publié: même empreinte, mêmes tables
+    assert store.fingerprint(data_dir=data_dir) == fp
+    pd.testing.assert_frame_equal(store.read_table("daily", data_dir=data_dir), daily)
+    assert ingest.read_aggregates(fp, data_dir) is not None
+
+    assert append.append_transactions(batch, data_dir) == 1
+    _assert_consistent(data_dir)
+
+
+def test_rows_on_existing_last_day_refresh_ets_states(data_dir, tmp_path):
+    fp = store.fingerprint(data_dir=data_dir)
+    registry = ModelRegistry(tmp_path / "models")
+    before = ProductIndex(ingest.load_or_build_aggregates(fp, data_dir)['daily_product']).daily_matrix
+    registry.ets_states(before)
+
+    last = before.index[-1]
+    append.append_transactions(_batch(last, seed=40, data_dir=data_dir), data_dir)
+    after = ProductIndex(ingest.read_aggregates(store.fingerprint(data_dir=data_dir), data_dir)['daily_product']).daily_matrix
+    assert after.index[-1] == last and not after.equals(before)
+
+    state = registry.ets_states(after)
+    expected = ModelRegistry(tmp_path / "fresh").ets_states(after)
+    pd.testing.assert_series_equal(pd.Series(state.level), pd.Series(expected.level))
+
+
+def test_rows_on_existing_last_day_refresh_random_forest(data_dir, tmp_path):
+    def service(registry):
+        fp = store.fingerprint(data_dir=data_dir)
+        matrix = ProductIndex(ingest.load_or_build_aggregates(fp, data_dir)['daily_product']).daily_matrix
+        return ForecastService(matrix, store.read_table("daily", data_dir=data_dir), registry=registry), fp
+
+    registry = ModelRegistry(tmp_path / "models")
+    before, fp = service(registry)
+    product = before.matrix.columns[0]
+    stale = before.forecast(product, "rf", 7, fp)
+
+    last = before.matrix.index[-1]
+    append.append_transactions(_batch(last, seed=41, data_dir=data_dir), data_dir)
+    after, fp = service(registry)
+    assert after.matrix.index[-1] == last and not after.matrix[product].equals(before.matrix[product])
+
+    fresh, _ = service(ModelRegistry(tmp_path / "fresh"))
+    result = after.forecast(product, "rf", 7, fp)
+    pd.testing.assert_frame_equal(result, fresh.forecast(product, "rf", 7, fp))
+    assert not result['yhat'].equals(stale['yhat'])
@@ -0,0 +1,40 @@
+import threading
+
+import pandas as pd
+
+from kweek import backtest
+
+
+def test_runner_computes_in_background_once(tmp_path, monkeypatch):
+    release, calls = threading.Event(), []
+    metrics = pd.DataFrame({'model': ["ets"], 'product_name': ["Chocolate Cake"], 'rmse': [1.0]})
+
+    def slow_backtest(daily_matrix, daily_factors, **kwargs):
+        calls.append(1)
+        release.wait(10)
+        return metrics
+
+    monkeypatch.setattr(backtest, "run_backtest", slow_backtest)
+    runner = backtest.BacktestRunner()
+    assert runner.find("fp") is None
+
+    job = runner.submit(None, None, "fp", tmp_path)
+    assert not job.done()
+    assert runner.submit(None, None, "fp", tmp_path) is job
+    assert backtest.read_backtest("fp", tmp_path) is None
+
+    release.set()
+    pd.testing.assert_frame_equal(job.result(timeout=10), metrics)
+    assert runner.find("fp") is job and len(calls) == 1
+    pd.testing.assert_frame_equal(backtest.read_backtest("fp", tmp_path), metrics)
+
+
+def test_failed_backtest_can_be_resubmitted(tmp_path, monkeypatch):
+    def failing(daily_matrix, daily_factors, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(backtest, "run_backtest", failing)
+    runner = backtest.BacktestRunner()
+    job = runner.submit(None, None, "fp", tmp_path)
+    assert isinstance(job.exception(timeout=10), RuntimeError)
+    assert runner.submit(None, None, "fp", tmp_path) is not job
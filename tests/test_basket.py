@@ -0,0 +1,43 @@
+from collections import Counter
+from itertools import combinations
+
+import pandas as pd
+import pytest
+
+from kweek import basket, store
+
+from conftest import PRODUCTS, shuffle_transactions
+
+
+def _naive_counts(data_dir, size):
+    """Co-occurrences par panier (transaction_id), comptées une à une."""
+    transactions = store.read_table("transactions", data_dir=data_dir)
+    counter = Counter()
+    for products in transactions.groupby('transaction_id', observed=True)['product_name']:
+        counter.update(combinations(sorted(set(products[1].astype(str))), size))
+    return {key: n for key, n in counter.items() if n >= basket.MIN_COUNT}
+
+
+def _rule_counts(rules, columns):
+    return {tuple(sorted(row[:-1])): row[-1] for row in rules[[*columns, 'co_count']].itertuples(index=False)}
+
+
+@pytest.mark.parametrize("shuffled", [False, True])
+@pytest.mark.parametrize("batch_size", [37, 1000])
+def test_counts_match_naive_baskets(data_dir, shuffled, batch_size):
+    if shuffled:
+        shuffle_transactions(data_dir)
+    rules = basket.build_basket(PRODUCTS['name'].tolist(), data_dir, batch_size=batch_size)
+
+    assert _rule_counts(rules['pairs'], ['product_a', 'product_b']) == _naive_counts(data_dir, 2)
+    assert _rule_counts(rules['triples'], ['product_a', 'product_b', 'product_c']) == _naive_counts(data_dir, 3)
+    n_baskets = store.read_table("transactions", data_dir=data_dir)['transaction_id'].nunique()
+    assert rules['summary']['n_baskets'].iloc[0] == n_baskets
+
+
+def test_unsorted_batches_are_detected():
+    day = pd.DataFrame({'transaction_id': ['T1'], 'date': pd.to_datetime(['2024-01-02']), 'product_name': ['A']})
+    later = day.assign(date=pd.Timestamp('2024-01-03'), transaction_id='T2')
+    assert len(list(basket.complete_days([day, later]))) == 2
+    with pytest.raises(basket.UnsortedBatches):
+        list(basket.complete_days([day, later, day]))
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kweek import aggregates, downsample
+
+
+def _series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(rng.normal(100, 20, n), index=pd.date_range("2022-01-01", periods=n, freq="D"))
+
+
+def test_lttb_keeps_ends_and_spikes():
+    series = _series(5000)
+    series.iloc[1234] = 10_000
+    series.iloc[4321] = -10_000
+    reduced = downsample.downsample(series, 200, "lttb")
+    assert len(reduced) == 200
+    assert reduced.index.is_monotonic_increasing
+    assert reduced.index[0] == series.index[0] and reduced.index[-1] == series.index[-1]
+    assert reduced.max() == 10_000 and reduced.min() == -10_000
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    series = _series(5000, seed=1)
+    reduced = downsample.downsample(series, 200, "minmax")
+    assert len(reduced) <= 200
+    assert reduced.index.is_monotonic_increasing
+    edges = np.linspace(0, len(series), 101).astype(int)
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        bucket = series.iloc[lo:hi]
+        assert bucket.max() in reduced.values and bucket.min() in reduced.values
+
+
+def test_short_series_is_unchanged_and_method_checked():
+    series = _series(50)
+    assert downsample.downsample(series, 100) is series
+    with pytest.raises(ValueError):
+        downsample.downsample(_series(500), 100, "mean")
+
+
+@pytest.mark.parametrize("table", list(aggregates.TREND_RESOLUTIONS))
+def test_bucket_window_keeps_the_first_partial_bucket(table):
+    freq = aggregates.TREND_RESOLUTIONS[table]
+    daily = pd.DataFrame({'date': pd.date_range("2024-01-03", "2024-06-20", freq="D")})
+    daily['total_revenue'] = np.arange(len(daily), dtype=float)
+    buckets = daily.resample(freq, on='date', label='left', closed='left')['total_revenue'].sum()
+
+    # Période commençant en cours de semaine/de mois: le seau qui la contient reste affiché
+    start, end = pd.Timestamp("2024-01-03"), pd.Timestamp("2024-06-20")
+    shown = downsample.window(buckets, start, end, freq)
+    assert shown.index[0] <= start
+    assert shown.sum() == daily['total_revenue'].sum()
+    assert downsample.window(buckets, "2024-02-14", end, freq).index[0] <= pd.Timestamp("2024-02-14")
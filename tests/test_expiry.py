@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kweek.expiry import ExpiryIndex
+
+
+def _batches(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    arrival = pd.Timestamp("2024-03-01") + pd.to_timedelta(rng.integers(0, 60, n), unit="D")
+    shelf_life = rng.choice([1, 2, 3, 5, 7, 14], n)
+    return pd.DataFrame({
+        'batch_id': [f"B{i:04d}" for i in range(n)],
+        'product_name': rng.choice(["Fresh Salmon Fillet", "Ribeye Steak", "Chocolate Cake"], n),
+        'arrival_date': arrival,
+        'expiration_date': arrival + pd.to_timedelta(shelf_life, unit="D"),
+        'quantity_available': rng.integers(1, 50, n),
+        'unit_cost': rng.uniform(2, 20, n).round(2),
+    })
+
+
+def _in_stock(batches, as_of):
+    """Filtre direct: arrivé au plus tard D, pas encore expiré, jours restants."""
+    as_of = pd.Timestamp(as_of)
+    stock = batches[(batches['arrival_date'] <= as_of) & (batches['expiration_date'] >= as_of)]
+    return stock.assign(remaining=(stock['expiration_date'] - as_of).dt.days)
+
+
+AS_OF = ["2024-02-20", "2024-03-01", "2024-03-17", "2024-04-15", "2024-05-30"]
+
+
+@pytest.mark.parametrize("as_of", AS_OF)
+@pytest.mark.parametrize("days", [0, 1, 3, 7, np.inf])
+def test_window_matches_brute_force(as_of, days):
+    batches = _batches()
+    index = ExpiryIndex(batches)
+    expected = _in_stock(batches, as_of)
+    expected = expected[expected['remaining'] <= days]
+
+    result = index.window(as_of, days)
+    assert result['lots'] == len(expected)
+    assert result['quantity'] == pytest.approx(expected['quantity_available'].sum())
+    assert result['value'] == pytest.approx((expected['quantity_available'] * expected['unit_cost']).sum())
+    assert sorted(index.lots(as_of, days)['batch_id']) == sorted(expected['batch_id'])
+
+
+@pytest.mark.parametrize("as_of", AS_OF)
+def test_histogram_matches_brute_force(as_of):
+    batches = _batches(seed=1)
+    histogram = ExpiryIndex(batches).histogram(as_of, max_days=10).set_index('days_until_expiry')
+    stock = _in_stock(batches, as_of)
+    expected = stock[stock['remaining'] <= 10].groupby('remaining').agg(
+        lots=('batch_id', 'size'), quantity=('quantity_available', 'sum'),
+    ).reindex(range(11), fill_value=0)
+
+    np.testing.assert_array_equal(histogram['lots'], expected['lots'])
+    np.testing.assert_allclose(histogram['quantity'], expected['quantity'])
@@ -0,0 +1,38 @@
+import time
+import zipfile
+
+import pandas as pd
+
+from kweek import export
+
+
+def _frame():
+    return pd.DataFrame({
+        'month': pd.period_range("2024-01", periods=3, freq="M"),
+        'bucket': pd.interval_range(0, 3),
+        'revenue': [1.5, None, 3.0],
+        'date': pd.to_datetime(["2024-01-01", None, "2024-03-01"]),
+    })
+
+
+def test_excel_writes_periods_and_intervals_as_text(tmp_path):
+    path = tmp_path / "out.xlsx"
+    export.write_excel({'Ventes': _frame()}, path)
+    with zipfile.ZipFile(path) as zf:
+        strings = zf.read("xl/worksheets/sheet1.xml").decode()
+    assert "2024-01" in strings and "(0, 1]" in strings
+
+
+def test_rows_are_native_values():
+    rows = list(export._rows(_frame()))
+    assert rows[0][0] == "2024-01" and rows[1][2] is None and rows[1][3] is None
+
+
+def test_prune_keeps_current_and_previous_versions(tmp_path):
+    engine = export.ExportEngine(tmp_path / "exports")
+    sources = {'Ventes': _frame}
+    for version in ("v1", "v2", "v3"):
+        engine.submit(sources, ["Ventes"], "CSV", version).result()
+        time.sleep(0.01)
+    assert sorted(d.name for d in (tmp_path / "exports").iterdir()) == ["v2", "v3"]
+    assert engine.find(["Ventes"], "CSV", "v2").result().exists()
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kweek.fefo import FEFOSimulation
+
+SHELF_LIFE = {'Fresh Salmon Fillet': 3, 'Chocolate Cake': 5}
+
+
+def _data(days=40, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-03-01", periods=days, freq="D")
+    batches = []
+    for product, life in SHELF_LIFE.items():
+        for i, arrival in enumerate(dates[::4]):
+            batches.append({
+                'batch_id': f"{product[:3]}-{i}", 'product_name': product,
+                'arrival_date': arrival, 'expiration_date': arrival + pd.Timedelta(days=life),
+                'quantity_received': int(rng.integers(10, 40)),
+            })
+    sales = pd.DataFrame([
+        {'date': d, 'product_name': p, 'quantity': int(rng.integers(0, 12))}
+        for d in dates for p in SHELF_LIFE
+    ])
+    return pd.DataFrame(batches), sales, dates
+
+
+def _reference(batches, sales, dates):
+    """Rejeu lot par lot: ventes sur le lot qui expire le premier, reliquat perdu à l'expiration."""
+    left = {b: 0.0 for b in batches['batch_id']}
+    lots = batches.sort_values(['expiration_date', 'arrival_date'])
+    demand = sales.set_index(['date', 'product_name'])['quantity']
+    opening, days = {}, []
+    for day in dates:
+        for b in lots.loc[lots['arrival_date'] == day, 'batch_id']:
+            left[b] = float(batches.set_index('batch_id').loc[b, 'quantity_received'])
+        opening[day] = dict(left)
+        for product in SHELF_LIFE:
+            want, sold = float(demand.get((day, product), 0)), 0.0
+            for b in lots.loc[lots['product_name'] == product, 'batch_id']:
+                take = min(left[b], want - sold)
+                left[b] -= take
+                sold += take
+            expiring = lots.loc[(lots['product_name'] == product) & (lots['expiration_date'] == day), 'batch_id']
+            wasted = sum(left[b] for b in expiring)
+            for b in expiring:
+                left[b] = 0.0
+            stock = sum(left[b] for b in lots.loc[lots['product_name'] == product, 'batch_id'])
+            days.append({'date': day, 'product_name': product, 'sold': sold, 'wasted': wasted, 'stock': stock})
+    return pd.DataFrame(days), opening, left
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_simulation_matches_lot_by_lot_replay(seed):
+    batches, sales, dates = _data(seed=seed)
+    simulation = FEFOSimulation(batches, sales, end=dates[-1])
+    expected, opening, final = _reference(batches, sales, dates)
+
+    daily = simulation.daily().merge(expected, on=['date', 'product_name'], suffixes=('', '_ref'))
+    assert len(daily) == len(expected)
+    for column in ('sold', 'wasted', 'stock'):
+        np.testing.assert_allclose(daily[column], daily[f'{column}_ref'], err_msg=column)
+    np.testing.assert_allclose(daily['demand'], daily['sold'] + daily['lost_sales'])
+
+    for day in dates[::7]:
+        remaining = simulation.remaining(day).set_axis(simulation.batches['batch_id'])
+        np.testing.assert_allclose(remaining, [opening[day][b] for b in remaining.index])
+
+    summary = simulation.batch_summary().set_index('batch_id')
+    np.testing.assert_allclose(summary['quantity_remaining'], [final[b] for b in summary.index])
+    np.testing.assert_allclose(
+        summary['quantity_sold'] + summary['quantity_wasted'] + summary['quantity_remaining'],
+        summary['quantity_received'],
+    )
+    assert summary['quantity_wasted'].sum() == pytest.approx(expected['wasted'].sum())
@@ -0,0 +1,58 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from kweek.forecast_service import ForecastService
+from kweek.model_registry import ModelRegistry
+
+
+def _service(tmp_path):
+    index = pd.date_range("2024-01-01", periods=120, freq="D")
+    rng = np.random.default_rng(0)
+    matrix = pd.DataFrame({'A': 10 + np.tile(np.arange(7), 18)[:120] + rng.normal(0, 1, 120)}, index=index)
+    daily = pd.DataFrame({'date': index, 'temperature': 15.0, 'humidity': 60.0, 'precipitation': 0.0,
+                          'sunshine_hours': 4.0, 'event_impact_factor': 1.0})
+    return ForecastService(matrix, daily, registry=ModelRegistry(tmp_path))
+
+
+def test_slow_model_falls_back_within_budget(tmp_path):
+    service = _service(tmp_path)
+    release = threading.Event()
+    compute = service._compute
+
+    def slow_compute(product, model, horizon_days):
+        if model == "rf":
+            release.wait(10)
+        return compute(product, model, horizon_days)
+
+    service._compute = slow_compute
+    result = service.forecast_within_budget("A", "rf", 14, "v1", budget_ms=50)
+    assert result.fallback and result.model == "ets"
+    assert len(result.frame) == 14
+
+    # Le Random Forest se termine en arrière-plan puis est servi depuis le cache
+    pending = service._pending[("A", "rf", 14, "v1")]
+    release.set()
+    pending.result(timeout=60)
+    result = service.forecast_within_budget("A", "rf", 14, "v1", budget_ms=50)
+    assert not result.fallback and result.model == "rf" and result.latency_ms == 0.0
+
+
+def test_latency_is_reported_per_call(tmp_path):
+    service = _service(tmp_path)
+    first = service.forecast_within_budget("A", "ets", 7, "v1")
+    second = service.forecast_within_budget("A", "ets", 7, "v1")
+    assert first.latency_ms > 0 and second.latency_ms == 0.0
+    pd.testing.assert_frame_equal(first.frame, service.forecast("A", "ets", 7, "v1"))
+
+
+def test_services_share_one_background_pool(tmp_path):
+    def pool_threads():
+        return [t for t in threading.enumerate() if t.name.startswith("forecast")]
+
+    # Services gardés en vie (cache de l'application, une version des données chacun)
+    services = [_service(tmp_path / str(k)) for k in range(5)]
+    for k, service in enumerate(services):
+        service.forecast_within_budget("A", "ets", 7, f"v{k}")
+    assert len(pool_threads()) <= 2
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+from kweek import holt_winters as hw
+
+ALPHA, BETA, GAMMA = 0.3, 0.05, 0.1
+
+
+def _series(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return 50 + 0.2 * t + 10 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 3, n)
+
+
+def _statsmodels(y):
+    level, trend, season = hw.initial_state(y[None, :])
+    return ExponentialSmoothing(
+        y, trend="add", seasonal="add", seasonal_periods=hw.SEASONAL_PERIODS, initialization_method="known",
+        initial_level=level[0], initial_trend=trend[0], initial_seasonal=season[0],
+    ).fit(smoothing_level=ALPHA, smoothing_trend=BETA, smoothing_seasonal=GAMMA, optimized=False)
+
+
+def test_kernel_matches_statsmodels():
+    y = _series()
+    state = hw.fit(y[None, :], alphas=(ALPHA,), betas=(BETA,), gammas=(GAMMA,))
+    reference = _statsmodels(y)
+
+    np.testing.assert_allclose(hw.residuals(y[None, :], state)[0], y - reference.fittedvalues, atol=1e-9)
+    assert state.level[0] == pytest.approx(reference.level[-1])
+    assert state.trend[0] == pytest.approx(reference.trend[-1])
+    # Saisons par case t % m; statsmodels les range dans l'ordre des jours
+    slots = np.arange(len(y) - hw.SEASONAL_PERIODS, len(y)) % hw.SEASONAL_PERIODS
+    np.testing.assert_allclose(state.season[0][slots], reference.season[-hw.SEASONAL_PERIODS:])
+
+    h = np.arange(1, 15)
+    expected = reference.level[-1] + reference.trend[-1] * h + reference.season[-hw.SEASONAL_PERIODS:][(h - 1) % 7]
+    np.testing.assert_allclose(hw.forecast(state, 14)[0], expected)
+
+
+def test_update_continues_the_recursion():
+    Y = np.stack([_series(seed=s) for s in range(3)])
+    grid = dict(alphas=(ALPHA,), betas=(BETA,), gammas=(GAMMA,))
+    full = hw.fit(Y, **grid)
+    advanced = hw.update(hw.fit(Y[:, :100], **grid), Y[:, 100:])
+    assert advanced.n_obs == full.n_obs
+    np.testing.assert_allclose(hw.forecast(advanced, 10), hw.forecast(full, 10))
+
+
+def test_grid_search_picks_parameters_per_series():
+    Y = np.stack([_series(seed=1), np.r_[np.full(60, 10.0), np.full(60, 40.0)] + np.tile(np.arange(7), 18)[:120]])
+    state = hw.fit(Y)
+    for i in range(len(Y)):
+        single = hw.fit(Y[i:i + 1], alphas=(state.alpha[i],), betas=(state.beta[i],), gammas=(state.gamma[i],))
+        assert single.sse[0] == pytest.approx(state.sse[i])
+        assert state.sse[i] <= hw.fit(Y[i:i + 1], alphas=(0.5,), betas=(0.1,), gammas=(0.3,)).sse[0] + 1e-9
+    with pytest.raises(ValueError):
+        hw.fit(Y[:, :10])
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from kweek import ingest, store
+
+from conftest import shuffle_transactions
+
+
+def _expected(data_dir):
+    transactions = store.read_table("transactions", data_dir=data_dir)
+    return transactions.groupby('date')['transaction_id'].nunique()
+
+
+@pytest.mark.parametrize("batch_size", [37, 1000, store.CHUNK_ROWS])
+def test_sorted_file_counts_distinct_transactions(data_dir, batch_size):
+    frames = ingest.ingest_transactions(data_dir, batch_size=batch_size)
+    counts = frames['daily'].set_index('date')['num_transactions']
+    pd.testing.assert_series_equal(counts, _expected(data_dir), check_names=False, check_index_type=False)
+
+
+@pytest.mark.parametrize("batch_size", [37, 1000])
+def test_unsorted_file_counts_each_transaction_once(data_dir, batch_size):
+    shuffle_transactions(data_dir)
+
+    frames = ingest.ingest_transactions(data_dir, batch_size=batch_size)
+    counts = frames['daily'].set_index('date')['num_transactions']
+    pd.testing.assert_series_equal(counts, _expected(data_dir), check_names=False, check_index_type=False)
+    assert frames['daily']['n_lines'].sum() == store.row_count("transactions", data_dir)
+
+
+def test_out_of_order_is_detected():
+    aggs = ingest.TransactionAggregates()
+    day = pd.DataFrame({'transaction_id': ['T1'], 'date': ['2024-01-02'], 'product_name': ['A'],
+                        'category': ['X'], 'quantity': [1], 'total_amount': [1.0]})
+    aggs.add(day)
+    aggs.add(day.assign(date='2024-01-03', transaction_id='T2'))
+    assert not aggs.out_of_order
+    aggs.add(day)
+    assert aggs.out_of_order
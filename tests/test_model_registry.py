@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kweek import holt_winters
+from kweek.model_registry import ModelRegistry
+
+
+def _matrix(days=120, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=days, freq="D")
+    weekly = np.tile([8, 9, 10, 11, 14, 18, 16], days // 7 + 1)[:days]
+    return pd.DataFrame({p: weekly + rng.normal(0, 1.5, days) for p in ("A", "B")}, index=index)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Produits réajustés / avancés par holt_winters à chaque appel du registre."""
+    calls = {'fit': [], 'update': []}
+    fit, update = holt_winters.fit, holt_winters.update
+
+    def counting_fit(Y, *args, **kwargs):
+        calls['fit'].append(len(Y))
+        return fit(Y, *args, **kwargs)
+
+    def counting_update(state, Y_new):
+        calls['update'].append(Y_new.shape)
+        return update(state, Y_new)
+
+    monkeypatch.setattr(holt_winters, "fit", counting_fit)
+    monkeypatch.setattr(holt_winters, "update", counting_update)
+    return calls
+
+
+def test_new_days_advance_state_without_refit(tmp_path, calls):
+    full = _matrix()
+    ModelRegistry(tmp_path).ets_states(full.iloc[:100])
+    state = ModelRegistry(tmp_path).ets_states(full)
+    assert calls['fit'] == [2]
+    assert calls['update'] == [(2, 20)]
+    # Même état qu'un ajustement complet avec les paramètres retenus
+    refit = holt_winters.update(ModelRegistry(tmp_path / "other").ets_states(full.iloc[:100]),
+                                full.iloc[100:].to_numpy().T)
+    np.testing.assert_allclose(state.level, refit.level)
+
+
+def test_unchanged_history_is_reused(tmp_path, calls):
+    matrix = _matrix()
+    first = ModelRegistry(tmp_path).ets_states(matrix)
+    second = ModelRegistry(tmp_path).ets_states(matrix)
+    assert calls['fit'] == [2] and calls['update'] == []
+    np.testing.assert_array_equal(first.level, second.level)
+
+
+def test_rewritten_history_same_range_refits(tmp_path, calls):
+    matrix = _matrix()
+    ModelRegistry(tmp_path).ets_states(matrix)
+    rewritten = matrix.copy()
+    rewritten.iloc[50, 0] += 25
+    ModelRegistry(tmp_path).ets_states(rewritten)
+    assert calls['fit'] == [2, 1]  # seul le produit modifié
+
+
+def test_rewritten_history_before_new_days_refits(tmp_path, calls):
+    full = _matrix()
+    ModelRegistry(tmp_path).ets_states(full.iloc[:100])
+    rewritten = full.copy()
+    rewritten.iloc[99, 1] += 10  # ventes ajoutées au dernier jour déjà vu
+    ModelRegistry(tmp_path).ets_states(rewritten)
+    assert calls['fit'] == [2, 1]
+    assert calls['update'] == [(1, 20)]
+
+
+@pytest.mark.parametrize("window", [slice(7, None), slice(None, 90)])
+def test_new_start_or_truncated_history_refits(tmp_path, calls, window):
+    matrix = _matrix()
+    ModelRegistry(tmp_path).ets_states(matrix)
+    ModelRegistry(tmp_path).ets_states(matrix.iloc[window])
+    assert calls['fit'] == [2, 2]
+
+
+def test_get_or_fit_keys_on_range_and_features(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    fits = []
+
+    def fit():
+        fits.append(1)
+        return {'n': len(fits)}
+
+    assert registry.get_or_fit("rf", "A", ["x"], "2024-01-01", "2024-03-01", fit) == {'n': 1}
+    assert registry.get_or_fit("rf", "A", ["x"], "2024-01-01", "2024-03-01", fit) == {'n': 1}
+    assert registry.get_or_fit("rf", "A", ["x"], "2024-01-01", "2024-03-02", fit) == {'n': 2}
+    assert registry.get_or_fit("rf", "A", ["x", "y"], "2024-01-01", "2024-03-02", fit) == {'n': 3}
+    # Une seule version par (type, produit, variables)
+    assert len(list(tmp_path.glob("rf_*.joblib"))) == 2
+
+
+def test_get_or_fit_refits_when_training_data_changes(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    fits = []
+
+    def fit():
+        fits.append(1)
+        return len(fits)
+
+    assert registry.get_or_fit("rf", "A", ["x"], "2024-01-01", "2024-03-01", fit, digest="d1") == 1
+    assert registry.get_or_fit("rf", "A", ["x"], "2024-01-01", "2024-03-01", fit, digest="d1") == 1
+    # Même plage, données réécrites: nouveau modèle, l'ancien est supprimé
+    assert registry.get_or_fit("rf", "A", ["x"], "2024-01-01", "2024-03-01", fit, digest="d2") == 2
+    assert len(list(tmp_path.glob("rf_*.joblib"))) == 1
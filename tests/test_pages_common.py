@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+import streamlit as st
+
+from kweek import refresh, sites, store
+from kweek.pages import common
+from kweek.product_index import ProductIndex
+
+from conftest import PRODUCTS
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Caches Streamlit indexés par empreinte: rien ne doit venir d'un autre test
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+@pytest.fixture
+def two_sites(tmp_path, make_data_dir, monkeypatch):
+    root = tmp_path / "root"
+    # Mêmes produits et mêmes dates, ventes différentes
+    sites.add_site("paris", make_data_dir("paris_src", days=70, seed=1), root)
+    sites.add_site("lyon", make_data_dir("lyon_src", days=70, seed=2), root)
+    monkeypatch.setattr(common, "DATA_DIR", root)
+    return root
+
+
+def test_sites_do_not_share_fitted_models(two_sites):
+    forecasts = {}
+    for site in ("paris", "lyon"):
+        fp = common.open_site(site)
+        data = common.PageData(fp)
+        index = ProductIndex(data['sales']['daily_product'])
+        service = common.get_forecast_service(fp, index.daily_matrix, data['daily'])
+        assert service.registry.root == sites.site_dir(site, two_sites) / "outputs" / "models"
+        forecasts[site] = {model: service.forecast("Ribeye Steak", model, 14, fp)['yhat'].to_numpy()
+                           for model in ("rf", "ets")}
+
+    for model in ("rf", "ets"):
+        assert not np.allclose(forecasts['paris'][model], forecasts['lyon'][model])
+    assert not (two_sites / "outputs" / "models").exists()
+
+
+def _tree(directory):
+    return sorted(str(p.relative_to(directory)) for p in directory.rglob("*"))
+
+
+def test_app_never_writes_into_the_published_snapshot(make_data_dir, monkeypatch):
+    data_dir = make_data_dir(days=90).resolve()
+    assert refresh.refresh(data_dir, log=lambda *args: None) is not None
+    monkeypatch.setattr(common, "DATA_DIR", data_dir)
+
+    fp = common.open_site()
+    served = common.data_dir_for(fp)
+    assert served != data_dir
+    before = _tree(served)
+
+    common.load_basket(fp, tuple(PRODUCTS['name']))
+    common.load_rfm(fp)
+    assert common.load_backtest(fp) is None
+    common.run_query(fp, "SELECT COUNT(*) FROM transactions")
+
+    assert _tree(served) == before
+    for kind in ("basket", "rfm"):
+        assert store.read_frames(kind, fp, data_dir) is not None
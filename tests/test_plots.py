@@ -0,0 +1,50 @@
+import pandas as pd
+
+from kweek.plots import FigureSpec, figure_hash, read_manifests, render_figures
+
+
+def _specs(values=(3, 1, 2)):
+    return [
+        FigureSpec("top", "bar", {'labels': ["a", "b", "c"], 'values': list(values), 'title': "Top"}, group="eda"),
+        FigureSpec("units", "bar", {'labels': ["x", "y"], 'values': [5, 4], 'title': "Units"}, group="eda"),
+    ]
+
+
+def _state(plots_dir):
+    manifest = read_manifests(plots_dir).set_index('name')
+    return {
+        name: (manifest.loc[name, 'rendered'], (plots_dir / f"{name}.png").stat().st_mtime_ns)
+        for name in manifest.index
+    }
+
+
+def test_unchanged_figures_are_not_redrawn(tmp_path):
+    render_figures(_specs(), tmp_path, "eda", max_workers=1)
+    first = _state(tmp_path)
+    render_figures(_specs(), tmp_path, "eda", max_workers=1)
+    assert _state(tmp_path) == first
+
+    render_figures(_specs(values=(3, 1, 9)), tmp_path, "eda", max_workers=1)
+    changed = _state(tmp_path)
+    assert changed['units'] == first['units']
+    assert changed['top'] != first['top']
+
+
+def test_missing_files_and_dropped_figures(tmp_path):
+    render_figures(_specs(), tmp_path, "eda", max_workers=1)
+    first = _state(tmp_path)
+    (tmp_path / "thumbs" / "units.png").unlink()
+    render_figures(_specs()[1:], tmp_path, "eda", max_workers=1)
+
+    assert list(read_manifests(tmp_path)['name']) == ["units"]
+    assert _state(tmp_path)['units'] != first['units']
+    assert (tmp_path / "thumbs" / "units.png").exists()
+    assert not (tmp_path / "top.png").exists() and not (tmp_path / "thumbs" / "top.png").exists()
+
+
+def test_hash_follows_data_content():
+    frame = pd.DataFrame({'date': pd.date_range("2024-01-01", periods=3), 'total_revenue': [1.0, 2.0, 3.0]})
+    reference = figure_hash("daily_trends", {'daily_ts': frame})
+    assert figure_hash("daily_trends", {'daily_ts': frame.copy()}) == reference
+    assert figure_hash("daily_trends", {'daily_ts': frame.assign(total_revenue=[1.0, 2.0, 4.0])}) != reference
+    assert figure_hash("correlation_map", {'daily_ts': frame}) != reference
@@ -0,0 +1,63 @@
+import pytest
+
+from kweek import query, store
+
+
+@pytest.fixture
+def engine(data_dir):
+    store.convert_all(data_dir)
+    engine = query.QueryEngine(data_dir, threads=1)
+    yield engine
+    engine.close()
+
+
+def test_run_reads_store_views(engine):
+    result, truncated = engine.run("SELECT COUNT(*) AS n FROM transactions")
+    assert result['n'].iloc[0] == store.row_count("transactions", engine.data_dir)
+    assert not truncated
+
+
+@pytest.mark.parametrize("sql", [
+    "DELETE FROM transactions",
+    "SELECT 1; SELECT 2",
+    "COPY transactions TO 'out.csv'",
+])
+def test_run_rejects_non_select(engine, sql):
+    with pytest.raises(query.QueryError):
+        engine.run(sql)
+
+
+@pytest.mark.parametrize("reader", ["read_text", "read_csv", "read_blob"])
+def test_run_rejects_files_outside_store(engine, tmp_path, reader):
+    outside = tmp_path / "secret.csv"
+    outside.write_text("a,b\n1,2\n")
+    with pytest.raises(query.QueryError):
+        engine.run(f"SELECT * FROM {reader}('{outside}')")
+    with pytest.raises(query.QueryError):
+        engine.run(f"SELECT * FROM {reader}('{engine.data_dir / store.TABLES['products'].csv}')")
+
+
+def test_configuration_is_locked(engine):
+    with pytest.raises(query.QueryError):
+        engine.run("SELECT * FROM read_text('/etc/passwd')")
+    with pytest.raises(Exception):
+        engine.sql("SET enable_external_access = true")
+
+
+def test_sales_slice_totals(engine):
+    transactions = store.read_table("transactions", data_dir=engine.data_dir)
+    by_day = engine.sales_slice(transactions['date'].min(), transactions['date'].max(), by="Jour")
+    assert by_day['revenue'].sum() == pytest.approx(transactions['total_amount'].sum())
+    assert by_day['transactions'].sum() == transactions['transaction_id'].nunique()
+
+
+def test_sales_totals_count_distinct_over_the_period(engine):
+    transactions = store.read_table("transactions", data_dir=engine.data_dir)
+    start, end = transactions['date'].min(), transactions['date'].max()
+    totals = engine.sales_totals(start, end)
+    by_product = engine.sales_slice(start, end, by="Produit")
+    assert totals['transactions'] == transactions['transaction_id'].nunique()
+    assert totals['clients'] == transactions['client_id'].nunique()
+    # Une transaction de plusieurs produits compte dans chaque groupe
+    assert by_product['transactions'].sum() > totals['transactions']
+    assert totals['revenue'] == pytest.approx(by_product['revenue'].sum())
@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+from kweek import aggregates, ingest, refresh, store
+
+from conftest import make_transactions
+
+
+def _quiet(*args):
+    pass
+
+
+@pytest.fixture
+def published(make_data_dir):
+    data_dir = make_data_dir(days=90)
+    current = refresh.refresh(data_dir, log=_quiet)
+    assert current is not None
+    return data_dir.resolve()
+
+
+def _add_csv_rows(data_dir, start, days, seed):
+    """Nouvelles ventes écrites dans le CSV source (comme un export de caisse)."""
+    path = data_dir / store.TABLES['transactions'].csv
+    old = pd.read_csv(path)
+    new = make_transactions(start, days, seed=seed, first_id=len(old) + 1)
+    pd.concat([old, new]).to_csv(path, index=False)
+
+
+def test_publish_snapshot_is_a_self_contained_data_dir(published):
+    fp, served = refresh.served(published)
+    assert served == refresh.version_dir(1, published)
+    assert refresh.read_publication(served)['fingerprint'] == fp
+    # Sans CSV, l'instantané garde la même empreinte et ses agrégats
+    assert store.fingerprint(data_dir=served) == fp
+    assert ingest.read_aggregates(fp, served) is not None
+    assert aggregates.read_cube(fp, served) is not None
+    assert (served / "outputs" / "reports").is_dir()
+
+
+def test_served_tables_do_not_follow_live_store(published):
+    fp, served = refresh.served(published)
+    rows = store.row_count("transactions", served)
+    daily = ingest.read_aggregates(fp, served)['daily']
+
+    _add_csv_rows(published, "2024-03-31", 5, seed=3)
+    store.convert_all(published)
+    assert store.row_count("transactions", published) > rows
+
+    # Tant que rien n'est republié, tables brutes et agrégats servis restent ceux de v1
+    assert refresh.served(published) == (fp, served)
+    assert store.row_count("transactions", served) == rows
+    assert len(store.read_table("daily", data_dir=served)) == len(daily)
+
+
+def test_refresh_publishes_new_version_and_prunes(published):
+    assert refresh.refresh(published, log=_quiet) is None  # rien n'a changé
+
+    fingerprints = [refresh.read_current(published)['fingerprint']]
+    for k in range(3):
+        _add_csv_rows(published, f"2024-04-{1 + 3 * k:02d}", 3, seed=10 + k)
+        current = refresh.refresh(published, log=_quiet)
+        assert current['version'] == k + 2
+        assert 'aggregates' in current['rebuilt']
+        fingerprints.append(current['fingerprint'])
+
+    versions = sorted(p.name for p in refresh.publish_dir(published).glob("v*"))
+    assert versions == [refresh.version_dir(v, published).name for v in (3, 4)]
+    kept = {p.name for p in ingest.aggregates_dir("", published).iterdir()}
+    assert kept == set(fingerprints[-refresh.KEEP_VERSIONS:])
+
+    fp, served = refresh.served(published)
+    frames = ingest.read_aggregates(fp, served)
+    transactions = store.read_table("transactions", data_dir=served)
+    assert frames['daily']['total_revenue'].sum() == pytest.approx(transactions['total_amount'].sum())
+
+
+def test_publish_skips_when_sources_changed(published):
+    previous = refresh.read_current(published)
+    stale_fp = store.fingerprint(data_dir=published)
+    _add_csv_rows(published, "2024-03-31", 2, seed=5)
+    store.convert_all(published)
+    assert refresh.publish(stale_fp, [], refresh.table_signatures(published), published) is None
+    assert refresh.read_current(published) == previous
+    assert not list(refresh.publish_dir(published).glob("*.tmp"))
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import norm
+
+from kweek.reorder import optimize_reorders
+
+LEVELS = (0.50, 0.80, 0.90, 0.95, 0.975, 0.99, 0.999)
+
+
+def _inputs(n=40, horizon=30, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f"P{i:02d}" for i in range(n)]
+    forecasts = pd.DataFrame(rng.gamma(2.0, 5.0, (n, horizon)), index=names,
+                             columns=pd.date_range("2024-03-01", periods=horizon))
+    products = pd.DataFrame({
+        'name': names,
+        'shelf_life': rng.choice([2, 5, 10, 21, 60], n),
+        'lead_time_days': rng.choice([1, 3, 7, 14], n),
+    })
+    stock = pd.Series(rng.uniform(0, 300, n), index=names)
+    sigma = pd.Series(rng.uniform(0.5, 10, n), index=names)
+    return forecasts, products, stock, sigma
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_higher_service_level_never_orders_less(seed):
+    plan = optimize_reorders(*_inputs(seed=seed), service_levels=LEVELS)
+    by_level = plan.pivot(index='service_level', columns='product_name')
+
+    for column in ('safety_stock', 'reorder_point', 'order_qty'):
+        steps = np.diff(by_level[column].to_numpy(), axis=0)
+        assert (steps >= -1e-9).all(), column
+    assert (np.diff(by_level['safety_stock'].to_numpy(), axis=0) > 0).all()
+
+
+def test_matches_the_scalar_formulas():
+    forecasts, products, stock, sigma = _inputs(n=5)
+    plan = optimize_reorders(forecasts, products, stock, sigma, service_levels=(0.95,)).set_index('product_name')
+    for product in products.itertuples():
+        yhat = forecasts.loc[product.name].to_numpy()
+        lead = product.lead_time_days
+        safety = norm.ppf(0.95) * sigma[product.name] * np.sqrt(lead)
+        assert plan.loc[product.name, 'safety_stock'] == pytest.approx(safety)
+        assert plan.loc[product.name, 'reorder_point'] == pytest.approx(yhat[:lead].sum() + safety)
+        assert 0 <= plan.loc[product.name, 'order_qty'] <= max(yhat[:lead + 7].sum() + safety - stock[product.name], 0) + 1e-9
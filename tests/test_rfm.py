@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from kweek import rfm, store
+
+from conftest import shuffle_transactions
+
+
+def test_clusters_are_ranked_by_monetary(data_dir):
+    result = rfm.build_rfm(data_dir)
+    clients, profile = result['clients'], result['profile']
+
+    means = clients.groupby('cluster')['monetary'].mean()
+    assert list(means.index) == list(range(len(means)))
+    assert means.is_monotonic_decreasing
+    assert profile['clients'].sum() == len(clients)
+    if len(means) > 1:
+        assert clients.loc[clients['cluster'] == 0, 'segment'].eq('VIP').all()
+
+
+@pytest.mark.parametrize("batch_size", [37, 1000])
+def test_shuffled_file_matches_groupby(data_dir, batch_size):
+    shuffle_transactions(data_dir)
+    clients = rfm.build_rfm(data_dir, batch_size=batch_size)['clients'].set_index('client_id')
+
+    transactions = store.read_table("transactions", data_dir=data_dir)
+    grouped = transactions.assign(client_id=transactions['client_id'].astype(str)).groupby('client_id')
+    expected = pd.DataFrame({
+        'frequency': grouped['transaction_id'].nunique(),
+        'monetary': grouped['total_amount'].sum(),
+        'recency': (transactions['date'].max() - grouped['date'].max()).dt.days,
+    })
+    pd.testing.assert_frame_equal(clients[['frequency', 'monetary', 'recency']].sort_index(), expected,
+                                  check_dtype=False, check_names=False)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kweek.risk_table import PAGE_SIZE, RISK_BANDS, RiskTable
+
+
+def _lots(n=137, seed=0):
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 15, n)
+    return pd.DataFrame({
+        'batch_id': [f"B{i:04d}" for i in range(n)],
+        'product_name': rng.choice(["Fresh Salmon Fillet", "Ribeye Steak", "Chocolate Cake"], n),
+        'quantity_available': rng.integers(1, 50, n),
+        'days_until_expiry': days,
+        'expiration_date': pd.Timestamp("2024-03-01") + pd.to_timedelta(days, unit="D"),
+    })
+
+
+@pytest.mark.parametrize("sort_by", ['days_until_expiry', 'quantity_available', 'product_name', 'risk_band'])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_pages_are_slices_of_a_stable_sort(sort_by, ascending):
+    table = RiskTable(_lots())
+    frame = table.frame
+    key = frame[sort_by].cat.codes if sort_by == 'risk_band' else frame[sort_by]
+    expected = frame.loc[key.sort_values(ascending=ascending, kind='stable').index, 'batch_id'].tolist()
+
+    assert table.n_pages() == -(-len(frame) // PAGE_SIZE)
+    shown = [b for page in range(1, table.n_pages() + 1)
+             for b in table.page(page, sort_by=sort_by, ascending=ascending)['batch_id']]
+    assert shown == expected
+    # Numéros hors bornes: première / dernière page
+    assert table.page(0, sort_by=sort_by, ascending=ascending)['batch_id'].tolist() == expected[:PAGE_SIZE]
+    last = table.page(99, sort_by=sort_by, ascending=ascending)['batch_id'].tolist()
+    assert last == expected[(table.n_pages() - 1) * PAGE_SIZE:]
+
+
+def test_band_counts_match_cut():
+    lots = _lots(seed=1)
+    limits = [limit for limit, _, _ in RISK_BANDS]
+    labels = [label for _, label, _ in RISK_BANDS]
+    expected = pd.cut(lots['days_until_expiry'], [-np.inf, *limits], labels=labels, right=True).value_counts(sort=False)
+    pd.testing.assert_series_equal(RiskTable(lots).band_counts(), expected, check_names=False, check_index_type=False)
+    assert RiskTable(lots).to_csv().count("\n") == len(lots) + 1
@@ -0,0 +1,77 @@
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from kweek import store
+from kweek.pipeline.runner import RAN, SKIPPED, Stage, run_pipeline
+
+
+@pytest.fixture
+def stages():
+    """Graphe jouet: names ← products, double ← names, clients ← clients, report ← double + clients."""
+    runs = Counter()
+
+    def writer(name, body):
+        def run(ctx):
+            runs[name] += 1
+            ctx.path(f"out/{name}.txt").write_text(body(ctx), encoding="utf-8")
+        return run
+
+    read = lambda ctx, name: (ctx.data_dir / f"out/{name}.txt").read_text(encoding="utf-8")
+    graph = [
+        Stage("names", writer("names", lambda ctx: "\n".join(
+            sorted(store.read_table('products', ['name'], data_dir=ctx.data_dir)['name']))),
+            tables=('products',), outputs=("out/names.txt",)),
+        Stage("double", writer("double", lambda ctx: read(ctx, "names") * 2),
+              after=("names",), outputs=("out/double.txt",)),
+        Stage("clients", writer("clients", lambda ctx: str(len(store.read_table('clients', data_dir=ctx.data_dir)))),
+              tables=('clients',), outputs=("out/clients.txt",)),
+        Stage("report", writer("report", lambda ctx: read(ctx, "double") + read(ctx, "clients")),
+              after=("double", "clients"), outputs=("out/report.txt",)),
+    ]
+    return graph, runs
+
+
+def _run(graph, data_dir):
+    return {name: result.status for name, result in run_pipeline(graph, data_dir=data_dir, log=lambda _: None).items()}
+
+
+def _edit_csv(data_dir, table, edit):
+    path = data_dir / store.TABLES[table].csv
+    edit(pd.read_csv(path)).to_csv(path, index=False)
+
+
+def test_unchanged_inputs_are_skipped(data_dir, stages):
+    graph, runs = stages
+    assert set(_run(graph, data_dir).values()) == {RAN}
+    assert set(_run(graph, data_dir).values()) == {SKIPPED}
+    assert runs == Counter(names=1, double=1, clients=1, report=1)
+
+
+def test_change_reruns_only_downstream_stages(data_dir, stages):
+    graph, runs = stages
+    _run(graph, data_dir)
+
+    _edit_csv(data_dir, 'clients', lambda df: df.iloc[:-1])
+    assert _run(graph, data_dir) == {'names': SKIPPED, 'double': SKIPPED, 'clients': RAN, 'report': RAN}
+
+    _edit_csv(data_dir, 'products', lambda df: df.assign(name=df['name'].str.upper()))
+    assert _run(graph, data_dir) == {'names': RAN, 'double': RAN, 'clients': SKIPPED, 'report': RAN}
+    assert runs == Counter(names=2, double=2, clients=2, report=3)
+
+
+def test_identical_outputs_stop_propagation(data_dir, stages):
+    graph, _ = stages
+    _run(graph, data_dir)
+    # Colonne non lue par l'étape: elle est relancée, mais produit le même fichier
+    _edit_csv(data_dir, 'products', lambda df: df.assign(unit_cost=df['unit_cost'] + 1))
+    assert _run(graph, data_dir) == {'names': RAN, 'double': SKIPPED, 'clients': SKIPPED, 'report': SKIPPED}
+
+
+def test_missing_output_is_rebuilt(data_dir, stages):
+    graph, _ = stages
+    _run(graph, data_dir)
+    (data_dir / "out/clients.txt").unlink()
+    assert _run(graph, data_dir)['clients'] == RAN
+    assert (data_dir / "out/clients.txt").exists()
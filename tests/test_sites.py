@@ -0,0 +1,57 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from kweek import ingest, sites, store
+
+TRANSACTIONS = store.TABLES['transactions'].csv
+
+
+@pytest.fixture
+def two_sites(tmp_path, make_data_dir):
+    root = tmp_path / "root"
+    sites.add_site("paris", make_data_dir("paris_src", start="2024-01-01", days=60, seed=1), root)
+    sites.add_site("lyon", make_data_dir("lyon_src", start="2024-01-20", days=60, seed=2), root)
+    return root
+
+
+def _union_dir(root, target):
+    """Données d'un site unique regroupant les transactions des deux sites (identifiants préfixés)."""
+    shutil.copytree(sites.site_dir("paris", root), target, ignore=shutil.ignore_patterns("outputs", "site.json"))
+    frames = []
+    for site in ("paris", "lyon"):
+        frame = pd.read_csv(sites.site_dir(site, root) / TRANSACTIONS)
+        frames.append(frame.assign(transaction_id=site + "-" + frame['transaction_id'].astype(str)))
+    pd.concat(frames, ignore_index=True).sort_values('date', kind='stable').to_csv(target / TRANSACTIONS, index=False)
+    return target
+
+
+def test_rollup_equals_aggregates_of_all_transactions(two_sites, tmp_path):
+    fp, rollup = sites.load_or_build_rollup(data_dir=two_sites)
+    union = ingest.ingest_transactions(_union_dir(two_sites, tmp_path / "union"))
+
+    for name, keys in {**sites.ADDITIVE_TABLES, 'by_product': ['product_name'], 'by_category': ['category']}.items():
+        merged = rollup['sales'][name]
+        expected = union[name][list(merged.columns)]
+        pd.testing.assert_frame_equal(
+            merged.astype({k: str for k in keys if k != 'date'}).sort_values(keys, ignore_index=True),
+            expected.astype({k: str for k in keys if k != 'date'}).sort_values(keys, ignore_index=True),
+            check_dtype=False, check_categorical=False, obj=name,
+        )
+
+    kpis, by_site = rollup['cube']['kpis'].iloc[0], rollup['cube']['by_site']
+    assert set(by_site['site']) == {"paris", "lyon"}
+    assert by_site['total_sales'].sum() == pytest.approx(kpis['total_sales'])
+    assert by_site['n_lines'].sum() == kpis['n_lines']
+
+
+def test_rollup_daily_sums_sales_and_is_cached(two_sites):
+    fp, rollup = sites.load_or_build_rollup(data_dir=two_sites)
+    per_site = pd.concat([store.read_table("daily", data_dir=sites.site_dir(s, two_sites)) for s in ("paris", "lyon")])
+    expected = per_site.assign(date=pd.to_datetime(per_site['date'])).groupby('date')['total_revenue'].sum()
+    pd.testing.assert_series_equal(rollup['daily'].set_index('date')['total_revenue'], expected, check_dtype=False)
+
+    again_fp, again = sites.load_or_build_rollup(data_dir=two_sites)
+    assert again_fp == fp
+    pd.testing.assert_frame_equal(again['cube']['by_week'], rollup['cube']['by_week'])
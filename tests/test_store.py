@@ -0,0 +1,36 @@
+import pandas as pd
+
+from kweek import store
+
+
+def test_load_or_build_frames_persists_and_prunes(tmp_path):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {'a': pd.DataFrame({'x': [1, 2]}), 'b': pd.DataFrame({'y': [3.0]})}
+
+    first = store.load_or_build_frames("rules", "fp1", build, tmp_path)
+    again = store.load_or_build_frames("rules", "fp1", build, tmp_path)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first['a'], again['a'])
+
+    store.load_or_build_frames("rules", "fp2", build, tmp_path)
+    assert [p.name for p in (store.store_dir(tmp_path) / "rules").iterdir()] == ["fp2"]
+    assert store.read_frames("rules", "fp1", tmp_path) is None
+
+
+def test_incomplete_frames_are_rebuilt(tmp_path):
+    store.save_frames("cube", {'a': pd.DataFrame({'x': [1]})}, "fp", tmp_path)
+    frames = store.load_or_build_frames(
+        "cube", "fp", lambda: {'a': pd.DataFrame({'x': [1]}), 'b': pd.DataFrame({'x': [2]})}, tmp_path,
+        complete=lambda frames: {'a', 'b'} <= frames.keys(),
+    )
+    assert set(frames) == {'a', 'b'}
+    assert set(store.read_frames("cube", "fp", tmp_path)) == {'a', 'b'}
+
+
+def test_save_frames_keeps_index_when_asked(tmp_path):
+    frame = pd.DataFrame({'x': [1, 2]}, index=pd.Index(["p", "q"], name="k"))
+    store.save_frames("cube", {'t': frame}, "fp", tmp_path, index=None)
+    pd.testing.assert_frame_equal(store.read_frames("cube", "fp", tmp_path)['t'], frame)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_daily, make_external, make_transactions
+from kweek import whatif
+from kweek.fefo import FEFOSimulation
+
+SHELF_LIFE = {'Fresh Salmon Fillet': 3, 'Ribeye Steak': 5, 'Chocolate Cake': 4}
+
+
+def _neutral_factors():
+    """Historique sans effet météo ni événement: facteurs tous égaux à 1."""
+    transactions = make_transactions("2024-01-01", 90)
+    external = make_external(pd.date_range("2024-01-01", periods=90, freq="D"))
+    return whatif.FactorModel(make_daily(transactions, external))
+
+
+def _scenario(days=28, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-03-01", periods=days, freq="D")
+    baseline = pd.DataFrame(rng.integers(0, 15, (len(SHELF_LIFE), days)).astype(float),
+                            index=list(SHELF_LIFE), columns=dates)
+    batches = pd.DataFrame([
+        {'batch_id': f"{product[:3]}-{i}", 'product_name': product, 'arrival_date': arrival,
+         'expiration_date': arrival + pd.Timedelta(days=life), 'quantity_received': int(rng.integers(10, 60))}
+        for product, life in SHELF_LIFE.items() for i, arrival in enumerate(dates[::3])
+    ])
+    return baseline, batches
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_unchanged_scenario_matches_fefo_replay(seed):
+    baseline, batches = _scenario(seed=seed)
+    sales = baseline.stack().rename_axis(['product_name', 'date']).reset_index(name='quantity')
+    replay = FEFOSimulation(batches, sales, end=baseline.columns[-1])
+    lots = batches.rename(columns={'arrival_date': 'date', 'quantity_received': 'quantity'})
+
+    result = whatif.simulate(baseline, pd.Series(0.0, index=baseline.index), _neutral_factors(),
+                             lots=lots, n_scenarios=4)
+
+    np.testing.assert_allclose(result.multipliers, 1.0)
+    np.testing.assert_allclose(result.demand, np.broadcast_to(baseline.to_numpy(), result.demand.shape))
+    order = [replay.products.index(p) for p in result.products]
+    for k in range(result.lost.shape[0]):
+        np.testing.assert_allclose(result.lost[k], replay.lost[:, order].T, atol=1e-4)
+        np.testing.assert_allclose(result.wasted[k], replay.wasted[:, order].sum(axis=0), atol=1e-4)